@@ -0,0 +1,4 @@
+"""Performance benchmarks of pbfbench.
+
+Run a benchmark module with `python -m benchmarks.<module>`.
+"""
@@ -0,0 +1,126 @@
+"""Import-time budget of the CLI start-up.
+
+The cumulative import time of `pbfbench.app` is read from `python -X importtime`
+in fresh interpreters, and its median must be under the budget.
+The heavy modules must not be imported to show the root help.
+
+The regression gate (`benchmarks.regression_gate`) runs this check.
+
+Usage: `python -m benchmarks.cli_import_time` (exit code 1 on failure).
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+from typing import TYPE_CHECKING, Annotated
+
+import typer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+APP = typer.Typer(rich_markup_mode="rich")
+
+ROOT_APP_MODULE = "pbfbench.app"
+
+DEFAULT_BUDGET = 300
+DEFAULT_REPEATS = 5
+
+HEAVY_MODULES = (
+    "pandas",
+    "numpy",
+    "pbfbench.topics.binning.pangebin_once.init",
+    "pbfbench.topics.assembly.unicycler.app",
+    "pbfbench.topics.seeds.platon.app",
+    "pbfbench.topics.plasmidness.plasclass.app",
+)
+
+_HELP_MODULES_SCRIPT = """
+import sys
+from pbfbench.app import APP
+try:
+    APP(["--help"])
+except SystemExit:
+    pass
+print(*sorted(sys.modules), sep="\\n", file=sys.stderr)
+"""
+
+
+class Options:
+    """Benchmark options."""
+
+    BUDGET = typer.Option(help="Import-time budget of `pbfbench.app` (in ms)")
+    REPEATS = typer.Option(help="Number of fresh interpreters")
+
+
+def import_time(module_name: str) -> float:
+    """Get the cumulative import time of the module in a fresh interpreter (in ms)."""
+    importtime_stderr = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    for line in importtime_stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module_name:  # noqa: PLR2004
+            return int(fields[1]) / 1000
+    _err_msg = f"No import time for {module_name}"
+    raise ValueError(_err_msg)
+
+
+def help_imported_modules() -> set[str]:
+    """Get the modules imported to show the root help."""
+    return set(
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-c", _HELP_MODULES_SCRIPT],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stderr.split(),
+    )
+
+
+def budget_failures(budget: float, repeats: int) -> Iterator[str]:
+    """Iterate over the descriptions of the import-time budget failures."""
+    import_times = [import_time(ROOT_APP_MODULE) for _ in range(repeats)]
+    median_time = statistics.median(import_times)
+    typer.echo(
+        f"{ROOT_APP_MODULE} import time: median {median_time:.1f} ms"
+        f" (min {min(import_times):.1f} ms, budget {budget:.0f} ms)",
+    )
+
+    imported_modules = help_imported_modules()
+    imported_heavy_modules = [
+        module_name for module_name in HEAVY_MODULES if module_name in imported_modules
+    ]
+    if imported_heavy_modules:
+        yield "Heavy modules imported by the root help: " + ", ".join(
+            imported_heavy_modules,
+        )
+    if median_time > budget:
+        yield (
+            f"The import-time budget is exceeded:"
+            f" {median_time:.1f} ms > {budget:.0f} ms"
+        )
+
+
+@APP.command()
+def main(
+    budget: Annotated[float, Options.BUDGET] = DEFAULT_BUDGET,
+    repeats: Annotated[int, Options.REPEATS] = DEFAULT_REPEATS,
+) -> None:
+    """Check the import-time budget of the CLI start-up."""
+    failures = list(budget_failures(budget, repeats))
+    for failure in failures:
+        typer.echo(failure, err=True)
+    if failures:
+        raise typer.Exit(1)
+    typer.echo("The import-time budget is met")
+
+
+if __name__ == "__main__":
+    APP()
@@ -0,0 +1,145 @@
+"""Micro-benchmark of the gzipped file reader backends.
+
+A synthetic assembly graph is written both as a standard gzip file
+and as a BGZF file, then parsed with `parse_gfa` for each available backend,
+the `gzip` backend being the previous `gzip.open` path.
+All the parsed contig tables must be identical.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import random
+import struct
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
+
+import typer
+
+import pbfbench.topics.assembly.visitor as asm_visitor
+import pbfbench.topics.plasmidness.pbf_input.ops as plm_pbf_in_ops
+from pbfbench import gz_reader
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+APP = typer.Typer(rich_markup_mode="rich")
+
+BGZF_MAX_BLOCK_DATA_SIZE = 0xFF00
+BGZF_EOF_BLOCK = bytes.fromhex(
+    "1f8b08040000000000ff0600424302001b0003000000000000000000",
+)
+
+
+class Options:
+    """Benchmark options."""
+
+    NUMBER_OF_SEGMENTS = typer.Option(help="Number of segments")
+    THREADS = typer.Option(help="Number of decompression threads")
+    SEED = typer.Option(help="Random seed")
+
+
+def write_synthetic_gfa(gfa_gz: Path, number_of_segments: int, seed: int) -> bytes:
+    """Write a synthetic gzipped assembly graph and return its content."""
+    rng = random.Random(seed)  # noqa: S311 # not for cryptographic purposes
+    lines = ["H\tVN:Z:1.0\n"]
+    for segment_id in range(1, number_of_segments + 1):
+        length = rng.randint(50, 2000)
+        sequence = "".join(rng.choices("ACGT", k=length))
+        lines.append(f"S\t{segment_id}\t{sequence}\tLN:i:{length}\n")
+    gfa_bytes = "".join(lines).encode()
+    with gzip.open(gfa_gz, "wb", compresslevel=6) as f_out:
+        f_out.write(gfa_bytes)
+    return gfa_bytes
+
+
+def write_bgzf(bgzf_file: Path, content: bytes) -> None:
+    """Write the content in BGZF blocks (as `bgzip` does)."""
+    with bgzf_file.open("wb") as f_out:
+        for start in range(0, len(content), BGZF_MAX_BLOCK_DATA_SIZE):
+            data = content[start : start + BGZF_MAX_BLOCK_DATA_SIZE]
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+            deflated = compressor.compress(data) + compressor.flush()
+            f_out.write(
+                struct.pack(
+                    "<4sIBBHBBHH",
+                    b"\x1f\x8b\x08\x04",
+                    0,
+                    0,
+                    0xFF,
+                    6,
+                    ord("B"),
+                    ord("C"),
+                    2,
+                    len(deflated) + 25,
+                ),
+            )
+            f_out.write(deflated)
+            f_out.write(struct.pack("<II", zlib.crc32(data), len(data)))
+        f_out.write(BGZF_EOF_BLOCK)
+
+
+@contextmanager
+def env_var(name: str, value: str) -> Iterator[None]:
+    """Set an environment variable in the context."""
+    old_value = os.environ.get(name)
+    os.environ[name] = value
+    try:
+        yield
+    finally:
+        if old_value is None:
+            del os.environ[name]
+        else:
+            os.environ[name] = old_value
+
+
+@APP.command()
+def main(
+    number_of_segments: Annotated[int, Options.NUMBER_OF_SEGMENTS] = 50_000,
+    threads: Annotated[int, Options.THREADS] = 4,
+    seed: Annotated[int, Options.SEED] = 0,
+) -> None:
+    """Time `parse_gfa` with each gzip reader backend."""
+    with tempfile.TemporaryDirectory() as tmp_dir_str:
+        tmp_dir = Path(tmp_dir_str)
+        gfa_gz = tmp_dir / "assembly.gfa.gz"
+        bgzf_gz = tmp_dir / "assembly.bgzf.gfa.gz"
+        gfa_bytes = write_synthetic_gfa(gfa_gz, number_of_segments, seed)
+        write_bgzf(bgzf_gz, gfa_bytes)
+        typer.echo(f"Inflated size: {len(gfa_bytes) / 1e6:.1f} MB")
+
+        with env_var(gz_reader.THREADS_ENV_VAR, str(threads)):
+            contig_tables: list[list[tuple[str, str, int]]] = []
+            for gz_file, backends in (
+                (gfa_gz, gz_reader.available_backends()),
+                (bgzf_gz, [gz_reader.Backends.BGZF, gz_reader.Backends.GZIP]),
+            ):
+                for gz_backend in backends:
+                    if gz_backend == gz_reader.Backends.BGZF and gz_file == gfa_gz:
+                        continue
+                    with env_var(gz_reader.BACKEND_ENV_VAR, gz_backend):
+                        start = time.perf_counter()
+                        contig_table = plm_pbf_in_ops.parse_gfa(
+                            gz_file,
+                            asm_visitor.Tools.UNICYCLER,
+                        )
+                        elapsed = time.perf_counter() - start
+                    typer.echo(
+                        f"{gz_file.name} {gz_backend}: {elapsed:.3f} s"
+                        f" ({len(gfa_bytes) / 1e6 / elapsed:.0f} MB/s)",
+                    )
+                    contig_tables.append(list(contig_table))
+
+    if any(contig_table != contig_tables[0] for contig_table in contig_tables):
+        typer.echo("The parsed contig tables differ", err=True)
+        raise typer.Exit(1)
+    typer.echo("The parsed contig tables are identical")
+
+
+if __name__ == "__main__":
+    APP()
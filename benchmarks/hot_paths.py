@@ -0,0 +1,302 @@
+"""Framework-overhead benchmark of the run and init hot paths.
+
+For each cohort size, a synthetic cohort is generated (see `synthetic_cohort`)
+and the hot paths of a Platon run are timed on it:
+
+* `samples_to_run`: status scan with the fingerprints
+* `init_sample_directories`: working sample directories and fingerprints
+* `checked_input_samples_to_run`: missing inputs check
+* `create_run_script`: sbatch and command scripts generation
+* `move_work_to_data`: move of the run samples to the data directory
+
+The per-sample operations are timed on a bounded number of done samples:
+`parse_gfa` and the Platon and plASgraph2 `convert` functions.
+
+The results are written in a JSON file, with the pbfbench version,
+so that they can be compared across versions.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any
+
+import typer
+
+import pbfbench.experiment.iter as exp_iter
+import pbfbench.experiment.run as exp_run
+import pbfbench.experiment.shell as exp_shell
+import pbfbench.samples.status as smp_status
+import pbfbench.topics.assembly.results.items as asm_res_items
+import pbfbench.topics.assembly.visitor as asm_visitor
+import pbfbench.topics.plasmidness.pbf_input.ops as plm_pbf_in_ops
+import pbfbench.topics.plasmidness.plasgraph2.plasbin_flow as plasgraph2_pbf
+import pbfbench.topics.seeds.platon.plasbin_flow as platon_pbf
+import pbfbench.topics.seeds.platon.results as platon_res
+import pbfbench.topics.seeds.platon.visitor as platon_visitor
+from benchmarks import synthetic_cohort
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import pbfbench.experiment.file_system as exp_fs
+    import pbfbench.samples.file_system as smp_fs
+
+APP = typer.Typer(rich_markup_mode="rich")
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+class Options:
+    """Benchmark options."""
+
+    SIZES = typer.Option(help="Cohort sizes (number of samples), repeatable")
+    CONVERT_SAMPLES = typer.Option(
+        help="Number of done samples for the per-sample operations",
+    )
+    POOL_SIZE = typer.Option(help="Number of distinct synthetic assemblies")
+    OUTPUT_JSON = typer.Option(help="Results JSON file")
+    SEED = typer.Option(help="Random seed")
+
+
+class Results:
+    """Timing results."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.__entries: list[dict[str, Any]] = []
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Get result entries."""
+        return self.__entries
+
+    @contextmanager
+    def time(
+        self,
+        hot_path: str,
+        number_of_samples: int,
+        items: int,
+    ) -> Iterator[None]:
+        """Time a hot path on the items of a cohort."""
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        self.__entries.append(
+            {
+                "hot_path": hot_path,
+                "number_of_samples": number_of_samples,
+                "items": items,
+                "seconds": seconds,
+            },
+        )
+        typer.echo(
+            f"{number_of_samples:>8} samples  {hot_path:<30}"
+            f" {items:>8} items  {seconds:9.3f} s",
+        )
+
+
+def time_cohort(  # noqa: PLR0913
+    results: Results,
+    tmp_dir: Path,
+    number_of_samples: int,
+    *,
+    convert_samples: int,
+    pool_size: int,
+    seed: int,
+) -> None:
+    """Generate a cohort and time its hot paths."""
+    data_dir = tmp_dir / "data"
+    work_dir = tmp_dir / "work"
+    with results.time("generate_cohort", number_of_samples, number_of_samples):
+        cohort = synthetic_cohort.generate(
+            data_dir,
+            number_of_samples,
+            pool_size,
+            seed,
+        )
+    data_exp_fs_manager = cohort.platon_exp()
+    work_exp_fs_manager = cohort.work_manager(work_dir)
+    exp_config = cohort.platon_exp_config()
+    exp_run.init_experiment_file_systems(
+        data_exp_fs_manager,
+        work_exp_fs_manager,
+        exp_config,
+    )
+    all_samples = cohort.row_numbered_samples()
+    fingerprinter = cohort.platon_fingerprinter(work_dir)
+
+    with results.time("samples_to_run", number_of_samples, len(all_samples)):
+        samples_to_run = list(
+            exp_iter.samples_to_run(data_exp_fs_manager, all_samples, fingerprinter),
+        )
+    with results.time(
+        "init_sample_directories",
+        number_of_samples,
+        len(samples_to_run),
+    ):
+        exp_run._init_sample_directories(  # noqa: SLF001
+            samples_to_run,
+            work_exp_fs_manager,
+            fingerprinter,
+        )
+    with results.time(
+        "checked_input_samples_to_run",
+        number_of_samples,
+        len(samples_to_run),
+    ):
+        checked_samples_to_run, _ = exp_iter.checked_input_samples_to_run(
+            work_exp_fs_manager,
+            samples_to_run,
+            platon_visitor.CONNECTOR.config_to_inputs(exp_config, data_exp_fs_manager),
+            platon_visitor.CONNECTOR,
+        )
+    with results.time(
+        "create_run_script",
+        number_of_samples,
+        len(checked_samples_to_run),
+    ):
+        exp_shell.create_run_script(
+            data_exp_fs_manager,
+            work_exp_fs_manager,
+            checked_samples_to_run,
+            exp_config.slurm_config(),
+            platon_visitor.CONNECTOR.inputs_to_commands(
+                exp_config,
+                data_exp_fs_manager,
+                work_exp_fs_manager,
+            ).commands(),
+        )
+
+    _write_work_outputs(cohort, work_exp_fs_manager, checked_samples_to_run)
+    with results.time("move_work_to_data", number_of_samples, len(samples_to_run)):
+        exp_run._move_work_to_data(  # noqa: SLF001
+            work_exp_fs_manager,
+            data_exp_fs_manager,
+            samples_to_run,
+        )
+
+    _time_per_sample_operations(results, cohort, number_of_samples, convert_samples)
+    shutil.rmtree(data_dir)
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _write_work_outputs(
+    cohort: synthetic_cohort.Cohort,
+    work_exp_fs_manager: exp_fs.WorkManager,
+    checked_samples_to_run: list[smp_fs.RowNumberedItem],
+) -> None:
+    """Write the outputs of successful runs in the working sample directories."""
+    pool_platon_tsv = next(
+        cohort.pool_dir().glob(f"*/{platon_res.PlasmidStats.TSV_NAME}"),
+    )
+    for run_sample in checked_samples_to_run:
+        sample_fs_manager = work_exp_fs_manager.sample_fs_manager(run_sample.item())
+        shutil.copy(
+            pool_platon_tsv,
+            sample_fs_manager.sample_dir() / platon_res.PlasmidStats.TSV_NAME,
+        )
+        sample_fs_manager.sbatch_stats_psv().write_text(
+            "JobID|Elapsed|MaxRSS\n1_1|00:10:00|1G\n",
+        )
+        sample_fs_manager.done_log().touch()
+
+
+def _time_per_sample_operations(
+    results: Results,
+    cohort: synthetic_cohort.Cohort,
+    number_of_samples: int,
+    convert_samples: int,
+) -> None:
+    """Time the per-sample operations on the first done samples."""
+    done_items = [
+        row_numbered_sample.item()
+        for row_numbered_sample in cohort.row_numbered_samples()
+        if smp_status.get_status(
+            cohort.plasgraph2_exp().sample_fs_manager(row_numbered_sample.item()),
+        )
+        == smp_status.OKStatus.OK
+        and smp_status.get_status(
+            cohort.platon_exp().sample_fs_manager(row_numbered_sample.item()),
+        )
+        == smp_status.OKStatus.OK
+    ][:convert_samples]
+
+    asm_graph = asm_res_items.AsmGraphGZ(cohort.assembly_exp())
+    with results.time("parse_gfa", number_of_samples, len(done_items)):
+        for sample_item in done_items:
+            plm_pbf_in_ops.parse_gfa(
+                asm_graph.gfa_gz(sample_item.exp_sample_id()),
+                asm_visitor.Tools.UNICYCLER,
+            )
+    with results.time("platon_convert", number_of_samples, len(done_items)):
+        for sample_item in done_items:
+            platon_pbf.convert(cohort.platon_exp(), sample_item)
+    with results.time("plasgraph2_convert", number_of_samples, len(done_items)):
+        for sample_item in done_items:
+            plasgraph2_pbf.convert(cohort.plasgraph2_exp(), sample_item)
+
+
+def _git_commit() -> str | None:
+    """Get the current git commit of the repository, if any."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@APP.command()
+def main(
+    sizes: Annotated[list[int] | None, Options.SIZES] = None,
+    convert_samples: Annotated[int, Options.CONVERT_SAMPLES] = 100,
+    pool_size: Annotated[int, Options.POOL_SIZE] = 16,
+    output_json: Annotated[Path, Options.OUTPUT_JSON] = Path("hot_paths.json"),
+    seed: Annotated[int, Options.SEED] = 0,
+) -> None:
+    """Time the framework hot paths on synthetic cohorts."""
+    results = Results()
+    for number_of_samples in sizes or DEFAULT_SIZES:
+        with tempfile.TemporaryDirectory() as tmp_dir_str:
+            time_cohort(
+                results,
+                Path(tmp_dir_str),
+                number_of_samples,
+                convert_samples=convert_samples,
+                pool_size=pool_size,
+                seed=seed,
+            )
+    with output_json.open("w") as f_out:
+        json.dump(
+            {
+                "pbfbench_version": metadata.version("pbfbench"),
+                "git_commit": _git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "date": datetime.now(tz=UTC).isoformat(timespec="seconds"),
+                "seed": seed,
+                "pool_size": pool_size,
+                "convert_samples": convert_samples,
+                "results": results.entries(),
+            },
+            f_out,
+            indent=2,
+        )
+    typer.echo(f"Results written in {output_json}")
+
+
+if __name__ == "__main__":
+    APP()
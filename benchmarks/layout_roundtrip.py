@@ -0,0 +1,99 @@
+"""Samples layout migration check of the sample run fingerprints.
+
+A synthetic cohort (see `synthetic_cohort`) is migrated from the flat
+to the sharded samples layout and back.
+After each migration, the recorded fingerprints of the done Platon samples
+must be unchanged, otherwise the next run would rerun them.
+
+Usage: `python -m benchmarks.layout_roundtrip` (exit code 1 on failure).
+"""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
+
+import typer
+
+import pbfbench.experiment.file_system as exp_fs
+import pbfbench.layout.migrate as layout_migrate
+import pbfbench.samples.status as smp_status
+from benchmarks import synthetic_cohort
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+APP = typer.Typer(rich_markup_mode="rich")
+
+
+class Options:
+    """Check options."""
+
+    NUMBER_OF_SAMPLES = typer.Option(help="Number of samples")
+    POOL_SIZE = typer.Option(help="Number of distinct synthetic assemblies")
+    SEED = typer.Option(help="Random seed")
+
+
+def changed_fingerprint_samples(cohort: synthetic_cohort.Cohort) -> list[str]:
+    """Get the done Platon samples whose fingerprint has changed."""
+    platon_exp = cohort.platon_exp()
+    fingerprinter = cohort.platon_fingerprinter(cohort.data_dir())
+    changed_samples: list[str] = []
+    for row_numbered_sample in cohort.row_numbered_samples():
+        sample_item = row_numbered_sample.item()
+        sample_fs_manager = platon_exp.sample_fs_manager(sample_item)
+        if smp_status.get_status(
+            sample_fs_manager,
+        ) == smp_status.OKStatus.OK and fingerprinter.has_changed(
+            sample_item,
+            sample_fs_manager,
+        ):
+            changed_samples.append(sample_item.exp_sample_id())
+    return changed_samples
+
+
+def roundtrip_failures(
+    tmp_dir: Path,
+    number_of_samples: int,
+    pool_size: int,
+    seed: int,
+) -> Iterator[str]:
+    """Iterate over the descriptions of the layouts with changed fingerprints."""
+    cohort = synthetic_cohort.generate(
+        tmp_dir / "data",
+        number_of_samples,
+        pool_size,
+        seed,
+        exp_fs.SamplesLayout.FLAT,
+    )
+    for samples_layout in (exp_fs.SamplesLayout.SHARDED, exp_fs.SamplesLayout.FLAT):
+        layout_migrate.migrate(cohort.data_dir(), samples_layout)
+        changed_samples = changed_fingerprint_samples(cohort)
+        if changed_samples:
+            yield (
+                f"{len(changed_samples)} changed fingerprints after the migration"
+                f" to the {samples_layout} layout (e.g. {changed_samples[0]})"
+            )
+
+
+@APP.command()
+def main(
+    number_of_samples: Annotated[int, Options.NUMBER_OF_SAMPLES] = 200,
+    pool_size: Annotated[int, Options.POOL_SIZE] = 2,
+    seed: Annotated[int, Options.SEED] = 0,
+) -> None:
+    """Check that a samples layout round-trip keeps the fingerprints."""
+    with tempfile.TemporaryDirectory() as tmp_dir_str:
+        failures = list(
+            roundtrip_failures(Path(tmp_dir_str), number_of_samples, pool_size, seed),
+        )
+    for failure in failures:
+        typer.echo(f"Layout round-trip: {failure}", err=True)
+    if failures:
+        raise typer.Exit(1)
+    typer.echo("The samples layout round-trip keeps the fingerprints")
+
+
+if __name__ == "__main__":
+    APP()
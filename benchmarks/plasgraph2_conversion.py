@@ -0,0 +1,151 @@
+"""Micro-benchmark of the plASgraph2 to PBF plasmidness conversion.
+
+The vectorized conversion is compared with the previous row by row
+dict-of-dicts implementation, and both outputs must be byte-identical.
+"""
+
+from __future__ import annotations
+
+import gzip
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+import pandas as pd
+import typer
+
+import pbfbench.topics.assembly.visitor as asm_visitor
+import pbfbench.topics.plasmidness.pbf_input.ops as plm_pbf_in_ops
+import pbfbench.topics.plasmidness.plasgraph2.plasbin_flow as plasgraph2_pbf
+
+APP = typer.Typer(rich_markup_mode="rich")
+
+
+class Options:
+    """Benchmark options."""
+
+    NUMBER_OF_SEGMENTS = typer.Option(help="Number of segments")
+    SEED = typer.Option(help="Random seed")
+
+
+def write_synthetic_inputs(
+    gfa_gz: Path,
+    plasgraph2_csv: Path,
+    number_of_segments: int,
+    seed: int,
+) -> None:
+    """Write a synthetic assembly graph and its plASgraph2 scores.
+
+    One segment out of ten is not scored and one out of twenty is scored twice.
+    """
+    rng = random.Random(seed)  # noqa: S311 # not for cryptographic purposes
+    with gzip.open(gfa_gz, "wt", compresslevel=1) as f_out:
+        f_out.write("H\tVN:Z:1.0\n")
+        for segment_id in range(1, number_of_segments + 1):
+            length = rng.randint(50, 2000)
+            f_out.write(f"S\t{segment_id}\t{'A' * length}\tLN:i:{length}\n")
+    rows = []
+    for segment_id in range(1, number_of_segments + 1):
+        if segment_id % 10 == 0:
+            continue
+        for _ in range(2 if segment_id % 20 == 1 else 1):
+            plasmid_score = rng.random()
+            rows.append(
+                (
+                    f"{segment_id} length={rng.randint(50, 2000)}",
+                    1 - plasmid_score,
+                    plasmid_score,
+                    "plasmid" if plasmid_score > 0.5 else "chromosome",  # noqa: PLR2004
+                ),
+            )
+    pd.DataFrame(
+        rows,
+        columns=["contig", "chrom_score", "plasmid_score", "label"],
+    ).to_csv(plasgraph2_csv, index=False)
+
+
+def row_by_row_conversion(
+    plasgraph2_csv: Path,
+    contig_table: plm_pbf_in_ops.ContigTable,
+    out_tsv: Path,
+) -> None:
+    """Convert row by row (previous implementation)."""
+    contigs_dict = {
+        contig_id: {
+            "Prob_Chromosome": 0.5,
+            "Prob_Plasmid": 0.5,
+            "Prediction": "Chromosome",
+            "Contig_name": contig_name,
+            "Contig_length": contig_length,
+        }
+        for contig_id, contig_name, contig_length in contig_table
+    }
+    plgr_df = pd.read_csv(plasgraph2_csv)
+    for _, row in plgr_df.iterrows():
+        contig_id = str(row["contig"]).split(" ")[0]
+        if contig_id in contigs_dict:
+            contigs_dict[contig_id]["Prob_Chromosome"] = float(row["chrom_score"])
+            contigs_dict[contig_id]["Prob_Plasmid"] = float(row["plasmid_score"])
+            contigs_dict[contig_id]["Prediction"] = (
+                "Plasmid" if row["label"] == "plasmid" else "Chromosome"
+            )
+    pd.DataFrame.from_dict(contigs_dict).T.to_csv(
+        out_tsv,
+        columns=["Prob_Plasmid"],
+        sep="\t",
+        header=False,
+        index=True,
+    )
+
+
+def vectorized_conversion(
+    plasgraph2_csv: Path,
+    contig_table: plm_pbf_in_ops.ContigTable,
+    out_tsv: Path,
+) -> None:
+    """Convert with a vectorized join (current implementation)."""
+    plasgraph2_pbf.to_pbf_plasmidness(plasgraph2_csv, contig_table).to_csv(
+        out_tsv,
+        sep="\t",
+        header=False,
+        index=True,
+    )
+
+
+@APP.command()
+def main(
+    number_of_segments: Annotated[int, Options.NUMBER_OF_SEGMENTS] = 100_000,
+    seed: Annotated[int, Options.SEED] = 0,
+) -> None:
+    """Time the plASgraph2 conversion and check the outputs are identical."""
+    with tempfile.TemporaryDirectory() as tmp_dir_str:
+        tmp_dir = Path(tmp_dir_str)
+        gfa_gz = tmp_dir / "assembly.gfa.gz"
+        plasgraph2_csv = tmp_dir / "plasmid_probabilities.csv"
+        write_synthetic_inputs(gfa_gz, plasgraph2_csv, number_of_segments, seed)
+
+        start = time.perf_counter()
+        contig_table = plm_pbf_in_ops.parse_gfa(gfa_gz, asm_visitor.Tools.UNICYCLER)
+        typer.echo(f"parse_gfa: {time.perf_counter() - start:.3f} s")
+
+        outputs: list[bytes] = []
+        for name, conversion in (
+            ("row by row", row_by_row_conversion),
+            ("vectorized", vectorized_conversion),
+        ):
+            out_tsv = tmp_dir / f"{name.replace(' ', '_')}.tsv"
+            start = time.perf_counter()
+            conversion(plasgraph2_csv, contig_table, out_tsv)
+            typer.echo(f"{name} conversion: {time.perf_counter() - start:.3f} s")
+            outputs.append(out_tsv.read_bytes())
+
+    if outputs[0] != outputs[1]:
+        typer.echo("The conversion outputs differ", err=True)
+        raise typer.Exit(1)
+    typer.echo("The conversion outputs are identical")
+
+
+if __name__ == "__main__":
+    APP()
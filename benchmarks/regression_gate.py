@@ -0,0 +1,380 @@
+"""Performance regression gate of the converters and the orchestration hot paths.
+
+The hot paths of `hot_paths` are measured on a fixed synthetic cohort
+(same size, pool and seed, see `synthetic_cohort`):
+
+* the runtime, the minimum over several passes,
+* the peak of the memory allocated by the hot path (with `tracemalloc`),
+* the number of filesystem calls (`os.stat`, `open`, `os.scandir`, etc.),
+  counted by wrapping the `os` and `io` functions.
+
+The memory and the filesystem calls are measured in a separate pass,
+so that the wrappers and `tracemalloc` do not slow down the timed passes.
+
+The measures are compared with the stored baselines (`baselines.json`),
+and the gate fails if one of them regresses beyond its threshold.
+The filesystem calls and the peak memory are reproducible, so their thresholds
+are strict, while the runtime threshold is loose, as the runtime is noisy
+on shared machines (an `iterrows` loop is still far beyond it).
+The runtime baselines depend on the machine:
+update them locally with `--update-baselines` before changing the code.
+
+The converters read the gzipped inputs with the pinned `gzip` backend
+and one thread, whatever the optional backends installed on the machine,
+and the baselines record this gzipped file reader.
+The gate refuses baselines measured with another reader.
+
+Before the measures, the gate checks that a samples layout round-trip keeps
+the sample run fingerprints (see `layout_roundtrip`), and that the CLI start-up
+meets its import-time budget without the heavy modules (see `cli_import_time`).
+
+Usage: `python -m benchmarks.regression_gate` (exit code 1 on regression).
+"""
+
+from __future__ import annotations
+
+import builtins
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any
+
+import typer
+
+from benchmarks import cli_import_time, hot_paths, layout_roundtrip
+from benchmarks.gz_readers import env_var
+from pbfbench import gz_reader
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+APP = typer.Typer(rich_markup_mode="rich")
+
+BASELINES_JSON = Path(__file__).parent / "baselines.json"
+
+NUMBER_OF_SAMPLES = 500
+CONVERT_SAMPLES = 50
+POOL_SIZE = 4
+SEED = 0
+GZ_READER_BACKEND = gz_reader.Backends.GZIP
+GZ_READER_THREADS = 1
+GZ_READER = {"backend": str(GZ_READER_BACKEND), "threads": GZ_READER_THREADS}
+
+# The cohort generation is the benchmark own code
+UNGATED_HOT_PATHS = frozenset(("generate_cohort",))
+
+SECONDS = "seconds"
+PEAK_BYTES = "peak_bytes"
+FS_CALLS = "fs_calls"
+
+# Below these differences, a measure is not a regression (noise)
+ABSOLUTE_TOLERANCES = {SECONDS: 0.01, PEAK_BYTES: 64 * 1024, FS_CALLS: 0}
+
+OS_FS_FUNCTION_NAMES = (
+    "stat",
+    "lstat",
+    "open",
+    "scandir",
+    "listdir",
+    "mkdir",
+    "unlink",
+    "rename",
+    "replace",
+    "link",
+)
+
+
+class Options:
+    """Gate options."""
+
+    BASELINES_JSON = typer.Option(help="Baselines JSON file")
+    UPDATE_BASELINES = typer.Option(
+        help="Write the current measures as the new baselines",
+    )
+    REPEATS = typer.Option(min=1, help="Number of timed passes")
+    RUNTIME_THRESHOLD = typer.Option(help="Maximum relative runtime increase")
+    MEMORY_THRESHOLD = typer.Option(help="Maximum relative peak memory increase")
+    FS_CALLS_THRESHOLD = typer.Option(
+        help="Maximum relative filesystem calls increase",
+    )
+    IMPORT_TIME_BUDGET = typer.Option(
+        help="Import-time budget of the CLI start-up (in ms)",
+    )
+
+
+class FSCallCounter:
+    """Count the filesystem calls of the `os` and `io` functions."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.__count = 0
+
+    def count(self) -> int:
+        """Get the number of counted calls."""
+        return self.__count
+
+    @contextmanager
+    def counting(self) -> Iterator[None]:
+        """Wrap the filesystem functions while counting."""
+        patched: list[tuple[object, str, Callable[..., Any]]] = [
+            (os, function_name, getattr(os, function_name))
+            for function_name in OS_FS_FUNCTION_NAMES
+        ]
+        # `io.open` is `builtins.open`, used by `Path.open`
+        patched.extend(((io, "open", io.open), (builtins, "open", builtins.open)))
+        for owner, function_name, function in patched:
+            setattr(owner, function_name, self.__counted(function))
+        try:
+            yield
+        finally:
+            for owner, function_name, function in patched:
+                setattr(owner, function_name, function)
+
+    def __counted(self, function: Callable[..., Any]) -> Callable[..., Any]:
+        def counted_function(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            self.__count += 1
+            return function(*args, **kwargs)
+
+        return counted_function
+
+
+class Measures(hot_paths.Results):
+    """Measures of the hot paths.
+
+    In the counting pass, the peak memory and the filesystem calls are measured,
+    otherwise only the runtime.
+    """
+
+    def __init__(self, counting: bool) -> None:  # noqa: FBT001
+        """Initialize."""
+        super().__init__()
+        self.__counting = counting
+        self.__hot_path_measures: dict[str, dict[str, float]] = {}
+
+    def hot_path_measures(self) -> dict[str, dict[str, float]]:
+        """Get the measures by hot path."""
+        return self.__hot_path_measures
+
+    @contextmanager
+    def time(
+        self,
+        hot_path: str,
+        number_of_samples: int,  # noqa: ARG002
+        items: int,  # noqa: ARG002
+    ) -> Iterator[None]:
+        """Measure a hot path."""
+        if not self.__counting:
+            start = time.perf_counter()
+            yield
+            self.__hot_path_measures[hot_path] = {
+                SECONDS: time.perf_counter() - start,
+            }
+            return
+
+        fs_call_counter = FSCallCounter()
+        tracemalloc.reset_peak()
+        current_before, _ = tracemalloc.get_traced_memory()
+        with fs_call_counter.counting():
+            yield
+        _, peak = tracemalloc.get_traced_memory()
+        self.__hot_path_measures[hot_path] = {
+            PEAK_BYTES: peak - current_before,
+            FS_CALLS: fs_call_counter.count(),
+        }
+
+
+def measure_pass(counting: bool) -> dict[str, dict[str, float]]:  # noqa: FBT001
+    """Measure the hot paths on a new synthetic cohort."""
+    measures = Measures(counting)
+    with tempfile.TemporaryDirectory() as tmp_dir_str:
+        if counting:
+            tracemalloc.start()
+        try:
+            hot_paths.time_cohort(
+                measures,
+                Path(tmp_dir_str),
+                NUMBER_OF_SAMPLES,
+                convert_samples=CONVERT_SAMPLES,
+                pool_size=POOL_SIZE,
+                seed=SEED,
+            )
+        finally:
+            if counting:
+                tracemalloc.stop()
+    return {
+        hot_path: hot_path_measures
+        for hot_path, hot_path_measures in measures.hot_path_measures().items()
+        if hot_path not in UNGATED_HOT_PATHS
+    }
+
+
+def measure(repeats: int) -> dict[str, dict[str, float]]:
+    """Measure the hot paths, the runtime is the minimum of the timed passes.
+
+    The gzipped file reader is pinned to `GZ_READER_BACKEND` and `GZ_READER_THREADS`.
+    """
+    with (
+        env_var(gz_reader.BACKEND_ENV_VAR, GZ_READER_BACKEND),
+        env_var(gz_reader.THREADS_ENV_VAR, str(GZ_READER_THREADS)),
+    ):
+        return _measure(repeats)
+
+
+def _measure(repeats: int) -> dict[str, dict[str, float]]:
+    timed_passes = [measure_pass(counting=False) for _ in range(repeats)]
+    hot_path_measures = measure_pass(counting=True)
+    for hot_path, measures in hot_path_measures.items():
+        measures[SECONDS] = min(
+            timed_pass[hot_path][SECONDS] for timed_pass in timed_passes
+        )
+    return hot_path_measures
+
+
+def regressions(
+    hot_path_measures: dict[str, dict[str, float]],
+    baselines: dict[str, dict[str, float]],
+    thresholds: dict[str, float],
+) -> Iterator[str]:
+    """Iterate over the regression descriptions."""
+    for hot_path, measures in hot_path_measures.items():
+        if hot_path not in baselines:
+            typer.echo(f"No baseline for {hot_path}", err=True)
+            continue
+        for measure_name, threshold in thresholds.items():
+            current = measures[measure_name]
+            baseline = baselines[hot_path][measure_name]
+            if (
+                current > baseline * (1 + threshold)
+                and current - baseline > ABSOLUTE_TOLERANCES[measure_name]
+            ):
+                yield (
+                    f"{hot_path} {measure_name}: {current:g} > {baseline:g}"
+                    f" (+{threshold:.0%} allowed)"
+                )
+
+
+def _echo_measures(
+    hot_path_measures: dict[str, dict[str, float]],
+    baselines: dict[str, dict[str, float]],
+) -> None:
+    typer.echo(
+        f"{'hot path':<30} {'seconds':>18} {'peak KiB':>20} {'fs calls':>18}",
+    )
+    for hot_path, measures in hot_path_measures.items():
+        baseline = baselines.get(hot_path, {})
+        typer.echo(
+            f"{hot_path:<30}"
+            f" {measures[SECONDS]:8.4f} ({baseline.get(SECONDS, float('nan')):7.4f})"
+            f" {measures[PEAK_BYTES] / 1024:9.0f}"
+            f" ({baseline.get(PEAK_BYTES, float('nan')) / 1024:8.0f})"
+            f" {measures[FS_CALLS]:8.0f} ({baseline.get(FS_CALLS, float('nan')):7.0f})",
+        )
+
+
+def _read_baselines(baselines_json: Path) -> dict[str, dict[str, float]]:
+    """Read the baselines of the hot paths.
+
+    Raises
+    ------
+    typer.Exit
+        The baselines were measured with another gzipped file reader.
+    """
+    with baselines_json.open() as f_in:
+        baselines_data = json.load(f_in)
+    if baselines_data.get("gz_reader") != GZ_READER:
+        typer.echo(
+            "The baselines were measured with the gzipped file reader"
+            f" {baselines_data.get('gz_reader')}, not {GZ_READER}:"
+            " update them with `--update-baselines`",
+            err=True,
+        )
+        raise typer.Exit(1)
+    return baselines_data["hot_paths"]
+
+
+@APP.command()
+def main(  # noqa: PLR0913, PLR0917
+    baselines_json: Annotated[Path, Options.BASELINES_JSON] = BASELINES_JSON,
+    update_baselines: Annotated[bool, Options.UPDATE_BASELINES] = False,  # noqa: FBT002
+    repeats: Annotated[int, Options.REPEATS] = 5,
+    runtime_threshold: Annotated[float, Options.RUNTIME_THRESHOLD] = 1.0,
+    memory_threshold: Annotated[float, Options.MEMORY_THRESHOLD] = 0.2,
+    fs_calls_threshold: Annotated[float, Options.FS_CALLS_THRESHOLD] = 0.05,
+    import_time_budget: Annotated[
+        float,
+        Options.IMPORT_TIME_BUDGET,
+    ] = cli_import_time.DEFAULT_BUDGET,
+) -> None:
+    """Check the hot paths against the stored baselines."""
+    with tempfile.TemporaryDirectory() as tmp_dir_str:
+        check_failures = [
+            f"Layout round-trip: {layout_failure}"
+            for layout_failure in layout_roundtrip.roundtrip_failures(
+                Path(tmp_dir_str),
+                NUMBER_OF_SAMPLES,
+                POOL_SIZE,
+                SEED,
+            )
+        ]
+    check_failures.extend(
+        f"CLI start-up: {import_time_failure}"
+        for import_time_failure in cli_import_time.budget_failures(
+            import_time_budget,
+            cli_import_time.DEFAULT_REPEATS,
+        )
+    )
+    for check_failure in check_failures:
+        typer.echo(check_failure, err=True)
+    if check_failures:
+        raise typer.Exit(1)
+    baselines = None if update_baselines else _read_baselines(baselines_json)
+    hot_path_measures = measure(repeats)
+
+    if baselines is None:
+        with baselines_json.open("w") as f_out:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "number_of_samples": NUMBER_OF_SAMPLES,
+                    "convert_samples": CONVERT_SAMPLES,
+                    "pool_size": POOL_SIZE,
+                    "seed": SEED,
+                    "gz_reader": GZ_READER,
+                    "hot_paths": hot_path_measures,
+                },
+                f_out,
+                indent=2,
+            )
+            f_out.write("\n")
+        _echo_measures(hot_path_measures, hot_path_measures)
+        typer.echo(f"Baselines written in {baselines_json}")
+        return
+
+    _echo_measures(hot_path_measures, baselines)
+    found_regressions = list(
+        regressions(
+            hot_path_measures,
+            baselines,
+            {
+                SECONDS: runtime_threshold,
+                PEAK_BYTES: memory_threshold,
+                FS_CALLS: fs_calls_threshold,
+            },
+        ),
+    )
+    for regression in found_regressions:
+        typer.echo(f"Regression: {regression}", err=True)
+    if found_regressions:
+        raise typer.Exit(1)
+    typer.echo("No performance regression")
+
+
+if __name__ == "__main__":
+    APP()
@@ -0,0 +1,440 @@
+"""Synthetic cohort generator.
+
+A synthetic data directory is written with:
+
+* `samples.tsv` with the given number of samples
+* a `UNICYCLER` assembly experiment (`assembly.gfa.gz` and `assembly.fasta.gz`)
+* a `PLATON` seeds experiment (plasmid stats TSV) on the assemblies
+* a `PLASGRAPH2` plasmidness experiment (plasmid probabilities CSV)
+  on the assembly graphs
+
+Each experiment mixes done, error and not run samples,
+the Platon and plASgraph2 done samples having a done assembly.
+The assemblies are drawn from a pool of distinct synthetic assemblies
+(log-normal numbers and lengths of segments) and hardlinked in the sample
+directories, so that large cohorts are cheap to write.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import math
+import os
+import random
+from enum import StrEnum
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+import pbfbench.abc.tool.environments as abc_tools_envs
+import pbfbench.experiment.config as exp_cfg
+import pbfbench.experiment.file_system as exp_fs
+import pbfbench.experiment.fingerprint as exp_fingerprint
+import pbfbench.samples.file_system as smp_fs
+import pbfbench.samples.items as smp_items
+import pbfbench.topics.assembly.results.items as asm_res_items
+import pbfbench.topics.assembly.visitor as asm_visitor
+import pbfbench.topics.plasmidness.plasgraph2.config as plasgraph2_cfg
+import pbfbench.topics.plasmidness.plasgraph2.description as plasgraph2_desc
+import pbfbench.topics.plasmidness.plasgraph2.results as plasgraph2_res
+import pbfbench.topics.seeds.platon.config as platon_cfg
+import pbfbench.topics.seeds.platon.description as platon_desc
+import pbfbench.topics.seeds.platon.results as platon_res
+import pbfbench.topics.seeds.platon.visitor as platon_visitor
+
+APP = typer.Typer(rich_markup_mode="rich")
+
+EXP_NAME = "default"
+
+NUMBER_OF_SPECIES = 20
+
+# Log-normal parameters: median and shape (sigma)
+SEGMENTS_MEDIAN = 300
+SEGMENTS_SIGMA = 0.8
+SEGMENTS_RANGE = (10, 5000)
+SEGMENT_LENGTH_MEDIAN = 2000
+SEGMENT_LENGTH_SIGMA = 1.2
+SEGMENT_LENGTH_RANGE = (50, 500_000)
+
+# One contig out of `PLATON_CONTIG_STEP` is in the Platon plasmid stats
+PLATON_CONTIG_STEP = 20
+
+_ACGT_TABLE = bytes(b"ACGT"[byte % 4] for byte in range(256))
+
+
+class Status(StrEnum):
+    """Synthetic sample status."""
+
+    DONE = "done"
+    ERROR = "error"
+    NOT_RUN = "not_run"
+
+
+class StatusWeights:
+    """Probabilities of the sample statuses."""
+
+    def __init__(self, done: float, error: float) -> None:
+        """Initialize, the remaining probability is the not run one."""
+        self.__done = done
+        self.__error = error
+
+    def draw(self, rng: random.Random) -> Status:
+        """Draw a status."""
+        draw = rng.random()
+        if draw < self.__done:
+            return Status.DONE
+        if draw < self.__done + self.__error:
+            return Status.ERROR
+        return Status.NOT_RUN
+
+
+ASSEMBLY_STATUS_WEIGHTS = StatusWeights(0.9, 0.05)
+PLATON_STATUS_WEIGHTS = StatusWeights(0.5, 0.1)
+PLASGRAPH2_STATUS_WEIGHTS = StatusWeights(0.9, 0.05)
+
+
+class Options:
+    """Generator options."""
+
+    NUMBER_OF_SAMPLES = typer.Option(help="Number of samples")
+    POOL_SIZE = typer.Option(help="Number of distinct synthetic assemblies")
+    SAMPLES_LAYOUT = typer.Option(help="Sample directories layout")
+    SEED = typer.Option(help="Random seed")
+
+
+class Cohort:
+    """Synthetic cohort data directory."""
+
+    POOL_DIR_NAME = Path("pool")
+
+    def __init__(self, data_dir: Path) -> None:
+        """Initialize."""
+        self.__data_dir = data_dir
+
+    def data_dir(self) -> Path:
+        """Get data directory."""
+        return self.__data_dir
+
+    def pool_dir(self) -> Path:
+        """Get the directory of the synthetic assemblies pool."""
+        return self.__data_dir / self.POOL_DIR_NAME
+
+    def samples_tsv(self) -> Path:
+        """Get samples TSV file."""
+        return self.__data_dir / exp_fs.DataManager.SAMPLES_TSV_NAME
+
+    def row_numbered_samples(self) -> list[smp_fs.RowNumberedItem]:
+        """Get the row numbered samples."""
+        with smp_fs.TSVReader.open(self.samples_tsv()) as reader:
+            return list(reader.iter_row_numbered_items())
+
+    def assembly_exp(self) -> exp_fs.DataManager:
+        """Get the Unicycler experiment file system manager."""
+        return exp_fs.DataManager(
+            self.__data_dir,
+            asm_visitor.Tools.UNICYCLER.to_description(),
+            EXP_NAME,
+        )
+
+    def platon_exp(self) -> exp_fs.DataManager:
+        """Get the Platon experiment file system manager."""
+        return exp_fs.DataManager(self.__data_dir, platon_desc.DESCRIPTION, EXP_NAME)
+
+    def platon_exp_config(self) -> platon_cfg.ExpConfig:
+        """Get the Platon experiment config."""
+        return platon_cfg.ExpConfig.from_yaml(self.platon_exp().config_yaml())
+
+    def plasgraph2_exp(self) -> exp_fs.DataManager:
+        """Get the plASgraph2 experiment file system manager."""
+        return exp_fs.DataManager(
+            self.__data_dir,
+            plasgraph2_desc.DESCRIPTION,
+            EXP_NAME,
+        )
+
+    def work_manager(self, work_dir: Path) -> exp_fs.WorkManager:
+        """Get the Platon working experiment file system manager."""
+        return exp_fs.WorkManager(work_dir, platon_desc.DESCRIPTION, EXP_NAME)
+
+    def platon_fingerprinter(self, work_dir: Path) -> exp_fingerprint.Fingerprinter:
+        """Get the fingerprinter of the Platon experiment (as the run does)."""
+        exp_config = self.platon_exp_config()
+        return exp_fingerprint.Fingerprinter(
+            exp_config.tool_configs(),
+            platon_visitor.CONNECTOR.inputs_to_commands(
+                exp_config,
+                self.platon_exp(),
+                self.work_manager(work_dir),
+            ).core_commands(),
+            platon_visitor.CONNECTOR.config_to_inputs(
+                exp_config,
+                self.platon_exp(),
+            ).values(),
+        )
+
+
+def generate(
+    data_dir: Path,
+    number_of_samples: int,
+    pool_size: int,
+    seed: int,
+    samples_layout: exp_fs.SamplesLayout = exp_fs.SamplesLayout.FLAT,
+) -> Cohort:
+    """Write a synthetic cohort in the data directory."""
+    rng = random.Random(seed)  # noqa: S311 # not for cryptographic purposes
+    cohort = Cohort(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    exp_fs.write_samples_layout(data_dir, samples_layout)
+    _write_samples_tsv(cohort.samples_tsv(), number_of_samples)
+    pool = [
+        _write_pool_assembly(cohort.pool_dir() / str(index), rng)
+        for index in range(pool_size)
+    ]
+    _write_experiment_files(cohort)
+
+    assembly_exp = cohort.assembly_exp()
+    platon_exp = cohort.platon_exp()
+    plasgraph2_exp = cohort.plasgraph2_exp()
+    done_platon_samples: list[smp_items.Item] = []
+    for row_numbered_sample in cohort.row_numbered_samples():
+        sample_item = row_numbered_sample.item()
+        pool_assembly = pool[rng.randrange(pool_size)]
+        assembly_status = ASSEMBLY_STATUS_WEIGHTS.draw(rng)
+        _write_sample(
+            assembly_exp,
+            sample_item,
+            assembly_status,
+            {
+                asm_res_items.AsmGraphGZ.ASSEMBLY_GFA_GZ_NAME: pool_assembly.gfa_gz,
+                asm_res_items.FastaGZ.FASTA_GZ_NAME: pool_assembly.fasta_gz,
+            },
+        )
+        platon_status = PLATON_STATUS_WEIGHTS.draw(rng)
+        if assembly_status != Status.DONE and platon_status == Status.DONE:
+            platon_status = Status.NOT_RUN
+        _write_sample(
+            platon_exp,
+            sample_item,
+            platon_status,
+            {platon_res.PlasmidStats.TSV_NAME: pool_assembly.platon_tsv},
+        )
+        if platon_status == Status.DONE:
+            done_platon_samples.append(sample_item)
+        plasgraph2_status = PLASGRAPH2_STATUS_WEIGHTS.draw(rng)
+        if assembly_status != Status.DONE and plasgraph2_status == Status.DONE:
+            plasgraph2_status = Status.NOT_RUN
+        _write_sample(
+            plasgraph2_exp,
+            sample_item,
+            plasgraph2_status,
+            {
+                plasgraph2_res.PlasmidProbabilities.CSV_NAME: (
+                    pool_assembly.plasgraph2_csv
+                ),
+            },
+        )
+
+    # The done Platon samples are up to date
+    fingerprinter = cohort.platon_fingerprinter(data_dir)
+    for sample_item in done_platon_samples:
+        exp_fingerprint.write(
+            platon_exp.sample_fs_manager(sample_item),
+            fingerprinter.fingerprint(sample_item),
+        )
+    return cohort
+
+
+class _PoolAssembly:
+    """Synthetic assembly files of the pool."""
+
+    def __init__(self, pool_assembly_dir: Path) -> None:
+        """Initialize."""
+        self.gfa_gz = pool_assembly_dir / asm_res_items.AsmGraphGZ.ASSEMBLY_GFA_GZ_NAME
+        self.fasta_gz = pool_assembly_dir / asm_res_items.FastaGZ.FASTA_GZ_NAME
+        self.platon_tsv = pool_assembly_dir / platon_res.PlasmidStats.TSV_NAME
+        self.plasgraph2_csv = (
+            pool_assembly_dir / plasgraph2_res.PlasmidProbabilities.CSV_NAME
+        )
+
+
+def _write_samples_tsv(samples_tsv: Path, number_of_samples: int) -> None:
+    """Write the samples TSV file."""
+    with samples_tsv.open("w", newline="") as f_out:
+        writer = csv.writer(f_out, delimiter="\t", lineterminator="\n")
+        writer.writerow([smp_fs.TSVHeader.SPECIES_ID, smp_fs.TSVHeader.SAMPLE_ID])
+        for index in range(number_of_samples):
+            writer.writerow([f"sp{index % NUMBER_OF_SPECIES:02d}", f"SAMN{index:08d}"])
+
+
+def _log_normal_int(
+    rng: random.Random,
+    median: int,
+    sigma: float,
+    bounds: tuple[int, int],
+) -> int:
+    """Draw a bounded log-normal integer."""
+    return min(
+        max(round(rng.lognormvariate(math.log(median), sigma)), bounds[0]),
+        bounds[1],
+    )
+
+
+def _write_pool_assembly(pool_assembly_dir: Path, rng: random.Random) -> _PoolAssembly:
+    """Write one synthetic assembly of the pool and its tool outputs."""
+    pool_assembly_dir.mkdir(parents=True, exist_ok=True)
+    pool_assembly = _PoolAssembly(pool_assembly_dir)
+    number_of_segments = _log_normal_int(
+        rng,
+        SEGMENTS_MEDIAN,
+        SEGMENTS_SIGMA,
+        SEGMENTS_RANGE,
+    )
+    lengths = [
+        _log_normal_int(
+            rng,
+            SEGMENT_LENGTH_MEDIAN,
+            SEGMENT_LENGTH_SIGMA,
+            SEGMENT_LENGTH_RANGE,
+        )
+        for _ in range(number_of_segments)
+    ]
+    with (
+        gzip.open(pool_assembly.gfa_gz, "wb", compresslevel=6) as gfa_out,
+        gzip.open(pool_assembly.fasta_gz, "wb", compresslevel=6) as fasta_out,
+    ):
+        gfa_out.write(b"H\tVN:Z:1.0\n")
+        for segment_id, length in enumerate(lengths, start=1):
+            sequence = rng.randbytes(length).translate(_ACGT_TABLE)
+            gfa_out.write(
+                b"S\t%d\t%b\tLN:i:%d\tdp:f:1.0\n" % (segment_id, sequence, length),
+            )
+            fasta_out.write(b">%d length=%d\n%b\n" % (segment_id, length, sequence))
+        for segment_id in range(1, number_of_segments):
+            gfa_out.write(b"L\t%d\t+\t%d\t+\t0M\n" % (segment_id, segment_id + 1))
+
+    with pool_assembly.platon_tsv.open("w") as f_out:
+        f_out.write("ID\tLength\tCoverage\tORFs\tRDS\tCircular\n")
+        for segment_id in range(1, number_of_segments + 1, PLATON_CONTIG_STEP):
+            f_out.write(
+                f"{segment_id}\t{lengths[segment_id - 1]}\t1.0\t3\t{rng.random():.2f}"
+                "\tno\n",
+            )
+
+    with pool_assembly.plasgraph2_csv.open("w") as f_out:
+        f_out.write("contig,chrom_score,plasmid_score,label\n")
+        for segment_id, length in enumerate(lengths, start=1):
+            plasmid_score = rng.random()
+            label = "plasmid" if plasmid_score > 0.5 else "chromosome"  # noqa: PLR2004
+            f_out.write(
+                f"{segment_id} length={length},{1 - plasmid_score:.4f}"
+                f",{plasmid_score:.4f},{label}\n",
+            )
+    return pool_assembly
+
+
+def _write_experiment_files(cohort: Cohort) -> None:
+    """Write the experiment configs, dates and the Platon environment wrapper.
+
+    The assembly experiment has a config as well,
+    so that its sample directories are migrated with the samples layout.
+    """
+    slurm_options = ["--cpus-per-task=1", "--mem=4G"]
+    assembly_arg = [asm_visitor.Tools.UNICYCLER.to_description().name(), EXP_NAME]
+    exp_configs: tuple[tuple[exp_fs.DataManager, exp_cfg.ConfigWithOptions], ...] = (
+        (
+            cohort.assembly_exp(),
+            exp_cfg.ConfigOnlyOptions.from_yaml_load(
+                {
+                    "name": EXP_NAME,
+                    "tool": {"options": []},
+                    "slurm": slurm_options,
+                },
+            ),
+        ),
+        (
+            cohort.platon_exp(),
+            platon_cfg.ExpConfig.from_yaml_load(
+                {
+                    "name": EXP_NAME,
+                    "tool": {
+                        "arguments": {platon_cfg.Names.GENOME: assembly_arg},
+                        "options": [],
+                    },
+                    "slurm": slurm_options,
+                },
+            ),
+        ),
+        (
+            cohort.plasgraph2_exp(),
+            plasgraph2_cfg.ExpConfig.from_yaml_load(
+                {
+                    "name": EXP_NAME,
+                    "tool": {
+                        "arguments": {plasgraph2_cfg.Names.GFA: assembly_arg},
+                        "options": [],
+                    },
+                    "slurm": slurm_options,
+                },
+            ),
+        ),
+    )
+    for data_exp_fs_manager, exp_config in exp_configs:
+        data_exp_fs_manager.exp_dir().mkdir(parents=True, exist_ok=True)
+        exp_config.to_yaml(data_exp_fs_manager.config_yaml())
+        data_exp_fs_manager.date_txt().write_text(data_exp_fs_manager.date_str())
+    cohort.platon_exp().tool_env_script_sh().write_text(
+        "#!/bin/bash\n"
+        f"{abc_tools_envs.BashEnvWrapper.BEGIN_ENV_MAGIC_COMMENT}\n"
+        "module load platon\n"
+        f"{abc_tools_envs.BashEnvWrapper.MID_ENV_MAGIC_COMMENT}\n"
+        "module unload platon\n"
+        f"{abc_tools_envs.BashEnvWrapper.END_ENV_MAGIC_COMMENT}\n",
+    )
+
+
+def _write_sample(
+    data_exp_fs_manager: exp_fs.DataManager,
+    sample_item: smp_items.Item,
+    status: Status,
+    done_files: dict[Path, Path],
+) -> None:
+    """Write the sample directory of an experiment.
+
+    The done samples hardlink their output files from the pool.
+    """
+    if status == Status.NOT_RUN:
+        return
+    sample_fs_manager = data_exp_fs_manager.sample_fs_manager(sample_item)
+    sample_fs_manager.sample_dir().mkdir(parents=True, exist_ok=True)
+    match status:
+        case Status.DONE:
+            for file_name, pool_file in done_files.items():
+                os.link(pool_file, sample_fs_manager.sample_dir() / file_name)
+            sample_fs_manager.sbatch_stats_psv().write_text(
+                "JobID|Elapsed|MaxRSS\n1_1|00:10:00|1G\n",
+            )
+            sample_fs_manager.done_log().touch()
+        case Status.ERROR:
+            sample_fs_manager.errors_log().touch()
+
+
+@APP.command()
+def main(
+    data_dir: Annotated[Path, typer.Argument(help="Data directory to write")],
+    number_of_samples: Annotated[int, Options.NUMBER_OF_SAMPLES] = 1000,
+    pool_size: Annotated[int, Options.POOL_SIZE] = 16,
+    samples_layout: Annotated[
+        exp_fs.SamplesLayout,
+        Options.SAMPLES_LAYOUT,
+    ] = exp_fs.SamplesLayout.FLAT,
+    seed: Annotated[int, Options.SEED] = 0,
+) -> None:
+    """Write a synthetic cohort data directory."""
+    generate(data_dir, number_of_samples, pool_size, seed, samples_layout)
+    typer.echo(f"Synthetic cohort of {number_of_samples} samples in {data_dir}")
+
+
+if __name__ == "__main__":
+    APP()
@@ -7,5 +7,6 @@ class FinalCommands(StrEnum):
     """Final commands."""
 
     INIT = "init"
+    INIT_SAMPLE = "init-sample"
     CHECK = "check"
     RUN = "run"
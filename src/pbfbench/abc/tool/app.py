@@ -1,7 +1,7 @@
 """Tool abstract application module."""
 
 # Due to typer usage:
-# ruff: noqa: TC001, TC003, UP007, FBT001, FBT002, PLR0913
+# ruff: noqa: TC001, TC003, UP007, FBT001, FBT002, PLR0913, PLR0917
 
 from __future__ import annotations
 
@@ -19,9 +19,12 @@ import pbfbench.abc.topic.visitor as abc_topic_visitor
 import pbfbench.experiment.checks as exp_checks
 import pbfbench.experiment.config as exp_cfg
 import pbfbench.experiment.file_system as exp_fs
+import pbfbench.experiment.metrics as exp_metrics
+import pbfbench.experiment.options as exp_options
 import pbfbench.experiment.run as exp_run
+import pbfbench.experiment.trace as exp_trace
 import pbfbench.slurm.config as slurm_cfg
-from pbfbench import root_logging
+from pbfbench import profiling, root_logging
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -84,6 +87,47 @@ class Arguments:
     )
 
 
+class Options:
+    """Tool application options."""
+
+    ARCHIVE_LOGS = typer.Option(
+        help="Pack the sample logs in one compressed archive per sample",
+    )
+    GZ_CACHE_DIR = typer.Option(
+        help=(
+            "Shared cache directory of the decompressed inputs"
+            " (e.g. on the node local scratch), no cache by default"
+        ),
+    )
+    GZ_CACHE_MAX_SIZE = typer.Option(
+        help="Maximum size of the decompressed inputs cache (in GB)",
+    )
+    METRICS_PROM = typer.Option(
+        help=(
+            "Prometheus metrics file updated during the run"
+            " (e.g. in the node exporter textfile collector directory)"
+        ),
+    )
+    JOBS = typer.Option(
+        "--jobs",
+        "-j",
+        min=1,
+        help="Maximum number of samples converted in parallel",
+    )
+    SBATCH = typer.Option(
+        help=(
+            "Convert the sample inputs in a Slurm job array"
+            " (the experiment slurm configuration is used)"
+        ),
+    )
+    STAGE_ON_SCRATCH = typer.Option(
+        help=(
+            "Write the intermediate inputs and the tool outputs"
+            " on the node local scratch ($SLURM_TMPDIR or $TMPDIR)"
+        ),
+    )
+
+
 class RunAppWithOptions[C: abc_tool_visitor.ConnectorWithOptions](ABC):
     """Run application."""
 
@@ -107,6 +151,14 @@ class RunAppWithOptions[C: abc_tool_visitor.ConnectorWithOptions](ABC):
         data_dir: Annotated[Path, Arguments.DATA_DIR],
         work_dir: Annotated[Path, Arguments.WORK_DIR],
         exp_config_yaml: Annotated[Path, Arguments.EXP_CONFIG_YAML],
+        archive_logs: Annotated[bool, Options.ARCHIVE_LOGS] = False,
+        stage_on_scratch: Annotated[bool, Options.STAGE_ON_SCRATCH] = False,
+        gz_cache_dir: Annotated[Path | None, Options.GZ_CACHE_DIR] = None,
+        gz_cache_max_size: Annotated[
+            float,
+            Options.GZ_CACHE_MAX_SIZE,
+        ] = exp_options.DEFAULT_GZ_CACHE_MAX_SIZE,
+        metrics_prom: Annotated[Path | None, Options.METRICS_PROM] = None,
         debug: Annotated[bool, root_logging.OPT_DEBUG] = False,
     ) -> None:
         """Run tool."""
@@ -122,28 +174,50 @@ class RunAppOnlyOptions(RunAppWithOptions[abc_tool_visitor.ConnectorOnlyOptions]
         data_dir: Annotated[Path, Arguments.DATA_DIR],
         work_dir: Annotated[Path, Arguments.WORK_DIR],
         exp_config_yaml: Annotated[Path, Arguments.EXP_CONFIG_YAML],
+        archive_logs: Annotated[bool, Options.ARCHIVE_LOGS] = False,
+        stage_on_scratch: Annotated[bool, Options.STAGE_ON_SCRATCH] = False,
+        gz_cache_dir: Annotated[Path | None, Options.GZ_CACHE_DIR] = None,
+        gz_cache_max_size: Annotated[
+            float,
+            Options.GZ_CACHE_MAX_SIZE,
+        ] = exp_options.DEFAULT_GZ_CACHE_MAX_SIZE,
+        metrics_prom: Annotated[Path | None, Options.METRICS_PROM] = None,
         debug: Annotated[bool, root_logging.OPT_DEBUG] = False,
     ) -> None:
         """Run tool."""
         root_logging.init_logger(_LOGGER, "Run tool", debug)
 
-        (data_exp_fs_manager, work_exp_fs_manager, exp_config) = (
-            _check_experiment_success_only_options(
-                data_dir,
-                work_dir,
-                exp_config_yaml,
-                self._connector,
-            )
-        )
-        #
-        # Use the tool connector to run the experiment
-        #
-        run_stats = exp_run.run_experiment_on_samples_only_options(
-            data_exp_fs_manager,
-            work_exp_fs_manager,
-            exp_config,
-            self._connector,
-        )
+        # The config checks are recorded in the run timing trace
+        with exp_trace.tracing():
+            with exp_trace.span("config checks"):
+                (data_exp_fs_manager, work_exp_fs_manager, exp_config) = (
+                    _check_experiment_success_only_options(
+                        data_dir,
+                        work_dir,
+                        exp_config_yaml,
+                        self._connector,
+                    )
+                )
+            profiling.set_output_dir(data_exp_fs_manager.exp_dir())
+            _set_log_context(data_exp_fs_manager)
+            #
+            # Use the tool connector to run the experiment
+            #
+            with exp_metrics.exporting(metrics_prom, data_exp_fs_manager):
+                run_stats = exp_run.run_experiment_on_samples_only_options(
+                    data_exp_fs_manager,
+                    work_exp_fs_manager,
+                    exp_config,
+                    self._connector,
+                    exp_options.RunOptions(
+                        archive_logs=archive_logs,
+                        stage_on_scratch=stage_on_scratch,
+                        gz_cache_dir=(
+                            gz_cache_dir.resolve() if gz_cache_dir is not None else None
+                        ),
+                        gz_cache_max_size=gz_cache_max_size,
+                    ),
+                )
         _LOGGER.info(
             "Total number of samples: %d\n"
             "* Number of already done samples: %d\n"
@@ -168,28 +242,50 @@ class RunAppWithArguments(RunAppWithOptions[abc_tool_visitor.ConnectorWithArgume
         data_dir: Annotated[Path, Arguments.DATA_DIR],
         work_dir: Annotated[Path, Arguments.WORK_DIR],
         exp_config_yaml: Annotated[Path, Arguments.EXP_CONFIG_YAML],
+        archive_logs: Annotated[bool, Options.ARCHIVE_LOGS] = False,
+        stage_on_scratch: Annotated[bool, Options.STAGE_ON_SCRATCH] = False,
+        gz_cache_dir: Annotated[Path | None, Options.GZ_CACHE_DIR] = None,
+        gz_cache_max_size: Annotated[
+            float,
+            Options.GZ_CACHE_MAX_SIZE,
+        ] = exp_options.DEFAULT_GZ_CACHE_MAX_SIZE,
+        metrics_prom: Annotated[Path | None, Options.METRICS_PROM] = None,
         debug: Annotated[bool, root_logging.OPT_DEBUG] = False,
     ) -> None:
         """Run tool."""
         root_logging.init_logger(_LOGGER, "Run tool", debug)
 
-        (data_exp_fs_manager, work_exp_fs_manager, exp_config) = (
-            _check_experiment_success_with_arguments(
-                data_dir,
-                work_dir,
-                exp_config_yaml,
-                self._connector,
-            )
-        )
-        #
-        # Use the tool connector to run the experiment
-        #
-        run_stats = exp_run.run_experiment_on_samples_with_arguments(
-            data_exp_fs_manager,
-            work_exp_fs_manager,
-            exp_config,
-            self._connector,
-        )
+        # The config checks are recorded in the run timing trace
+        with exp_trace.tracing():
+            with exp_trace.span("config checks"):
+                (data_exp_fs_manager, work_exp_fs_manager, exp_config) = (
+                    _check_experiment_success_with_arguments(
+                        data_dir,
+                        work_dir,
+                        exp_config_yaml,
+                        self._connector,
+                    )
+                )
+            profiling.set_output_dir(data_exp_fs_manager.exp_dir())
+            _set_log_context(data_exp_fs_manager)
+            #
+            # Use the tool connector to run the experiment
+            #
+            with exp_metrics.exporting(metrics_prom, data_exp_fs_manager):
+                run_stats = exp_run.run_experiment_on_samples_with_arguments(
+                    data_exp_fs_manager,
+                    work_exp_fs_manager,
+                    exp_config,
+                    self._connector,
+                    exp_options.RunOptions(
+                        archive_logs=archive_logs,
+                        stage_on_scratch=stage_on_scratch,
+                        gz_cache_dir=(
+                            gz_cache_dir.resolve() if gz_cache_dir is not None else None
+                        ),
+                        gz_cache_max_size=gz_cache_max_size,
+                    ),
+                )
         _number_of_running_samples = run_stats.number_of_samples_to_run() - len(
             run_stats.samples_with_missing_inputs(),
         )
@@ -351,24 +447,36 @@ class InitAPP(ABC):
         data_dir: Annotated[Path, Arguments.DATA_DIR],
         work_dir: Annotated[Path, Arguments.WORK_DIR],
         exp_config_yaml: Annotated[Path, Arguments.EXP_CONFIG_YAML],
+        jobs: Annotated[int, Options.JOBS] = 1,
+        sbatch: Annotated[bool, Options.SBATCH] = False,
         debug: Annotated[bool, root_logging.OPT_DEBUG] = False,
     ) -> None:
         """Init tool."""
         root_logging.init_logger(_LOGGER, "Initialize inputs for the tool", debug)
 
-        (data_exp_fs_manager, work_exp_fs_manager, exp_config) = (
-            _check_experiment_success_with_arguments(
-                data_dir,
-                work_dir,
-                exp_config_yaml,
-                self.__connector,
+        # The config checks are recorded in the init timing trace
+        with exp_trace.tracing():
+            with exp_trace.span("config checks"):
+                (data_exp_fs_manager, work_exp_fs_manager, exp_config) = (
+                    _check_experiment_success_with_arguments(
+                        data_dir,
+                        work_dir,
+                        exp_config_yaml,
+                        self.__connector,
+                    )
+                )
+            profiling.set_output_dir(data_exp_fs_manager.exp_dir())
+            _set_log_context(data_exp_fs_manager)
+
+            # TODO copy config in data dir (already created it seems)
+            # REFACTOR generalize with runApp
+
+            self._init(
+                data_exp_fs_manager,
+                work_exp_fs_manager,
+                exp_config,
+                exp_options.InitOptions(jobs=jobs, use_sbatch=sbatch),
             )
-        )
-
-        # TODO copy config in data dir (already created it seems)
-        # REFACTOR generalize with runApp
-
-        self._init(data_exp_fs_manager, work_exp_fs_manager, exp_config)
 
     @abstractmethod
     def _init(
@@ -376,6 +484,7 @@ class InitAPP(ABC):
         data_exp_fs_manager: exp_fs.DataManager,
         work_exp_fs_manager: exp_fs.WorkManager,
         config: exp_cfg.ConfigWithArguments,
+        init_options: exp_options.InitOptions,
     ) -> None:
         """Init tool."""
         raise NotImplementedError
@@ -439,3 +548,12 @@ def _check_experiment_success_with_arguments(
         case exp_checks.ErrorsWithArguments():
             _LOGGER.critical("The experiment checkers found errors")
             raise typer.Exit(1)
+
+
+def _set_log_context(data_exp_fs_manager: exp_fs.DataManager) -> None:
+    """Set the experiment fields of the JSON log records."""
+    root_logging.set_log_context(
+        topic=data_exp_fs_manager.tool_description().topic().name(),
+        tool=data_exp_fs_manager.tool_description().name(),
+        experiment=data_exp_fs_manager.experiment_name(),
+    )
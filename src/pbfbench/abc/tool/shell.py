@@ -3,30 +3,49 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pbfbench.abc.module_meta as abc_meta_mod
 import pbfbench.abc.tool.config as abc_tool_cfg
 import pbfbench.abc.topic.results.items as abc_topic_res_items
 import pbfbench.experiment.file_system as exp_fs
+import pbfbench.experiment.options as exp_options
 import pbfbench.samples.shell as smp_sh
 import pbfbench.shell as sh
+import pbfbench.slurm.shell as slurm_sh
+import pbfbench.slurm.timing as slurm_timing
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator
-    from pathlib import Path
 
 
 class ArgBashLinesBuilder[R: abc_topic_res_items.Result](ABC):
-    """Argument bash lines builder."""
+    """Argument bash lines builder.
+
+    The intermediate input files (e.g. decompressed inputs)
+    must be written in the input temporary directory (see `tmp_dir` method),
+    which is on the node local scratch when the staging is enabled.
+    The tool output files must be written in the tool output directory
+    (see `work_exp_sample_dir` method).
+    """
+
+    TMP_DIR_VAR = sh.Variable("PBFBENCH_INPUT_TMP_DIR")
+    WORK_EXP_SAMPLE_DIR_VAR = sh.Variable("WORK_EXP_SAMPLE_DIR")
+
+    GZ_CACHE_HOLDER = '"${HOSTNAME}:$$"'
 
     def __init__(
         self,
         input_result: R,
         work_exp_fs_manager: exp_fs.WorkManager,
+        run_options: exp_options.RunOptions | None = None,
     ) -> None:
         """Initialize."""
         self._input_result = input_result
+        self._run_options = (
+            run_options if run_options is not None else exp_options.RunOptions()
+        )
         self._input_data_smp_sh_fs_manager = smp_sh.sample_shell_fs_manager(
             input_result.exp_fs_manager(),
         )
@@ -51,6 +70,88 @@ class ArgBashLinesBuilder[R: abc_topic_res_items.Result](ABC):
         """Get working sample shell file system manager."""
         return self._work_smp_sh_fs_manager
 
+    def run_options(self) -> exp_options.RunOptions:
+        """Get run options."""
+        return self._run_options
+
+    def tmp_dir(self) -> Path:
+        """Get input temporary directory shell path."""
+        return Path(self.TMP_DIR_VAR.eval())
+
+    def work_exp_sample_dir(self) -> Path:
+        """Get tool output directory shell path.
+
+        It is the scratch outputs directory when the staging is enabled,
+        the working sample directory otherwise.
+        """
+        return Path(self.WORK_EXP_SAMPLE_DIR_VAR.eval())
+
+    def decompress_lines(
+        self,
+        gz_file: Path | str,
+        decompressed_var: sh.Variable,
+        decompressed_tmp_file: Path,
+    ) -> Iterator[str]:
+        """Set the variable to a decompressed copy of the gzipped file.
+
+        With the shared cache of decompressed inputs,
+        the copy is taken from (or added to) the cache,
+        and released when the script exits (even on error),
+        otherwise the file is decompressed in the temporary file.
+        """
+        gz_cache_dir = self._run_options.gz_cache_dir()
+        if gz_cache_dir is None:
+            yield decompressed_var.set(sh.path_to_str(decompressed_tmp_file))
+            yield (
+                "gunzip -k -c"
+                f" {sh.path_to_str(gz_file)}"
+                f"> {sh.path_to_str(decompressed_var.eval())}"
+            )
+        else:
+            yield decompressed_var.set(
+                "$(" + self.__gz_cache_command("acquire", gz_cache_dir, gz_file) + ")",
+            )
+            yield sh.at_exit(
+                self.__gz_cache_command("release", gz_cache_dir, gz_file),
+            )
+
+    def remove_decompressed_lines(
+        self,
+        decompressed_var: sh.Variable,
+    ) -> Iterator[str]:
+        """Remove the decompressed copy of the gzipped file.
+
+        The copy of the shared cache is released at the script exit
+        (see `decompress_lines`).
+        """
+        if self._run_options.gz_cache_dir() is None:
+            yield f"rm -f {sh.path_to_str(decompressed_var.eval())}"
+
+    def __gz_cache_command(
+        self,
+        subcommand: str,
+        gz_cache_dir: Path,
+        gz_file: Path | str,
+    ) -> str:
+        """Get the decompressed inputs cache command."""
+        return sh.pbfbench_command(
+            "gz-cache",
+            subcommand,
+            sh.path_to_str(gz_cache_dir),
+            sh.path_to_str(gz_file),
+            self.GZ_CACHE_HOLDER,
+            "--max-size",
+            str(self._run_options.gz_cache_max_size()),
+        )
+
+    def section_name(self) -> str:
+        """Get the timing section name of the input init lines."""
+        return slurm_timing.input_section(
+            slurm_timing.Sections.INPUT_INIT,
+            self._input_result.exp_fs_manager().tool_description().name(),
+            type(self._input_result).__name__,
+        )
+
     @abstractmethod
     def init_lines(self) -> Iterator[str]:
         """Get shell input init lines."""
@@ -82,11 +183,96 @@ class OptionBashLinesBuilder:
         )
 
 
+class ScratchStagingLinesBuilder:
+    """Node local scratch staging bash lines builder.
+
+    The scratch directory is created in `$SLURM_TMPDIR` (or `$TMPDIR`, or `/tmp`)
+    and removed when the command script exits.
+    It contains the intermediate inputs, the tool temporary files
+    and the tool outputs. After the tool succeeded, its declared output files
+    (the files of its results) are copied back to the working sample directory,
+    or all its outputs if the tool declares no result.
+    """
+
+    SCRATCH_DIR_VAR = sh.Variable("PBFBENCH_SCRATCH_DIR")
+    NODE_TMP_DIR = "${SLURM_TMPDIR:-${TMPDIR:-/tmp}}"
+
+    INPUTS_DIRNAME = "inputs"
+    OUTPUTS_DIRNAME = "outputs"
+    TMP_DIRNAME = "tmp"
+
+    @classmethod
+    def scratch_dir(cls) -> Path:
+        """Get scratch directory shell path."""
+        return Path(cls.SCRATCH_DIR_VAR.eval())
+
+    @classmethod
+    def inputs_dir(cls) -> Path:
+        """Get scratch intermediate inputs directory shell path."""
+        return cls.scratch_dir() / cls.INPUTS_DIRNAME
+
+    @classmethod
+    def outputs_dir(cls) -> Path:
+        """Get scratch tool outputs directory shell path."""
+        return cls.scratch_dir() / cls.OUTPUTS_DIRNAME
+
+    @classmethod
+    def tmp_dir(cls) -> Path:
+        """Get scratch tool temporary directory shell path."""
+        return cls.scratch_dir() / cls.TMP_DIRNAME
+
+    @classmethod
+    def init_lines(cls) -> Iterator[str]:
+        """Create the scratch directory and set its removal at exit."""
+        yield cls.SCRATCH_DIR_VAR.set(
+            f"$(mktemp -d {sh.path_to_str(cls.NODE_TMP_DIR + '/pbfbench.XXXXXX')})",
+        )
+        yield sh.at_exit(f"rm -rf {sh.path_to_str(cls.SCRATCH_DIR_VAR.eval())}")
+        yield (
+            "mkdir -p"
+            f" {sh.path_to_str(cls.inputs_dir())}"
+            f" {sh.path_to_str(cls.outputs_dir())}"
+            f" {sh.path_to_str(cls.tmp_dir())}"
+        )
+        yield f"export TMPDIR={sh.path_to_str(cls.tmp_dir())}"
+
+    @classmethod
+    def copy_back_lines(
+        cls,
+        work_exp_sample_dir: Path,
+        output_files: Iterable[Path],
+    ) -> Iterator[str]:
+        """Copy the tool outputs back to the working sample directory.
+
+        Parameters
+        ----------
+        work_exp_sample_dir : Path
+            Working sample directory shell path
+        output_files : iterable of Path
+            Declared output files, relative to the sample directory
+            (all the outputs are copied if there is none)
+        """
+        output_files = list(output_files)
+        if not output_files:
+            yield (
+                "cp -r"
+                f" {sh.path_to_str(f'{cls.outputs_dir()}/.')}"
+                f" {sh.path_to_str(work_exp_sample_dir)}"
+            )
+            return
+        for output_file in output_files:
+            yield (
+                "cp"
+                f" {sh.path_to_str(cls.outputs_dir() / output_file)}"
+                f" {sh.path_to_str(work_exp_sample_dir / output_file)}"
+            )
+
+
 class _CommandsWithOptions:
     """Commands with options."""
 
     SAMPLES_TSV_VAR = sh.Variable("SAMPLES_TSV")
-    WORK_EXP_SAMPLE_DIR_VAR = sh.Variable("WORK_EXP_SAMPLE_DIR")
+    WORK_EXP_SAMPLE_DIR_VAR = ArgBashLinesBuilder.WORK_EXP_SAMPLE_DIR_VAR
 
     CORE_COMMAND_SH_FILENAME = "core_command.sh"
 
@@ -95,23 +281,45 @@ class _CommandsWithOptions:
         opts_sh_lines_builder: OptionBashLinesBuilder,
         data_exp_fs_manager: exp_fs.DataManager,
         work_exp_fs_manager: exp_fs.WorkManager,
+        run_options: exp_options.RunOptions | None = None,
+        *,
+        output_result_types: Iterable[type[abc_topic_res_items.Result]] = (),
     ) -> None:
         """Initialize."""
         self._opts_sh_lines_builder = opts_sh_lines_builder
         self._data_exp_fs_manager = data_exp_fs_manager
         self._work_exp_fs_manager = work_exp_fs_manager
+        self._run_options = (
+            run_options if run_options is not None else exp_options.RunOptions()
+        )
+        self._output_result_types = list(output_result_types)
 
     def commands(self) -> Iterator[str]:
         """Iterate over the tool commands."""
         # DOCU say WORK_EXP_SAMPLE_DIR variable is set
         # DOCU say SAMPLES_TSV variable is set
-        yield from self.set_samples_tsv_var()
-        yield ("")
+        yield from sh.exit_commands_init_lines()
+        yield from self.set_input_tmp_dir()
         yield from self.set_work_sample_exp_dir()
         yield ("")
+        yield from self.timed_input_init_lines()
+        yield from self.set_samples_tsv_var()
+        yield ("")
         yield from self._opts_sh_lines_builder.set_options()
         yield ("")
-        yield from self.core_commands()
+        yield from self.timing_lines_builder().section_lines(
+            slurm_timing.Sections.CORE_COMMAND,
+            self.core_commands(),
+        )
+        yield from self.timing_lines_builder().section_lines(
+            slurm_timing.Sections.INPUT_CLOSE,
+            self.input_close_lines(),
+        )
+        if self._run_options.stage_on_scratch():
+            yield from ScratchStagingLinesBuilder.copy_back_lines(
+                self.work_exp_sample_dir(),
+                self.output_files(),
+            )
 
     def opts_sh_lines_builder(self) -> OptionBashLinesBuilder:
         """Get options bash lines builder."""
@@ -125,6 +333,63 @@ class _CommandsWithOptions:
         """Get working experiment file system manager."""
         return self._work_exp_fs_manager
 
+    def run_options(self) -> exp_options.RunOptions:
+        """Get run options."""
+        return self._run_options
+
+    def output_result_types(self) -> list[type[abc_topic_res_items.Result]]:
+        """Get the types of the tool results."""
+        return self._output_result_types
+
+    def work_exp_sample_dir(self) -> Path:
+        """Get working experiment sample directory shell path."""
+        return smp_sh.sample_shell_fs_manager(self._work_exp_fs_manager).sample_dir()
+
+    def output_files(self) -> list[Path]:
+        """Get the tool result files, relative to the sample directory."""
+        work_exp_sample_dir = self.work_exp_sample_dir()
+        return [
+            output_file.relative_to(work_exp_sample_dir)
+            for result_type in self._output_result_types
+            for output_file in result_type(self._work_exp_fs_manager).files(
+                work_exp_sample_dir.name,
+            )
+        ]
+
+    def timing_lines_builder(self) -> slurm_timing.SectionLinesBuilder:
+        """Get the section timing lines builder."""
+        return slurm_timing.SectionLinesBuilder(
+            self._work_exp_fs_manager.sbatch_timing_log(),
+            slurm_sh.SLURM_JOB_ID_FROM_VARS,
+        )
+
+    def set_input_tmp_dir(self) -> Iterator[str]:
+        """Set the input temporary directory.
+
+        When the staging is enabled, the node local scratch directory is created.
+        """
+        if self._run_options.stage_on_scratch():
+            yield from ScratchStagingLinesBuilder.init_lines()
+            input_tmp_dir = ScratchStagingLinesBuilder.inputs_dir()
+        else:
+            input_tmp_dir = self.work_exp_sample_dir()
+        yield ArgBashLinesBuilder.TMP_DIR_VAR.set(sh.path_to_str(input_tmp_dir))
+
+    def input_init_lines(self) -> Iterator[str]:
+        """Iterate over the input init lines."""
+        yield from ()
+
+    def timed_input_init_lines(self) -> Iterator[str]:
+        """Iterate over the input init lines, timed as one section."""
+        yield from self.timing_lines_builder().section_lines(
+            slurm_timing.Sections.INPUT_INIT,
+            self.input_init_lines(),
+        )
+
+    def input_close_lines(self) -> Iterator[str]:
+        """Iterate over the input close lines."""
+        yield from ()
+
     def set_samples_tsv_var(self) -> Iterator[str]:
         """Set samples tsv variable."""
         yield self.SAMPLES_TSV_VAR.set(
@@ -132,11 +397,17 @@ class _CommandsWithOptions:
         )
 
     def set_work_sample_exp_dir(self) -> Iterator[str]:
-        """Set working experiment sample directory."""
-        work_exp_sample_dir = smp_sh.sample_shell_fs_manager(
-            self._work_exp_fs_manager,
-        ).sample_dir()
-        yield self.WORK_EXP_SAMPLE_DIR_VAR.set(sh.path_to_str(work_exp_sample_dir))
+        """Set working experiment sample directory.
+
+        When the staging is enabled, the tool outputs are written on the scratch.
+        """
+        yield self.WORK_EXP_SAMPLE_DIR_VAR.set(
+            sh.path_to_str(
+                ScratchStagingLinesBuilder.outputs_dir()
+                if self._run_options.stage_on_scratch()
+                else self.work_exp_sample_dir(),
+            ),
+        )
 
     def core_commands(self) -> Iterator[str]:
         """Iterate over the tool command lines."""
@@ -163,12 +434,15 @@ class CommandsOnlyOptions(_CommandsWithOptions):
 class CommandsWithArguments(_CommandsWithOptions):
     """Tool commands with options and arguments."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         arg_sh_lines_builders: Iterable[ArgBashLinesBuilder],
         opts_sh_lines_builder: OptionBashLinesBuilder,
         data_exp_fs_manager: exp_fs.DataManager,
         work_exp_fs_manager: exp_fs.WorkManager,
+        run_options: exp_options.RunOptions | None = None,
+        *,
+        output_result_types: Iterable[type[abc_topic_res_items.Result]] = (),
     ) -> None:
         """Initialize."""
         self._arg_sh_lines_builders = list(arg_sh_lines_builders)
@@ -176,16 +450,29 @@ class CommandsWithArguments(_CommandsWithOptions):
             opts_sh_lines_builder,
             data_exp_fs_manager,
             work_exp_fs_manager,
+            run_options,
+            output_result_types=output_result_types,
         )
 
     def arg_sh_lines_builders(self) -> Iterator[ArgBashLinesBuilder]:
         """Get argument bash lines builders."""
         yield from self._arg_sh_lines_builders
 
-    def commands(self) -> Iterator[str]:
-        """Iterate over the tool commands."""
+    def input_init_lines(self) -> Iterator[str]:
+        """Iterate over the input init lines."""
         for result_lines_builder in self._arg_sh_lines_builders:
             yield from result_lines_builder.init_lines()
-        yield from super().commands()
+
+    def timed_input_init_lines(self) -> Iterator[str]:
+        """Iterate over the input init lines, timed per argument."""
+        timing_lines_builder = self.timing_lines_builder()
+        for result_lines_builder in self._arg_sh_lines_builders:
+            yield from timing_lines_builder.section_lines(
+                result_lines_builder.section_name(),
+                result_lines_builder.init_lines(),
+            )
+
+    def input_close_lines(self) -> Iterator[str]:
+        """Iterate over the input close lines."""
         for result_lines_builder in self._arg_sh_lines_builders:
             yield from result_lines_builder.close_lines()
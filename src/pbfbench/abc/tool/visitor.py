@@ -6,7 +6,7 @@ Make the connexion between:
 """
 
 from abc import ABC, abstractmethod
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import final
 
@@ -18,6 +18,7 @@ import pbfbench.abc.topic.results.visitors as topic_res_visitors
 import pbfbench.abc.topic.visitor as abc_topic_visitor
 import pbfbench.experiment.config as exp_cfg
 import pbfbench.experiment.file_system as exp_fs
+import pbfbench.experiment.options as exp_options
 
 
 class ArgumentPath[
@@ -80,11 +81,13 @@ class ArgumentPath[
         self,
         input_result: R,
         work_exp_fs_manager: exp_fs.WorkManager,
+        run_options: exp_options.RunOptions | None = None,
     ) -> abc_tool_shell.ArgBashLinesBuilder[R]:
         """Convert input to shell lines builder."""
         return self._sh_lines_builder_type(
             input_result,
             work_exp_fs_manager,
+            run_options,
         )
 
 
@@ -100,14 +103,25 @@ class ConnectorWithOptions[ExpConfig: exp_cfg.ConfigWithOptions](ABC):
     def __init__(
         self,
         tool_description: abc_tool_desc.Description,
+        output_result_types: Iterable[type[abc_topic_res_items.Result]] = (),
     ) -> None:
-        """Initialize."""
+        """Initialize.
+
+        The output result types are the results written by the tool,
+        their files are the ones copied back from the scratch
+        when the staging is enabled.
+        """
         self._tool_description = tool_description
+        self._output_result_types = list(output_result_types)
 
     def description(self) -> abc_tool_desc.Description:
         """Get tool description."""
         return self._tool_description
 
+    def output_result_types(self) -> list[type[abc_topic_res_items.Result]]:
+        """Get the types of the tool results."""
+        return self._output_result_types
+
     def read_config(self, config_path: Path) -> ExpConfig:
         """Read config."""
         return self.config_type().from_yaml(config_path)
@@ -118,6 +132,7 @@ class ConnectorWithOptions[ExpConfig: exp_cfg.ConfigWithOptions](ABC):
         config: ExpConfig,
         data_exp_fs_manager: exp_fs.DataManager,
         work_exp_fs_manager: exp_fs.WorkManager,
+        run_options: exp_options.RunOptions | None = None,
     ) -> abc_tool_shell._CommandsWithOptions:
         """Convert inputs to commands."""
         raise NotImplementedError
@@ -137,12 +152,15 @@ class ConnectorOnlyOptions(ConnectorWithOptions[exp_cfg.ConfigOnlyOptions]):
         config: exp_cfg.ConfigOnlyOptions,
         data_exp_fs_manager: exp_fs.DataManager,
         work_exp_fs_manager: exp_fs.WorkManager,
+        run_options: exp_options.RunOptions | None = None,
     ) -> abc_tool_shell.CommandsOnlyOptions:
         """Convert inputs to commands."""
         return abc_tool_shell.CommandsOnlyOptions(
             abc_tool_shell.OptionBashLinesBuilder(config.tool_configs().options()),
             data_exp_fs_manager,
             work_exp_fs_manager,
+            run_options,
+            output_result_types=self._output_result_types,
         )
 
 
@@ -158,9 +176,10 @@ class ConnectorWithArguments[
         self,
         tool_description: abc_tool_desc.Description,
         arg_names_and_paths: dict[ArgNames, ArgumentPath],
+        output_result_types: Iterable[type[abc_topic_res_items.Result]] = (),
     ) -> None:
         """Initialize."""
-        super().__init__(tool_description)
+        super().__init__(tool_description, output_result_types)
         self._arg_names_and_paths = dict(arg_names_and_paths)
 
     def arg_names_and_paths(self) -> Iterator[tuple[ArgNames, ArgumentPath]]:
@@ -229,6 +248,7 @@ class ConnectorWithArguments[
         config: ExpConfig,
         data_exp_fs_manager: exp_fs.DataManager,
         work_exp_fs_manager: exp_fs.WorkManager,
+        run_options: exp_options.RunOptions | None = None,
     ) -> abc_tool_shell.CommandsWithArguments:
         """Convert inputs to commands."""
         names_to_input_results = self.config_to_inputs(config, data_exp_fs_manager)
@@ -238,10 +258,13 @@ class ConnectorWithArguments[
                 arg_path.input_to_sh_lines_builder(
                     names_to_input_results[name],
                     work_exp_fs_manager,
+                    run_options,
                 )
                 for name, arg_path in self._arg_names_and_paths.items()
             ],
             abc_tool_shell.OptionBashLinesBuilder(tool_config.options()),
             data_exp_fs_manager,
             work_exp_fs_manager,
+            run_options,
+            output_result_types=self._output_result_types,
         )
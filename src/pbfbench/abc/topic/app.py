@@ -10,18 +10,20 @@ from collections.abc import Iterable
 import typer
 
 import pbfbench.abc.topic.description as abc_topic_desc
+from pbfbench import lazy_app
 
 
 def build_application(
     topic_description: abc_topic_desc.Description,
-    tool_apps: Iterable[typer.Typer],
+    tool_sub_apps: Iterable[lazy_app.SubApp],
 ) -> typer.Typer:
-    """Build topic application."""
-    app = typer.Typer(
+    """Build topic application.
+
+    The tool applications are imported only when their command is run.
+    """
+    return typer.Typer(
         name=topic_description.cmd(),
         help=f"Subcommand for topic `{topic_description.name()}`",
         rich_markup_mode="rich",
+        cls=lazy_app.group_type(tool_sub_apps),
     )
-    for tool_app in tool_apps:
-        app.add_typer(tool_app)
-    return app
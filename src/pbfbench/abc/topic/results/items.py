@@ -1,6 +1,7 @@
 """Abstract tools results items module."""
 
 from abc import ABC, abstractmethod
+from pathlib import Path
 
 import pbfbench.experiment.file_system as exp_fs
 import pbfbench.samples.items as smp_items
@@ -18,6 +19,11 @@ class Result(ABC):
         """Get file system manager."""
         return self._exp_fs_manager
 
+    @abstractmethod
+    def files(self, sample_dirname: str | Path) -> list[Path]:
+        """Get the result files of a sample."""
+        raise NotImplementedError
+
     # REFACTOR not sure it is relevant to use sample status, because of formatted
     @abstractmethod
     def check(self, sample_item: smp_items.Item) -> smp_status.Status:
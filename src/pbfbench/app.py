@@ -1,4 +1,9 @@
-"""Root pbfbench application module."""
+"""Root pbfbench application module.
+
+The sub-applications are registered from a static table
+and imported only when their command is run (see `lazy_app`),
+so that the CLI start-up does not import the whole package.
+"""
 
 # Due to typer usage:
 # ruff: noqa: TC001, TC003, UP007, FBT001, FBT002, PLR0913
@@ -6,15 +11,16 @@
 from __future__ import annotations
 
 from enum import StrEnum
+from pathlib import Path
+from typing import Annotated
 
 import typer
 
-import pbfbench.doc.app as doc_app
-import pbfbench.help.app as help_app
-import pbfbench.topics.assembly.app as assembly_app
-import pbfbench.topics.binning.app as binning_app
-import pbfbench.topics.plasmidness.app as plasmidness_app
-import pbfbench.topics.seeds.app as seeds_app
+import pbfbench.topics.assembly.description as assembly_desc
+import pbfbench.topics.binning.description as binning_desc
+import pbfbench.topics.plasmidness.description as plasmidness_desc
+import pbfbench.topics.seeds.description as seeds_desc
+from pbfbench import lazy_app, profiling, root_logging
 
 
 class PBFCommand:
@@ -24,11 +30,30 @@ class PBFCommand:
     HELP = "PlasBin-flow benchmarking framework"
 
 
-APP = typer.Typer(
-    name=PBFCommand.NAME,
-    help=PBFCommand.HELP,
-    rich_markup_mode="rich",
-)
+class Options:
+    """Root options."""
+
+    LOG_JSON = typer.Option(
+        envvar="PBFBENCH_LOG_JSON",
+        help=(
+            "Also append the logs (with the debug ones) in this JSON-lines file,"
+            " written in a background thread"
+        ),
+    )
+
+    PROFILE = typer.Option(
+        help=(
+            "Profile the command: `cpu` with cProfile (`.pstats` file and summary),"
+            " `mem` with tracemalloc (peak and top allocation sites)"
+        ),
+    )
+    PROFILE_TOP = typer.Option(help="Number of entries in the profile summary")
+    PROFILE_DIR = typer.Option(
+        help=(
+            "Profile output directory"
+            " (default: the experiment directory, otherwise the current one)"
+        ),
+    )
 
 
 class CommandCategories(StrEnum):
@@ -38,14 +63,85 @@ class CommandCategories(StrEnum):
     TOPICS = "Topics"
 
 
-#
-# Utilities
-#
-for app in (doc_app.APP, help_app.APP):
-    APP.add_typer(app, rich_help_panel=CommandCategories.UTILITIES)
+SUB_APPS = (
+    #
+    # Utilities
+    #
+    lazy_app.SubApp(
+        "doc",
+        "Generate documentation",
+        "pbfbench.doc.app",
+        CommandCategories.UTILITIES,
+    ),
+    lazy_app.SubApp(
+        "help",
+        "Help commands",
+        "pbfbench.help.app",
+        CommandCategories.UTILITIES,
+    ),
+    lazy_app.SubApp(
+        "layout",
+        "Manage the sample directories layout",
+        "pbfbench.layout.app",
+        CommandCategories.UTILITIES,
+    ),
+    lazy_app.SubApp(
+        "report",
+        "Reports on the experiment runs",
+        "pbfbench.report.app",
+        CommandCategories.UTILITIES,
+    ),
+    lazy_app.SubApp(
+        "gz-cache",
+        "Shared cache of decompressed inputs (used by the tool scripts)",
+        "pbfbench.gz_cache.app",
+        CommandCategories.UTILITIES,
+    ),
+    #
+    # Topics
+    #
+    lazy_app.SubApp.from_topic(
+        assembly_desc.DESCRIPTION,
+        "pbfbench.topics.assembly.app",
+        CommandCategories.TOPICS,
+    ),
+    lazy_app.SubApp.from_topic(
+        seeds_desc.DESCRIPTION,
+        "pbfbench.topics.seeds.app",
+        CommandCategories.TOPICS,
+    ),
+    lazy_app.SubApp.from_topic(
+        plasmidness_desc.DESCRIPTION,
+        "pbfbench.topics.plasmidness.app",
+        CommandCategories.TOPICS,
+    ),
+    lazy_app.SubApp.from_topic(
+        binning_desc.DESCRIPTION,
+        "pbfbench.topics.binning.app",
+        CommandCategories.TOPICS,
+    ),
+)
+
+APP = typer.Typer(
+    name=PBFCommand.NAME,
+    help=PBFCommand.HELP,
+    rich_markup_mode="rich",
+    cls=lazy_app.group_type(SUB_APPS),
+)
+
 
-#
-# Topics
-#
-for app in (assembly_app.APP, seeds_app.APP, plasmidness_app.APP, binning_app.APP):
-    APP.add_typer(app, rich_help_panel=CommandCategories.TOPICS)
+@APP.callback()
+def main(
+    ctx: typer.Context,
+    profile: Annotated[profiling.Modes | None, Options.PROFILE] = None,
+    profile_top: Annotated[int, Options.PROFILE_TOP] = profiling.DEFAULT_TOP,
+    profile_dir: Annotated[Path | None, Options.PROFILE_DIR] = None,
+    log_json: Annotated[Path | None, Options.LOG_JSON] = None,
+) -> None:
+    """PlasBin-flow benchmarking framework."""
+    if log_json is not None:
+        # The queued records are written when the command ends, even with an error
+        ctx.call_on_close(root_logging.JSONSink.start(log_json).stop)
+    if profile is not None:
+        # The profiles are written when the command ends, even with an error
+        ctx.call_on_close(profiling.start(profile, profile_top, profile_dir).stop)
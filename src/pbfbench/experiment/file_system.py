@@ -2,17 +2,112 @@
 
 from __future__ import annotations
 
+import hashlib
 from abc import ABC, abstractmethod
 from datetime import UTC, datetime
+from enum import StrEnum
 from pathlib import Path
 from typing import final
 
 import pbfbench.abc.tool.description as abc_tool_desc
 import pbfbench.samples.file_system as smp_fs
 import pbfbench.samples.items as smp_items
+import pbfbench.shell as sh
 import pbfbench.slurm.file_system as slurm_fs
 
 
+class SamplesLayout(StrEnum):
+    """Layout of the sample directories in the experiment directory.
+
+    * `flat`: `EXP_DIR/SAMPLE_DIRNAME`
+    * `sharded`: `EXP_DIR/ab/cd/SAMPLE_DIRNAME`
+      where `abcd` are the first hexadecimal digits
+      of the MD5 hash of `SAMPLE_DIRNAME`
+    """
+
+    FLAT = "flat"
+    SHARDED = "sharded"
+
+
+SAMPLES_LAYOUT_TXT_NAME = Path("samples_layout.txt")
+
+SHARD_HEX_DIGITS = 2
+
+
+def samples_layout_txt(root_dir: Path) -> Path:
+    """Get the file containing the samples layout of a root directory."""
+    return root_dir / SAMPLES_LAYOUT_TXT_NAME
+
+
+def read_samples_layout(root_dir: Path) -> SamplesLayout:
+    """Read the samples layout of a root directory.
+
+    The default layout (no layout file) is the flat one.
+    """
+    try:
+        with samples_layout_txt(root_dir).open("r") as f_in:
+            return SamplesLayout(f_in.read().strip())
+    except FileNotFoundError:
+        return SamplesLayout.FLAT
+
+
+def write_samples_layout(root_dir: Path, samples_layout: SamplesLayout) -> None:
+    """Write the samples layout of a root directory."""
+    match samples_layout:
+        case SamplesLayout.FLAT:
+            samples_layout_txt(root_dir).unlink(missing_ok=True)
+        case SamplesLayout.SHARDED:
+            with samples_layout_txt(root_dir).open("w") as f_out:
+                f_out.write(samples_layout + "\n")
+
+
+def shard_dirnames(sample_dirname: str) -> tuple[str, str]:
+    """Get the two levels of shard directory names.
+
+    If the sample directory name contains shell expansions
+    (e.g. the species-sample ID variable in the sbatch scripts),
+    the shard directory names are bash command substitutions
+    giving the same result as in Python.
+    """
+    if sh.contains_expansion(sample_dirname):
+        md5_cmd = f"printf '%s' {sh.path_to_str(sample_dirname)} | md5sum"
+        return (
+            f"$({md5_cmd} | cut -c1-{SHARD_HEX_DIGITS})",
+            f"$({md5_cmd} | cut -c{SHARD_HEX_DIGITS + 1}-{2 * SHARD_HEX_DIGITS})",
+        )
+    md5_hex = hashlib.md5(sample_dirname.encode(), usedforsecurity=False).hexdigest()
+    return (
+        md5_hex[:SHARD_HEX_DIGITS],
+        md5_hex[SHARD_HEX_DIGITS : 2 * SHARD_HEX_DIGITS],
+    )
+
+
+def sample_dir_in_exp_dir(
+    exp_dir: Path,
+    sample_dirname: str | Path,
+    samples_layout: SamplesLayout,
+) -> Path:
+    """Get the sample directory path in an experiment directory."""
+    match samples_layout:
+        case SamplesLayout.FLAT:
+            return exp_dir / sample_dirname
+        case SamplesLayout.SHARDED:
+            return exp_dir.joinpath(*shard_dirnames(str(sample_dirname))) / (
+                sample_dirname
+            )
+
+
+def remove_empty_shard_dirs(exp_dir: Path, sample_dir: Path) -> None:
+    """Remove the empty shard directories between a sample and its experiment."""
+    shard_dir = sample_dir.parent
+    while shard_dir != exp_dir and exp_dir in shard_dir.parents:
+        try:
+            shard_dir.rmdir()
+        except OSError:
+            return
+        shard_dir = shard_dir.parent
+
+
 # FIXME the refactor making the diff between data and work fs manager
 class ManagerBase(ABC):
     """Experiment file system manager base."""
@@ -24,16 +119,30 @@ class ManagerBase(ABC):
 
     DATE_TXT_NAME = Path("date.txt")
 
+    STATUS_LOG_NAME = Path("status.log")
+
+    TIMING_SUMMARY_TSV_NAME = Path("timing_summary.tsv")
+
     def __init__(
         self,
         root_directory_path: Path,
         tool_description: abc_tool_desc.Description,
         experiment_name: str,
+        samples_layout: SamplesLayout | None = None,
     ) -> None:
-        """Initialize."""
+        """Initialize.
+
+        If the samples layout is not given,
+        it is read from the root directory.
+        """
         self._root_directory_path = root_directory_path
         self._tool_description = tool_description
         self._experiment_name = experiment_name
+        self._samples_layout = (
+            samples_layout
+            if samples_layout is not None
+            else read_samples_layout(root_directory_path)
+        )
         self._date_str = self._get_date_str()
 
     @abstractmethod
@@ -49,6 +158,10 @@ class ManagerBase(ABC):
         """Get experiment name."""
         return self._experiment_name
 
+    def samples_layout(self) -> SamplesLayout:
+        """Get samples layout."""
+        return self._samples_layout
+
     def root_dir(self) -> Path:
         """Get root directory path."""
         return self._root_directory_path
@@ -87,6 +200,14 @@ class ManagerBase(ABC):
         """Get errors file."""
         return self.exp_dir() / self.ERRORS_TSV_NAME
 
+    def status_log(self) -> Path:
+        """Get the sbatch status history file."""
+        return self.exp_dir() / self.STATUS_LOG_NAME
+
+    def timing_summary_tsv(self) -> Path:
+        """Get the section timing summary file of the last run."""
+        return self.exp_dir() / self.TIMING_SUMMARY_TSV_NAME
+
     #
     # Sbatch scripts
     #
@@ -107,11 +228,15 @@ class ManagerBase(ABC):
     #
     def sample_dir(self, sample_dirname: str | Path) -> Path:
         """Get sample experiment directory path."""
-        return self.exp_dir() / sample_dirname
+        return sample_dir_in_exp_dir(
+            self.exp_dir(),
+            sample_dirname,
+            self._samples_layout,
+        )
 
     def sample_fs_manager(self, sample_item: smp_items.Item) -> smp_fs.Manager:
         """Get sample experiment directory path."""
-        return smp_fs.Manager(self.exp_dir() / sample_item.exp_sample_id())
+        return smp_fs.Manager(self.sample_dir(sample_item.exp_sample_id()))
 
 
 @final
@@ -122,6 +247,9 @@ class DataManager(ManagerBase):
 
     SAMPLES_TSV_NAME = Path("samples.tsv")
 
+    TRACE_JSON_NAME = Path("trace.json")
+    INIT_TRACE_JSON_NAME = Path("init_trace.json")
+
     def _get_date_str(self) -> str:
         """Get date string."""
         if not self.date_txt().exists():
@@ -133,6 +261,14 @@ class DataManager(ManagerBase):
         """Get samples TSV file."""
         return self.root_dir() / self.SAMPLES_TSV_NAME
 
+    def trace_json(self) -> Path:
+        """Get the timing trace file of the last run (Chrome trace-event format)."""
+        return self.exp_dir() / self.TRACE_JSON_NAME
+
+    def init_trace_json(self) -> Path:
+        """Get the timing trace file of the last init (Chrome trace-event format)."""
+        return self.exp_dir() / self.INIT_TRACE_JSON_NAME
+
     #
     # Tool files
     #
@@ -147,10 +283,53 @@ class WorkManager(ManagerBase):
 
     TMP_SLURM_LOG_DIR_NAME = Path("logs")
 
+    INIT_DIR_NAME = Path("init")
+
+    def __init__(
+        self,
+        root_directory_path: Path,
+        tool_description: abc_tool_desc.Description,
+        experiment_name: str,
+        samples_layout: SamplesLayout | None = None,
+        sub_dir: Path | None = None,
+    ) -> None:
+        """Initialize.
+
+        With a sub-directory, the experiment directory is
+        `WORK_DIR/TOPIC/TOOL/EXP_NAME/SUB_DIR`.
+        """
+        super().__init__(
+            root_directory_path,
+            tool_description,
+            experiment_name,
+            samples_layout,
+        )
+        self.__sub_dir = sub_dir
+
     def _get_date_str(self) -> str:
         """Get date string."""
         return _get_today_format_string()
 
+    def exp_dir(self) -> Path:
+        """Get experiment directory path."""
+        if self.__sub_dir is None:
+            return super().exp_dir()
+        return super().exp_dir() / self.__sub_dir
+
+    def init_work_manager(self) -> WorkManager:
+        """Get the working manager of the init Slurm job array.
+
+        Its experiment directory is `WORK_EXP_DIR/init`,
+        so that an init does not clean the working directory of a running experiment.
+        """
+        return WorkManager(
+            self._root_directory_path,
+            self._tool_description,
+            self._experiment_name,
+            self._samples_layout,
+            self.INIT_DIR_NAME,
+        )
+
     #
     # Tmp sbatch logs
     #
@@ -162,13 +341,6 @@ class WorkManager(ManagerBase):
         """Get array job id file."""
         return self.tmp_slurm_logs_dir() / slurm_fs.LogFiles.ARRAY_JOB_ID_FILENAME
 
-    def sbatch_file_regex(self, job_id: str) -> Path:
-        """Get sbatch file regex."""
-        return self.tmp_slurm_logs_dir() / slurm_fs.LogFiles.filename_builder(
-            job_id,
-            "*",
-        )
-
     def sbatch_out_file(self, job_id: str) -> Path:
         """Get sbatch out file."""
         return self.tmp_slurm_logs_dir() / slurm_fs.LogFiles.out_filename(
@@ -181,29 +353,13 @@ class WorkManager(ManagerBase):
             job_id,
         )
 
-    def sbatch_init_env_error_file(self, job_id: str) -> Path:
-        """Get sbatch init env error file."""
-        return self.tmp_slurm_logs_dir() / slurm_fs.LogFiles.init_env_error_filename(
-            job_id,
-        )
+    def sbatch_status_log(self) -> Path:
+        """Get the append-only sbatch status log file."""
+        return self.tmp_slurm_logs_dir() / slurm_fs.LogFiles.STATUS_LOG_FILENAME
 
-    def sbatch_command_error_file(self, job_id: str) -> Path:
-        """Get sbatch command error file."""
-        return self.tmp_slurm_logs_dir() / slurm_fs.LogFiles.command_error_filename(
-            job_id,
-        )
-
-    def sbatch_close_env_error_file(self, job_id: str) -> Path:
-        """Get sbatch close env error file."""
-        return self.tmp_slurm_logs_dir() / slurm_fs.LogFiles.close_env_error_filename(
-            job_id,
-        )
-
-    def sbatch_end_file(self, job_id: str) -> Path:
-        """Get sbatch end file."""
-        return self.tmp_slurm_logs_dir() / slurm_fs.LogFiles.end_filename(
-            job_id,
-        )
+    def sbatch_timing_log(self) -> Path:
+        """Get the append-only sbatch section timing log file."""
+        return self.tmp_slurm_logs_dir() / slurm_fs.LogFiles.TIMING_LOG_FILENAME
 
 
 def _get_today_format_string() -> str:
@@ -217,10 +373,19 @@ def data_and_working_managers(
     tool_description: abc_tool_desc.Description,
     experiment_name: str,
 ) -> tuple[DataManager, WorkManager]:
-    """Get data and working managers."""
+    """Get data and working managers.
+
+    The working manager follows the samples layout of the data directory.
+    """
+    data_exp_fs_manager = DataManager(data_dir, tool_description, experiment_name)
     return (
-        DataManager(data_dir, tool_description, experiment_name),
-        WorkManager(working_dir, tool_description, experiment_name),
+        data_exp_fs_manager,
+        WorkManager(
+            working_dir,
+            tool_description,
+            experiment_name,
+            data_exp_fs_manager.samples_layout(),
+        ),
     )
 
 
@@ -0,0 +1,118 @@
+"""Sample run fingerprint module.
+
+A sample run fingerprint summarizes everything that can change its results:
+
+* the tool configuration (arguments and options, not the slurm resources),
+* the core command lines,
+* the size and the modification time of the input result files.
+
+The input result files are identified independently of the samples layout
+(by the input experiment, the sample and the file path in the sample directory),
+so that migrating the data directory layout does not change the fingerprints.
+
+A done sample whose recorded fingerprint differs from the current one is rerun.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    import pbfbench.abc.tool.config as abc_tool_cfg
+    import pbfbench.abc.topic.results.items as abc_topic_res_items
+    import pbfbench.samples.file_system as smp_fs
+    import pbfbench.samples.items as smp_items
+
+_LOGGER = logging.getLogger(__name__)
+
+MISSING_FILE_STAT = "missing"
+
+
+class Fingerprinter:
+    """Sample run fingerprinter."""
+
+    def __init__(
+        self,
+        tool_config: abc_tool_cfg.ConfigWithOptions,
+        core_command_lines: Iterable[str],
+        input_results: Iterable[abc_topic_res_items.Result],
+    ) -> None:
+        """Initialize."""
+        self.__input_results = list(input_results)
+        exp_hash = hashlib.sha256()
+        exp_hash.update(
+            json.dumps(tool_config.to_yaml_dump(), sort_keys=True).encode(),
+        )
+        for line in core_command_lines:
+            exp_hash.update(line.encode())
+            exp_hash.update(b"\n")
+        self.__exp_digest = exp_hash.digest()
+
+    def input_results(self) -> list[abc_topic_res_items.Result]:
+        """Get input results."""
+        return self.__input_results
+
+    def fingerprint(self, sample_item: smp_items.Item) -> str:
+        """Get the fingerprint of a sample run."""
+        sample_hash = hashlib.sha256(self.__exp_digest)
+        for input_result in self.__input_results:
+            in_exp_fs_manager = input_result.exp_fs_manager()
+            in_tool_description = in_exp_fs_manager.tool_description()
+            sample_dir = in_exp_fs_manager.sample_dir(sample_item.exp_sample_id())
+            for input_file in input_result.files(sample_item.exp_sample_id()):
+                sample_hash.update(
+                    (
+                        f"{in_tool_description.topic().name()}"
+                        f"\t{in_tool_description.name()}"
+                        f"\t{in_exp_fs_manager.experiment_name()}"
+                        f"\t{sample_item.exp_sample_id()}"
+                        f"\t{input_file.relative_to(sample_dir)}"
+                        f"\t{_file_stat(input_file)}\n"
+                    ).encode(),
+                )
+        return sample_hash.hexdigest()
+
+    def has_changed(
+        self,
+        sample_item: smp_items.Item,
+        sample_fs_manager: smp_fs.Manager,
+    ) -> bool:
+        """Check if the recorded fingerprint differs from the current one.
+
+        A sample without recorded fingerprint
+        (run before fingerprints were introduced) is considered unchanged.
+        """
+        recorded_fingerprint = read(sample_fs_manager)
+        if recorded_fingerprint is None:
+            return False
+        return recorded_fingerprint != self.fingerprint(sample_item)
+
+
+def _file_stat(file: Path) -> str:
+    """Get the size and the modification time of a file."""
+    try:
+        file_stat = file.stat()
+    except FileNotFoundError:
+        return MISSING_FILE_STAT
+    return f"{file_stat.st_size}\t{file_stat.st_mtime_ns}"
+
+
+def read(sample_fs_manager: smp_fs.Manager) -> str | None:
+    """Read the recorded fingerprint of a sample run."""
+    try:
+        with sample_fs_manager.fingerprint_txt().open("r") as f_in:
+            return f_in.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def write(sample_fs_manager: smp_fs.Manager, fingerprint: str) -> None:
+    """Write the fingerprint of a sample run."""
+    with sample_fs_manager.fingerprint_txt().open("w") as f_out:
+        f_out.write(fingerprint + "\n")
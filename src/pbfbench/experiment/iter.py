@@ -15,23 +15,29 @@ import pbfbench.samples.status as smp_status
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator
 
+    import pbfbench.experiment.fingerprint as exp_fingerprint
+    import pbfbench.samples.items as smp_items
+
 
 def samples_to_run(
     data_exp_fs_manager: exp_fs.DataManager,
     all_samples: Iterable[smp_fs.RowNumberedItem],
+    fingerprinter: exp_fingerprint.Fingerprinter | None = None,
 ) -> Iterator[smp_fs.RowNumberedItem]:
-    """Get samples with error status.
+    """Get samples with error status or with a changed fingerprint.
 
-    They correspond to samples for which the experiment is not done.
+    They correspond to samples for which the experiment is not done,
+    or is done but with other inputs or tool configuration.
     """
-    return (
-        row_numbered_sample
-        for row_numbered_sample in all_samples
-        if smp_status.get_status(
-            data_exp_fs_manager.sample_fs_manager(row_numbered_sample.item()),
+    for row_numbered_sample in all_samples:
+        sample_fs_manager = data_exp_fs_manager.sample_fs_manager(
+            row_numbered_sample.item(),
         )
-        != smp_status.OKStatus.OK
-    )
+        if smp_status.get_status(sample_fs_manager) != smp_status.OKStatus.OK or (
+            fingerprinter is not None
+            and fingerprinter.has_changed(row_numbered_sample.item(), sample_fs_manager)
+        ):
+            yield row_numbered_sample
 
 
 def samples_to_format_result(
@@ -45,21 +51,27 @@ def samples_to_format_result(
     """
     # TODO log that requires to run before init
     # TODO perhaps missing inputs for check should be good (I removed it...)
-    done_input = (
+    return (
         row_numbered_sample
         for row_numbered_sample in all_samples
-        if smp_status.get_status(
-            formatted_result_builder.exp_fs_manager().sample_fs_manager(
-                row_numbered_sample.item(),
-            ),
+        if sample_to_format_result(
+            formatted_result_builder,
+            row_numbered_sample.item(),
         )
-        == smp_status.OKStatus.OK
     )
+
+
+def sample_to_format_result(
+    formatted_result_builder: abc_topic_res_items.Formatted,
+    sample_item: smp_items.Item,
+) -> bool:
+    """Check if the input experiment of the sample is done but not formatted."""
     return (
-        row_numbered_sample
-        for row_numbered_sample in done_input
-        if formatted_result_builder.check(row_numbered_sample.item())
-        != smp_status.OKStatus.OK
+        smp_status.get_status(
+            formatted_result_builder.exp_fs_manager().sample_fs_manager(sample_item),
+        )
+        == smp_status.OKStatus.OK
+        and formatted_result_builder.check(sample_item) != smp_status.OKStatus.OK
     )
 
 
@@ -0,0 +1,218 @@
+"""Experiment run metrics in the Prometheus text format.
+
+With the `--metrics-prom` run option, the run metrics are written in a `.prom` file
+read by the textfile collector of the Prometheus node exporter.
+The file is replaced atomically (temporary file in the same directory then rename),
+so the collector never reads a partial file.
+It is written at each poll and at the end of the run phases.
+
+All the metrics have the `topic`, `tool` and `experiment` labels.
+
+The active exporter is stored in a context variable, like the timing tracer.
+Without active exporter, the metric updates are ignored.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    import pbfbench.experiment.file_system as exp_fs
+
+
+class Types(StrEnum):
+    """Prometheus metric types."""
+
+    GAUGE = "gauge"
+    COUNTER = "counter"
+
+
+class Metrics(StrEnum):
+    """Run metrics."""
+
+    RUNNING = "pbfbench_run_running"
+    START_TIME = "pbfbench_run_start_timestamp_seconds"
+    LAST_UPDATE_TIME = "pbfbench_run_last_update_timestamp_seconds"
+    SAMPLES = "pbfbench_samples"
+    TASKS = "pbfbench_tasks"
+    POLLS = "pbfbench_polls_total"
+    POLL_SECONDS = "pbfbench_poll_seconds_total"
+    SQUEUE_CALLS = "pbfbench_squeue_calls_total"
+    HARVEST_LATENCY = "pbfbench_harvest_latency_seconds"
+    BYTES_MOVED = "pbfbench_bytes_moved_total"
+
+
+HELP_AND_TYPES: dict[Metrics, tuple[str, Types]] = {
+    Metrics.RUNNING: (
+        "1 while the run command is running, 0 once it ends",
+        Types.GAUGE,
+    ),
+    Metrics.START_TIME: ("Start time of the run command", Types.GAUGE),
+    Metrics.LAST_UPDATE_TIME: ("Last update time of the metrics", Types.GAUGE),
+    Metrics.SAMPLES: ("Number of samples of the experiment by status", Types.GAUGE),
+    Metrics.TASKS: ("Number of Slurm tasks in the queue by state", Types.GAUGE),
+    Metrics.POLLS: ("Number of polls of the task statuses", Types.COUNTER),
+    Metrics.POLL_SECONDS: (
+        "Time spent in the polls, without the sleeps",
+        Types.COUNTER,
+    ),
+    Metrics.SQUEUE_CALLS: ("Number of squeue calls", Types.COUNTER),
+    Metrics.HARVEST_LATENCY: (
+        "Time from the end of the last task to the end of the data move",
+        Types.GAUGE,
+    ),
+    Metrics.BYTES_MOVED: (
+        "Bytes copied from the working to the data directory",
+        Types.COUNTER,
+    ),
+}
+
+
+class SampleStatuses(StrEnum):
+    """Sample statuses of the samples metric."""
+
+    DONE = "done"
+    MISSING_INPUTS = "missing_inputs"
+    RUNNING = "running"
+    OK = "ok"
+    ERROR = "error"
+
+
+class TaskStates(StrEnum):
+    """Task states of the tasks metric."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+
+
+class Exporter:
+    """Run metrics exporter to a Prometheus textfile."""
+
+    def __init__(self, prom_file: Path, labels: dict[str, str]) -> None:
+        """Initialize."""
+        self.__prom_file = prom_file
+        self.__labels = labels
+        self.__values: dict[Metrics, dict[tuple[tuple[str, str], ...], float]] = {
+            metric: {} for metric in Metrics
+        }
+
+    def prom_file(self) -> Path:
+        """Get the metrics file."""
+        return self.__prom_file
+
+    def value(self, metric: Metrics, **labels: str) -> float:
+        """Get the value of a metric, 0 if not set."""
+        return self.__values[metric].get(tuple(sorted(labels.items())), 0)
+
+    def set(self, metric: Metrics, value: float, **labels: str) -> None:
+        """Set the value of a metric."""
+        self.__values[metric][tuple(sorted(labels.items()))] = value
+
+    def add(self, metric: Metrics, value: float = 1, **labels: str) -> None:
+        """Add to the value of a metric."""
+        label_items = tuple(sorted(labels.items()))
+        self.__values[metric][label_items] = (
+            self.__values[metric].get(label_items, 0) + value
+        )
+
+    def lines(self) -> Iterator[str]:
+        """Iterate over the lines of the Prometheus text format."""
+        for metric, values in self.__values.items():
+            if not values:
+                continue
+            help_str, metric_type = HELP_AND_TYPES[metric]
+            yield f"# HELP {metric} {help_str}"
+            yield f"# TYPE {metric} {metric_type}"
+            for label_items, value in values.items():
+                yield f"{metric}{{{self.__label_str(label_items)}}} {float(value)!r}"
+
+    def write(self) -> None:
+        """Write the metrics file atomically."""
+        self.set(Metrics.LAST_UPDATE_TIME, time.time())
+        self.__prom_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_prom_file = self.__prom_file.with_name(f".{self.__prom_file.name}.tmp")
+        with tmp_prom_file.open("w") as f_out:
+            for line in self.lines():
+                f_out.write(line + "\n")
+        tmp_prom_file.replace(self.__prom_file)
+
+    def __label_str(self, label_items: tuple[tuple[str, str], ...]) -> str:
+        return ",".join(
+            f'{name}="{_escape_label_value(value)}"'
+            for name, value in (*self.__labels.items(), *label_items)
+        )
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+_CURRENT_EXPORTER: ContextVar[Exporter | None] = ContextVar(
+    "pbfbench_metrics_exporter",
+    default=None,
+)
+
+
+def current_exporter() -> Exporter | None:
+    """Get the active exporter."""
+    return _CURRENT_EXPORTER.get()
+
+
+@contextmanager
+def exporting(
+    prom_file: Path | None,
+    exp_fs_manager: exp_fs.ManagerBase,
+) -> Iterator[Exporter | None]:
+    """Activate an exporter writing in the metrics file, if any.
+
+    The final metrics are written when the run ends, even with an error.
+    """
+    if prom_file is None:
+        yield None
+        return
+    exporter = Exporter(
+        prom_file,
+        {
+            "topic": exp_fs_manager.tool_description().topic().name(),
+            "tool": exp_fs_manager.tool_description().name(),
+            "experiment": exp_fs_manager.experiment_name(),
+        },
+    )
+    exporter.set(Metrics.RUNNING, 1)
+    exporter.set(Metrics.START_TIME, time.time())
+    exporter.write()
+    token = _CURRENT_EXPORTER.set(exporter)
+    try:
+        yield exporter
+    finally:
+        _CURRENT_EXPORTER.reset(token)
+        exporter.set(Metrics.RUNNING, 0)
+        exporter.write()
+
+
+def set_value(metric: Metrics, value: float, **labels: str) -> None:
+    """Set the value of a metric of the active exporter."""
+    exporter = _CURRENT_EXPORTER.get()
+    if exporter is not None:
+        exporter.set(metric, value, **labels)
+
+
+def add(metric: Metrics, value: float = 1, **labels: str) -> None:
+    """Add to the value of a metric of the active exporter."""
+    exporter = _CURRENT_EXPORTER.get()
+    if exporter is not None:
+        exporter.add(metric, value, **labels)
+
+
+def write() -> None:
+    """Write the metrics file of the active exporter."""
+    exporter = _CURRENT_EXPORTER.get()
+    if exporter is not None:
+        exporter.write()
@@ -0,0 +1,68 @@
+"""Experiment run options module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+DEFAULT_GZ_CACHE_MAX_SIZE = 50.0
+
+
+class RunOptions:
+    """Experiment run options."""
+
+    def __init__(
+        self,
+        archive_logs: bool = False,  # noqa: FBT001, FBT002
+        stage_on_scratch: bool = False,  # noqa: FBT001, FBT002
+        gz_cache_dir: Path | None = None,
+        gz_cache_max_size: float = DEFAULT_GZ_CACHE_MAX_SIZE,
+    ) -> None:
+        """Initialize."""
+        self.__archive_logs = archive_logs
+        self.__stage_on_scratch = stage_on_scratch
+        self.__gz_cache_dir = gz_cache_dir
+        self.__gz_cache_max_size = gz_cache_max_size
+
+    def archive_logs(self) -> bool:
+        """Pack the sample logs in one archive per sample."""
+        return self.__archive_logs
+
+    def stage_on_scratch(self) -> bool:
+        """Stage the intermediate inputs and the outputs on the node scratch."""
+        return self.__stage_on_scratch
+
+    def gz_cache_dir(self) -> Path | None:
+        """Get the shared cache directory of the decompressed inputs.
+
+        None if the decompressed inputs are not cached.
+        """
+        return self.__gz_cache_dir
+
+    def gz_cache_max_size(self) -> float:
+        """Get the maximum size of the decompressed inputs cache (in GB)."""
+        return self.__gz_cache_max_size
+
+
+class InitOptions:
+    """Experiment init options."""
+
+    def __init__(
+        self,
+        jobs: int = 1,
+        use_sbatch: bool = False,  # noqa: FBT001, FBT002
+    ) -> None:
+        """Initialize."""
+        self.__jobs = jobs
+        self.__use_sbatch = use_sbatch
+
+    def jobs(self) -> int:
+        """Get the maximum number of parallel sample conversions."""
+        return self.__jobs
+
+    def use_sbatch(self) -> bool:
+        """Convert the sample inputs in a Slurm job array."""
+        return self.__use_sbatch
@@ -6,20 +6,29 @@ import logging
 import shutil
 import subprocess
 import time
+from itertools import chain
+from pathlib import Path
 from typing import TYPE_CHECKING, Self
 
-import rich.progress as rich_prog
+import rich.live
 
 import pbfbench.abc.tool.visitor as abc_tool_visitor
 import pbfbench.experiment.config as exp_cfg
 import pbfbench.experiment.errors as exp_errors
 import pbfbench.experiment.file_system as exp_fs
+import pbfbench.experiment.fingerprint as exp_fingerprint
 import pbfbench.experiment.iter as exp_iter
+import pbfbench.experiment.metrics as exp_metrics
+import pbfbench.experiment.options as exp_options
 import pbfbench.experiment.shell as exp_shell
+import pbfbench.experiment.trace as exp_trace
 import pbfbench.samples.file_system as smp_fs
+import pbfbench.samples.logs_archive as smp_logs_archive
 import pbfbench.samples.status as smp_status
+import pbfbench.slurm.progress as slurm_progress
 import pbfbench.slurm.shell as slurm_sh
 import pbfbench.slurm.status as slurm_status
+import pbfbench.slurm.timing as slurm_timing
 from pbfbench import root_logging, subprocess_lib
 
 if TYPE_CHECKING:
@@ -113,9 +122,16 @@ def run_experiment_on_samples_only_options(
     work_exp_fs_manager: exp_fs.WorkManager,
     exp_config: exp_cfg.ConfigOnlyOptions,
     tool_connector: abc_tool_visitor.ConnectorOnlyOptions,
+    run_options: exp_options.RunOptions | None = None,
 ) -> RunStatsOnlyOptions:
-    """Run the experiment."""
+    """Run the experiment.
+
+    The phase timing trace is written in the data experiment directory,
+    even if the run fails.
+    """
     # REFACTOR use markdon print and do better app prints
+    if run_options is None:
+        run_options = exp_options.RunOptions()
 
     _LOGGER.info(
         "Running experiment `%s` with tool `%s` for the topic `%s`.",
@@ -124,54 +140,91 @@ def run_experiment_on_samples_only_options(
         tool_connector.description().topic().name(),
     )
 
-    _init_experiment_file_systems(
-        data_exp_fs_manager,
-        work_exp_fs_manager,
-        exp_config,
-    )
+    with (
+        exp_trace.writing(data_exp_fs_manager.trace_json()) as tracer,
+        tracer.span("run experiment"),
+    ):
+        with exp_trace.span("init file systems"):
+            init_experiment_file_systems(
+                data_exp_fs_manager,
+                work_exp_fs_manager,
+                exp_config,
+            )
 
-    run_stats = RunStatsOnlyOptions.new(data_exp_fs_manager)
+        with exp_trace.span("status scan"):
+            run_stats = RunStatsOnlyOptions.new(data_exp_fs_manager)
+
+            fingerprinter = exp_fingerprint.Fingerprinter(
+                exp_config.tool_configs(),
+                tool_connector.inputs_to_commands(
+                    exp_config,
+                    data_exp_fs_manager,
+                    work_exp_fs_manager,
+                ).core_commands(),
+                [],
+            )
 
-    samples_to_run = _get_samples_to_run(data_exp_fs_manager, run_stats)
+            samples_to_run = _get_samples_to_run(
+                data_exp_fs_manager,
+                run_stats,
+                fingerprinter,
+            )
 
-    _init_sample_directories(samples_to_run, work_exp_fs_manager)
+        with exp_trace.span("init sample directories"):
+            _init_sample_directories(
+                samples_to_run,
+                work_exp_fs_manager,
+                fingerprinter,
+            )
 
-    if not samples_to_run:
-        _LOGGER.info("No samples to run")
-    else:
-        _LOGGER.info(
-            "Number of samples sent to sbatch: %d",
-            len(samples_to_run),
-        )
-        _create_and_run_sbatch_script(
-            tool_connector,
-            exp_config,
-            samples_to_run,
-            data_exp_fs_manager,
-            work_exp_fs_manager,
-        )
+        tasks_end_time: float | None = None
+        if not samples_to_run:
+            _LOGGER.info("No samples to run")
+        else:
+            _LOGGER.info(
+                "Number of samples sent to sbatch: %d",
+                len(samples_to_run),
+            )
+            _create_and_run_sbatch_script(
+                tool_connector,
+                exp_config,
+                samples_to_run,
+                data_exp_fs_manager,
+                work_exp_fs_manager,
+                run_options=run_options,
+            )
 
-        run_samples_with_status = _wait_all_job_finish(
-            samples_to_run,
-            work_exp_fs_manager,
-        )
+            run_samples_with_status = wait_all_job_finish(
+                samples_to_run,
+                work_exp_fs_manager,
+            )
+            tasks_end_time = time.monotonic()
 
-        _manage_all_run_status(
-            run_samples_with_status,
-            work_exp_fs_manager,
-            run_stats,
-        )
+            with exp_trace.span("manage run status"):
+                _manage_all_run_status(
+                    run_samples_with_status,
+                    work_exp_fs_manager,
+                    run_stats,
+                )
 
-        _write_sbatch_stats_and_move_slurm_logs(
-            run_samples_with_status,
-            work_exp_fs_manager,
-        )
+            with exp_trace.span("stats harvest"):
+                _write_sbatch_stats_and_move_slurm_logs(
+                    run_samples_with_status,
+                    work_exp_fs_manager,
+                    run_options,
+                )
 
-    _move_work_to_data(
-        work_exp_fs_manager,
-        data_exp_fs_manager,
-        samples_to_run,
-    )
+        with exp_trace.span("data move"):
+            _move_work_to_data(
+                work_exp_fs_manager,
+                data_exp_fs_manager,
+                samples_to_run,
+            )
+        if tasks_end_time is not None:
+            exp_metrics.set_value(
+                exp_metrics.Metrics.HARVEST_LATENCY,
+                time.monotonic() - tasks_end_time,
+            )
 
     if run_stats.samples_with_errors():
         _LOGGER.info(
@@ -187,9 +240,16 @@ def run_experiment_on_samples_with_arguments(
     work_exp_fs_manager: exp_fs.WorkManager,
     exp_config: exp_cfg.ConfigWithArguments,
     tool_connector: abc_tool_visitor.ConnectorWithArguments,
+    run_options: exp_options.RunOptions | None = None,
 ) -> RunStatsWithArguments:
-    """Run the experiment."""
+    """Run the experiment.
+
+    The phase timing trace is written in the data experiment directory,
+    even if the run fails.
+    """
     # REFACTOR use markdon print and do better app prints
+    if run_options is None:
+        run_options = exp_options.RunOptions()
 
     _LOGGER.info(
         "Running experiment `%s` with tool `%s` for the topic `%s`.",
@@ -198,71 +258,112 @@ def run_experiment_on_samples_with_arguments(
         tool_connector.description().topic().name(),
     )
 
-    _init_experiment_file_systems(
-        data_exp_fs_manager,
-        work_exp_fs_manager,
-        exp_config,
-    )
+    with (
+        exp_trace.writing(data_exp_fs_manager.trace_json()) as tracer,
+        tracer.span("run experiment"),
+    ):
+        with exp_trace.span("init file systems"):
+            init_experiment_file_systems(
+                data_exp_fs_manager,
+                work_exp_fs_manager,
+                exp_config,
+            )
 
-    run_stats = RunStatsWithArguments.new(data_exp_fs_manager)
+        with exp_trace.span("status scan"):
+            run_stats = RunStatsWithArguments.new(data_exp_fs_manager)
+
+            fingerprinter = exp_fingerprint.Fingerprinter(
+                exp_config.tool_configs(),
+                tool_connector.inputs_to_commands(
+                    exp_config,
+                    data_exp_fs_manager,
+                    work_exp_fs_manager,
+                ).core_commands(),
+                tool_connector.config_to_inputs(
+                    exp_config,
+                    data_exp_fs_manager,
+                ).values(),
+            )
 
-    samples_to_run = _get_samples_to_run(data_exp_fs_manager, run_stats)
+            samples_to_run = _get_samples_to_run(
+                data_exp_fs_manager,
+                run_stats,
+                fingerprinter,
+            )
 
-    _init_sample_directories(samples_to_run, work_exp_fs_manager)
+        with exp_trace.span("init sample directories"):
+            _init_sample_directories(
+                samples_to_run,
+                work_exp_fs_manager,
+                fingerprinter,
+            )
 
-    (
-        checked_inputs_samples_to_run,
-        samples_with_missing_inputs,
-    ) = _filter_missing_inputs(
-        tool_connector,
-        exp_config,
-        samples_to_run,
-        data_exp_fs_manager,
-        work_exp_fs_manager,
-    )
+        with exp_trace.span("missing inputs check"):
+            (
+                checked_inputs_samples_to_run,
+                samples_with_missing_inputs,
+            ) = _filter_missing_inputs(
+                tool_connector,
+                exp_config,
+                samples_to_run,
+                data_exp_fs_manager,
+                work_exp_fs_manager,
+            )
 
-    _write_experiment_missing_inputs(
-        samples_with_missing_inputs,
-        work_exp_fs_manager,
-        run_stats,
-    )
+            _write_experiment_missing_inputs(
+                samples_with_missing_inputs,
+                work_exp_fs_manager,
+                run_stats,
+            )
 
-    if not checked_inputs_samples_to_run:
-        _LOGGER.info("No samples to run")
-    else:
-        _LOGGER.info(
-            "Number of samples sent to sbatch: %d",
-            len(checked_inputs_samples_to_run),
-        )
-        _create_and_run_sbatch_script(
-            tool_connector,
-            exp_config,
-            checked_inputs_samples_to_run,
-            data_exp_fs_manager,
-            work_exp_fs_manager,
-        )
+        tasks_end_time: float | None = None
+        if not checked_inputs_samples_to_run:
+            _LOGGER.info("No samples to run")
+        else:
+            _LOGGER.info(
+                "Number of samples sent to sbatch: %d",
+                len(checked_inputs_samples_to_run),
+            )
+            _create_and_run_sbatch_script(
+                tool_connector,
+                exp_config,
+                checked_inputs_samples_to_run,
+                data_exp_fs_manager,
+                work_exp_fs_manager,
+                run_options=run_options,
+            )
 
-        run_samples_with_status = _wait_all_job_finish(
-            checked_inputs_samples_to_run,
-            work_exp_fs_manager,
-        )
+            run_samples_with_status = wait_all_job_finish(
+                checked_inputs_samples_to_run,
+                work_exp_fs_manager,
+            )
+            tasks_end_time = time.monotonic()
 
-        _manage_all_run_status(
-            run_samples_with_status,
-            work_exp_fs_manager,
-            run_stats,
-        )
+            with exp_trace.span("manage run status"):
+                _manage_all_run_status(
+                    run_samples_with_status,
+                    work_exp_fs_manager,
+                    run_stats,
+                )
 
-        _write_sbatch_stats_and_move_slurm_logs(
-            run_samples_with_status,
-            work_exp_fs_manager,
-        )
+            with exp_trace.span("stats harvest"):
+                _write_sbatch_stats_and_move_slurm_logs(
+                    run_samples_with_status,
+                    work_exp_fs_manager,
+                    run_options,
+                )
 
-    _move_work_to_data(
-        work_exp_fs_manager,
-        data_exp_fs_manager,
-        samples_to_run,
-    )
+        with exp_trace.span("data move"):
+            _move_work_to_data(
+                work_exp_fs_manager,
+                data_exp_fs_manager,
+                samples_to_run,
+            )
+        if tasks_end_time is not None:
+            exp_metrics.set_value(
+                exp_metrics.Metrics.HARVEST_LATENCY,
+                time.monotonic() - tasks_end_time,
+            )
 
     if run_stats.samples_with_missing_inputs() or run_stats.samples_with_errors():
         _LOGGER.info(
@@ -274,15 +375,27 @@ def run_experiment_on_samples_with_arguments(
     return run_stats
 
 
-def _init_experiment_file_systems[C: exp_cfg.ConfigWithOptions](
+def init_experiment_file_systems[C: exp_cfg.ConfigWithOptions](
     data_exp_fs_manager: exp_fs.DataManager,
     work_exp_fs_manager: exp_fs.WorkManager,
     exp_config: C,
 ) -> None:
-    """Prepare experiment file systems."""
+    """Prepare experiment file systems.
+
+    The working experiment directory is cleaned,
+    except the init sub-directory, which may be used by a running init.
+    """
     data_exp_fs_manager.exp_dir().mkdir(parents=True, exist_ok=True)
 
-    shutil.rmtree(work_exp_fs_manager.exp_dir(), ignore_errors=True)
+    if work_exp_fs_manager.exp_dir().exists():
+        init_work_exp_dir = work_exp_fs_manager.init_work_manager().exp_dir()
+        for path in work_exp_fs_manager.exp_dir().iterdir():
+            if path == init_work_exp_dir:
+                continue
+            if path.is_dir() and not path.is_symlink():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
 
     work_exp_fs_manager.exp_dir().mkdir(parents=True, exist_ok=True)
     exp_fs.write_formatted_exp_date(work_exp_fs_manager)
@@ -293,6 +406,7 @@ def _init_experiment_file_systems[C: exp_cfg.ConfigWithOptions](
 def _get_samples_to_run(
     data_exp_fs_manager: exp_fs.DataManager,
     run_stats: _RunStatsWithOptions,
+    fingerprinter: exp_fingerprint.Fingerprinter,
 ) -> list[smp_fs.RowNumberedItem]:
     """Get samples to run."""
     with smp_fs.TSVReader.open(data_exp_fs_manager.samples_tsv()) as smp_tsv_in:
@@ -300,9 +414,18 @@ def _get_samples_to_run(
             exp_iter.samples_to_run(
                 data_exp_fs_manager,
                 smp_tsv_in.iter_row_numbered_items(),
+                fingerprinter,
             ),
         )
     run_stats.add_samples_to_run(len(samples_to_run))
+    exp_trace.count("samples scanned", run_stats.number_of_samples())
+    exp_trace.count("samples to run", len(samples_to_run))
+    exp_metrics.set_value(
+        exp_metrics.Metrics.SAMPLES,
+        run_stats.number_of_samples() - len(samples_to_run),
+        status=exp_metrics.SampleStatuses.DONE,
+    )
+    exp_metrics.write()
 
     _LOGGER.info("Number of samples to run: %d", len(samples_to_run))
 
@@ -312,11 +435,16 @@ def _get_samples_to_run(
 def _init_sample_directories(
     samples_to_run: Iterable[smp_fs.RowNumberedItem],
     work_exp_fs_manager: exp_fs.WorkManager,
+    fingerprinter: exp_fingerprint.Fingerprinter,
 ) -> None:
-    """Prepare sample directories."""
+    """Prepare sample directories and record the sample run fingerprints."""
     for run_sample in samples_to_run:
         sample_fs_manager = work_exp_fs_manager.sample_fs_manager(run_sample.item())
         sample_fs_manager.sample_dir().mkdir(parents=True, exist_ok=True)
+        exp_fingerprint.write(
+            sample_fs_manager,
+            fingerprinter.fingerprint(run_sample.item()),
+        )
 
 
 def _filter_missing_inputs(
@@ -343,6 +471,7 @@ def _filter_missing_inputs(
             tool_connector,
         )
     )
+    exp_trace.count("samples with missing inputs", len(samples_with_missing_inputs))
 
     return (
         checked_inputs_samples_to_run,
@@ -361,6 +490,11 @@ def _write_experiment_missing_inputs(
     )
 
     _LOGGER.error("Samples with missing inputs: %d", len(samples_with_missing_inputs))
+    exp_metrics.set_value(
+        exp_metrics.Metrics.SAMPLES,
+        len(samples_with_missing_inputs),
+        status=exp_metrics.SampleStatuses.MISSING_INPUTS,
+    )
 
     with exp_errors.ErrorsTSVWriter.open(
         work_exp_fs_manager.errors_tsv(),
@@ -377,46 +511,65 @@ def _write_experiment_missing_inputs(
         )
 
 
-def _create_and_run_sbatch_script(
+def _create_and_run_sbatch_script(  # noqa: PLR0913
     tool_connector: abc_tool_visitor.ConnectorWithOptions,
     exp_config: exp_cfg.ConfigWithOptions,
     checked_inputs_samples_to_run: list[smp_fs.RowNumberedItem],
     data_exp_fs_manager: exp_fs.DataManager,
     work_exp_fs_manager: exp_fs.WorkManager,
+    *,
+    run_options: exp_options.RunOptions,
 ) -> None:
     """Run sbatch script."""
-    work_exp_fs_manager.tmp_slurm_logs_dir().mkdir(parents=True, exist_ok=True)
-    tool_commands = tool_connector.inputs_to_commands(
-        exp_config,
-        data_exp_fs_manager,
-        work_exp_fs_manager,
-    )
-    exp_shell.create_run_script(
-        data_exp_fs_manager,
-        work_exp_fs_manager,
-        checked_inputs_samples_to_run,
-        exp_config.slurm_config(),
-        tool_commands,
-    )
+    with exp_trace.span("script generation"):
+        work_exp_fs_manager.tmp_slurm_logs_dir().mkdir(parents=True, exist_ok=True)
+        tool_commands = tool_connector.inputs_to_commands(
+            exp_config,
+            data_exp_fs_manager,
+            work_exp_fs_manager,
+            run_options,
+        )
+        exp_shell.create_run_script(
+            data_exp_fs_manager,
+            work_exp_fs_manager,
+            checked_inputs_samples_to_run,
+            exp_config.slurm_config(),
+            tool_commands.commands(),
+        )
+    submit_sbatch_script(work_exp_fs_manager)
+
 
+def submit_sbatch_script(work_exp_fs_manager: exp_fs.WorkManager) -> None:
+    """Submit the sbatch script of the working experiment directory."""
     cmd_path = subprocess_lib.command_path(slurm_sh.SBATCH_CMD)
-    result = subprocess.run(  # noqa: S603
-        [str(x) for x in [cmd_path, work_exp_fs_manager.sbatch_sh_script()]],
-        capture_output=True,
-        check=False,
-    )
+    with exp_trace.span("sbatch submit"):
+        result = subprocess.run(  # noqa: S603
+            [str(x) for x in [cmd_path, work_exp_fs_manager.sbatch_sh_script()]],
+            capture_output=True,
+            check=False,
+        )
     # FIXME should check and return Error if failed
     # TODO convert debug output and error in text
     _LOGGER.debug("%s stdout: %s", slurm_sh.SBATCH_CMD, result.stdout)
     _LOGGER.debug("%s stderr: %s", slurm_sh.SBATCH_CMD, result.stderr)
 
 
-def _wait_all_job_finish(
+POLL_INTERVAL = 10
+SQUEUE_INTERVAL = 60
+
+
+def wait_all_job_finish(
     checked_inputs_samples_to_run: list[smp_fs.RowNumberedItem],
     work_exp_fs_manager: exp_fs.WorkManager,
 ) -> list[tuple[smp_fs.RowNumberedItem, slurm_status.Status, str]]:
-    """Wait all job finish."""
-    array_job_id = _get_array_job_id(work_exp_fs_manager)
+    """Wait all job finish.
+
+    The queue wait lasts until the array job ID file is written by the first task.
+    The live progress view is updated from the status log every `POLL_INTERVAL`
+    seconds and from `squeue` every `SQUEUE_INTERVAL` seconds.
+    """
+    with exp_trace.span("queue wait"):
+        array_job_id = _get_array_job_id(work_exp_fs_manager)
 
     in_running_job_ids: dict[str, smp_fs.RowNumberedItem] = {
         slurm_sh.array_task_job_id(
@@ -430,39 +583,102 @@ def _wait_all_job_finish(
         tuple[smp_fs.RowNumberedItem, slurm_status.Status, str]
     ] = []
 
-    with rich_prog.Progress(console=root_logging.CONSOLE) as progress:
-        slurm_running_task = progress.add_task(
-            "Slurm running",
-            total=len(in_running_job_ids),
-        )
-
+    status_log_tailer = slurm_status.StatusLogTailer(
+        work_exp_fs_manager.sbatch_status_log(),
+    )
+    exp_progress = slurm_progress.ExperimentProgress(
+        progress_name(work_exp_fs_manager),
+        len(in_running_job_ids),
+    )
+    exp_progress.set_array_job_id(array_job_id)
+    _set_progress_metrics(exp_progress)
+
+    with (
+        exp_trace.span("polling"),
+        rich.live.Live(
+            slurm_progress.progress_table([exp_progress]),
+            console=root_logging.CONSOLE,
+            auto_refresh=False,
+        ) as live,
+    ):
+        last_squeue_time = float("-inf")
         while in_running_job_ids:
-            time.sleep(60)
-
-            _tmp_in_running_job_ids = {}
-            for job_id, row_numbered_item in in_running_job_ids.items():
-                status = slurm_status.get_status(work_exp_fs_manager, job_id)
-                if status is None:
-                    _tmp_in_running_job_ids[job_id] = row_numbered_item
-                else:
-                    run_samples_with_status.append((row_numbered_item, status, job_id))
-
-            progress.update(
-                slurm_running_task,
-                advance=(len(in_running_job_ids) - len(_tmp_in_running_job_ids)),
+            time.sleep(POLL_INTERVAL)
+            poll_start_time = time.perf_counter()
+            exp_trace.count("polls")
+
+            for task_status in status_log_tailer.read_new():
+                row_numbered_item = in_running_job_ids.pop(task_status.job_id(), None)
+                if row_numbered_item is not None:
+                    run_samples_with_status.append(
+                        (row_numbered_item, task_status.status(), task_status.job_id()),
+                    )
+                    exp_progress.add_finished(
+                        task_status.start_time(),
+                        task_status.end_time(),
+                        slurm_status_equals_an_exp_sample_error(task_status.status()),
+                    )
+
+            if time.monotonic() - last_squeue_time >= SQUEUE_INTERVAL:
+                slurm_progress.update_queue_counts([exp_progress])
+                exp_trace.count("squeue calls")
+                exp_metrics.add(exp_metrics.Metrics.SQUEUE_CALLS)
+                last_squeue_time = time.monotonic()
+
+            live.update(slurm_progress.progress_table([exp_progress]), refresh=True)
+            exp_trace.counter("slurm tasks", running=len(in_running_job_ids))
+            exp_metrics.add(exp_metrics.Metrics.POLLS)
+            exp_metrics.add(
+                exp_metrics.Metrics.POLL_SECONDS,
+                time.perf_counter() - poll_start_time,
             )
-            in_running_job_ids = _tmp_in_running_job_ids
+            _set_progress_metrics(exp_progress)
 
+    work_exp_fs_manager.array_job_id_file().unlink(missing_ok=True)
     return run_samples_with_status
 
 
+def _set_progress_metrics(exp_progress: slurm_progress.ExperimentProgress) -> None:
+    """Set the sample and task metrics from the progress, and write them."""
+    for status, number_of_samples in (
+        (exp_metrics.SampleStatuses.RUNNING, exp_progress.remaining()),
+        (exp_metrics.SampleStatuses.OK, exp_progress.ok()),
+        (exp_metrics.SampleStatuses.ERROR, exp_progress.failed()),
+    ):
+        exp_metrics.set_value(
+            exp_metrics.Metrics.SAMPLES,
+            number_of_samples,
+            status=status,
+        )
+    for state, number_of_tasks in (
+        (exp_metrics.TaskStates.PENDING, exp_progress.pending()),
+        (exp_metrics.TaskStates.RUNNING, exp_progress.running()),
+    ):
+        exp_metrics.set_value(exp_metrics.Metrics.TASKS, number_of_tasks, state=state)
+    exp_metrics.write()
+
+
+def progress_name(exp_fs_manager: exp_fs.ManagerBase) -> str:
+    """Get the experiment name shown in the progress view."""
+    return "/".join(
+        (
+            exp_fs_manager.tool_description().topic().name(),
+            exp_fs_manager.tool_description().name(),
+            exp_fs_manager.experiment_name(),
+        ),
+    )
+
+
 def _get_array_job_id(work_exp_fs_manager: exp_fs.WorkManager) -> str:
-    """Wait the array job id file is created and extract the array job id."""
+    """Wait the array job id file is created and extract the array job id.
+
+    The file is kept until all the tasks end,
+    so that the next tasks do not write it again
+    and that the progress can be watched from another process.
+    """
     while not work_exp_fs_manager.array_job_id_file().exists():
         time.sleep(10)
-    array_job_id = exp_fs.get_array_job_id_from_file(work_exp_fs_manager)
-    work_exp_fs_manager.array_job_id_file().unlink()
-    return array_job_id
+    return exp_fs.get_array_job_id_from_file(work_exp_fs_manager)
 
 
 def _manage_all_run_status(
@@ -477,8 +693,10 @@ def _manage_all_run_status(
         sample_fs_manager = work_exp_fs_manager.sample_fs_manager(
             run_sample.item(),
         )
-        if _slurm_status_equals_an_exp_sample_error(status):
+        if slurm_status_equals_an_exp_sample_error(status):
             run_stats.samples_with_errors().append(run_sample.item().exp_sample_id())
+            with root_logging.log_context(sample=run_sample.item().exp_sample_id()):
+                _LOGGER.debug("Task %s ends with status %s", job_id, status)
             shutil.copy(
                 work_exp_fs_manager.sbatch_err_file(job_id),
                 sample_fs_manager.errors_log(),
@@ -506,7 +724,8 @@ def _manage_all_run_status(
         )
 
 
-def _slurm_status_equals_an_exp_sample_error(status: slurm_status.Status) -> bool:
+def slurm_status_equals_an_exp_sample_error(status: slurm_status.Status) -> bool:
+    """Check if the slurm status corresponds to a sample error."""
     match status:
         case slurm_status.Status.INIT_ENV_ERROR | slurm_status.Status.COMMAND_ERROR:
             return True
@@ -519,22 +738,84 @@ def _write_sbatch_stats_and_move_slurm_logs(
         tuple[smp_fs.RowNumberedItem, slurm_status.Status, str]
     ],
     work_exp_fs_manager: exp_fs.WorkManager,
+    run_options: exp_options.RunOptions,
 ) -> None:
-    """Write sbatch stats."""
+    """Write sbatch stats and section timings, move slurm logs and archive them.
+
+    The slurm logs are archived only if the run option is set.
+    """
+    job_section_timings = slurm_timing.read_timing_log(
+        work_exp_fs_manager.sbatch_timing_log(),
+    )
     for run_sample, _, job_id in run_samples_with_status:
         sample_fs_manager = work_exp_fs_manager.sample_fs_manager(run_sample.item())
-        slurm_sh.write_slurm_stats(job_id, sample_fs_manager.sbatch_stats_psv())
+        with root_logging.log_context(sample=run_sample.item().exp_sample_id()):
+            slurm_sh.write_slurm_stats(job_id, sample_fs_manager.sbatch_stats_psv())
+        exp_trace.count("stats issued")
+        if job_id in job_section_timings:
+            slurm_timing.write_timing_tsv(
+                job_section_timings[job_id],
+                sample_fs_manager.timing_tsv(),
+            )
 
-        sbatch_log_regex = work_exp_fs_manager.sbatch_file_regex(job_id)
-        for slurm_log_file in sbatch_log_regex.parent.glob(sbatch_log_regex.name):
+        slurm_log_files = (
+            work_exp_fs_manager.sbatch_out_file(job_id),
+            work_exp_fs_manager.sbatch_err_file(job_id),
+        )
+        for slurm_log_file in slurm_log_files:
             if slurm_log_file.exists():
                 shutil.copy(slurm_log_file, sample_fs_manager.sample_dir())
                 slurm_log_file.unlink()
+                exp_trace.count("slurm logs moved")
+
+        if run_options.archive_logs():
+            smp_logs_archive.pack(
+                sample_fs_manager,
+                [
+                    *(
+                        sample_fs_manager.sample_dir() / slurm_log_file.name
+                        for slurm_log_file in slurm_log_files
+                    ),
+                    sample_fs_manager.done_log(),
+                    sample_fs_manager.errors_log(),
+                    sample_fs_manager.sbatch_stats_psv(),
+                    sample_fs_manager.timing_tsv(),
+                ],
+            )
+
+    if job_section_timings:
+        slurm_timing.write_summary_tsv(
+            chain.from_iterable(job_section_timings.values()),
+            work_exp_fs_manager.timing_summary_tsv(),
+        )
+    work_exp_fs_manager.sbatch_timing_log().unlink(missing_ok=True)
+
+    if work_exp_fs_manager.sbatch_status_log().exists():
+        _append_file(
+            work_exp_fs_manager.sbatch_status_log(),
+            work_exp_fs_manager.status_log(),
+        )
+        work_exp_fs_manager.sbatch_status_log().unlink()
 
     if not any(work_exp_fs_manager.tmp_slurm_logs_dir().iterdir()):
         work_exp_fs_manager.tmp_slurm_logs_dir().rmdir()
 
 
+def _append_file(src_file: Path, dst_file: Path) -> None:
+    """Append the content of the source file to the destination file."""
+    with src_file.open("rb") as f_in, dst_file.open("ab") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+
+
+def _counted_copy(src: str, dst: str) -> str:
+    """Copy a file and count the copied bytes in the active trace span and metrics."""
+    copied_dst = shutil.copy2(src, dst)
+    copied_bytes = Path(copied_dst).stat().st_size
+    exp_trace.count("bytes copied", copied_bytes)
+    exp_metrics.add(exp_metrics.Metrics.BYTES_MOVED, copied_bytes)
+    return copied_dst
+
+
 def _move_work_to_data(
     work_exp_fs_manager: exp_fs.WorkManager,
     data_exp_fs_manager: exp_fs.DataManager,
@@ -571,8 +852,14 @@ def _move_work_to_data(
         shutil.copytree(
             work_sample_fs_manager.sample_dir(),
             data_sample_fs_manager.sample_dir(),
+            copy_function=_counted_copy,
         )
+        exp_trace.count("samples moved")
         shutil.rmtree(work_sample_fs_manager.sample_dir(), ignore_errors=True)
+        exp_fs.remove_empty_shard_dirs(
+            work_exp_fs_manager.exp_dir(),
+            work_sample_fs_manager.sample_dir(),
+        )
     #
     # Move experiment scripts
     #
@@ -585,6 +872,15 @@ def _move_work_to_data(
             shutil.copy(script_file, data_exp_fs_manager.scripts_dir())
             script_file.unlink()
     #
+    # Append the sbatch status history
+    #
+    if work_exp_fs_manager.status_log().exists():
+        _append_file(
+            work_exp_fs_manager.status_log(),
+            data_exp_fs_manager.status_log(),
+        )
+        work_exp_fs_manager.status_log().unlink()
+    #
     # Move experiment errors
     #
     data_exp_fs_manager.errors_tsv().unlink(missing_ok=True)
@@ -595,6 +891,15 @@ def _move_work_to_data(
         )
         work_exp_fs_manager.errors_tsv().unlink()
     #
+    # Move experiment section timing summary
+    #
+    if work_exp_fs_manager.timing_summary_tsv().exists():
+        shutil.copy(
+            work_exp_fs_manager.timing_summary_tsv(),
+            data_exp_fs_manager.timing_summary_tsv(),
+        )
+        work_exp_fs_manager.timing_summary_tsv().unlink()
+    #
     # Try to remove empty tree
     #
     tree_to_remove = [
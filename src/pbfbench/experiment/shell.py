@@ -7,35 +7,43 @@ from itertools import chain
 from typing import TYPE_CHECKING
 
 import pbfbench.abc.tool.environments as abc_tools_envs
-import pbfbench.abc.tool.shell as abc_tool_shell
 import pbfbench.experiment.file_system as exp_fs
 import pbfbench.samples.file_system as smp_fs
 import pbfbench.samples.shell as smp_sh
 import pbfbench.shell as sh
 import pbfbench.slurm.config as slurm_cfg
 import pbfbench.slurm.shell as slurm_sh
+import pbfbench.slurm.timing as slurm_timing
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator
     from pathlib import Path
 
 
-def create_run_script(
+def create_run_script(  # noqa: PLR0913
     data_exp_fs_manager: exp_fs.DataManager,
     work_exp_fs_manager: exp_fs.WorkManager,
     samples_to_run: Iterable[smp_fs.RowNumberedItem],
     slurm_cfg: slurm_cfg.Config,
-    tool_cmd: abc_tool_shell._CommandsWithOptions,
+    command_lines: Iterable[str],
+    *,
+    with_tool_env: bool = True,
 ) -> None:
-    """Create the run script."""
-    tool_bash_env_wrapper = abc_tools_envs.BashEnvWrapper(
-        data_exp_fs_manager.tool_env_script_sh(),
+    """Create the run script.
+
+    When `with_tool_env` is false, the tool environment wrapper script
+    is not used (e.g. for the commands run by pbfbench itself).
+    """
+    tool_bash_env_wrapper = (
+        abc_tools_envs.BashEnvWrapper(data_exp_fs_manager.tool_env_script_sh())
+        if with_tool_env
+        else None
     )
 
     _write_command_script(
         data_exp_fs_manager,
         work_exp_fs_manager,
-        tool_cmd,
+        command_lines,
     )
 
     _add_x_permissions_to_command_script(work_exp_fs_manager.command_sh_script())
@@ -51,7 +59,7 @@ def create_run_script(
 def _write_command_script(
     data_exp_fs_manager: exp_fs.DataManager,
     work_exp_fs_manager: exp_fs.WorkManager,
-    tool_cmd: abc_tool_shell._CommandsWithOptions,
+    command_lines: Iterable[str],
 ) -> None:
     """Write the command script (which `srun` will call)."""
     cmd_sh_path = work_exp_fs_manager.command_sh_script()
@@ -59,7 +67,7 @@ def _write_command_script(
         command_out.write(f"{sh.BASH_SHEBANG}\n\n")
         for line in chain(
             smp_sh.SpeSmpIDLinesBuilder(data_exp_fs_manager.samples_tsv()).lines(),
-            tool_cmd.commands(),
+            command_lines,
         ):
             command_out.write(sh.exit_on_error(line) + "\n")
 
@@ -74,9 +82,23 @@ def _write_sbatch_script(
     work_exp_fs_manager: exp_fs.WorkManager,
     slurm_cfg: slurm_cfg.Config,
     samples_to_run: Iterable[smp_fs.RowNumberedItem],
-    tool_bash_env_wrapper: abc_tools_envs.BashEnvWrapper,
+    tool_bash_env_wrapper: abc_tools_envs.BashEnvWrapper | None,
 ) -> None:
     """Write the sbatch script."""
+    init_env_lines: Iterable[str] = (
+        tool_bash_env_wrapper.init_env_lines()
+        if tool_bash_env_wrapper is not None
+        else ()
+    )
+    close_env_lines: Iterable[str] = (
+        tool_bash_env_wrapper.close_env_lines()
+        if tool_bash_env_wrapper is not None
+        else ()
+    )
+    timing_lines_builder = slurm_timing.SectionLinesBuilder(
+        work_exp_fs_manager.sbatch_timing_log(),
+        slurm_sh.SLURM_JOB_ID_FROM_VARS,
+    )
     with work_exp_fs_manager.sbatch_sh_script().open("w") as sbatch_out:
         sbatch_out.write(f"{sh.BASH_SHEBANG}\n")
 
@@ -100,17 +122,21 @@ def _write_sbatch_script(
             #
             # Init env
             #
-            (
-                sh.manage_error_and_exit(
-                    line,
-                    slurm_sh.ExitFunctionLinesBuilder.EXIT_INIT_ENV_ERROR_FN_NAME,
-                )
-                for line in tool_bash_env_wrapper.init_env_lines()
+            timing_lines_builder.section_lines(
+                slurm_timing.Sections.INIT_ENV,
+                (
+                    sh.manage_error_and_exit(
+                        line,
+                        slurm_sh.ExitFunctionLinesBuilder.EXIT_INIT_ENV_ERROR_FN_NAME,
+                    )
+                    for line in init_env_lines
+                ),
             ),
             #
             # Srun command subscript
             #
-            iter(
+            timing_lines_builder.section_lines(
+                slurm_timing.Sections.COMMAND,
                 (
                     sh.manage_error_and_exit(
                         f"srun {work_exp_fs_manager.command_sh_script()}",
@@ -121,12 +147,15 @@ def _write_sbatch_script(
             #
             # Close env
             #
-            (
-                sh.manage_error_and_exit(
-                    line,
-                    slurm_sh.ExitFunctionLinesBuilder.EXIT_CLOSE_ENV_ERROR_FN_NAME,
-                )
-                for line in tool_bash_env_wrapper.close_env_lines()
+            timing_lines_builder.section_lines(
+                slurm_timing.Sections.CLOSE_ENV,
+                (
+                    sh.manage_error_and_exit(
+                        line,
+                        slurm_sh.ExitFunctionLinesBuilder.EXIT_CLOSE_ENV_ERROR_FN_NAME,
+                    )
+                    for line in close_env_lines
+                ),
             ),
             #
             # Exit end
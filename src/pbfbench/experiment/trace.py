@@ -0,0 +1,201 @@
+"""Experiment phase timing trace.
+
+The phases of the experiment commands are recorded as nested timing spans,
+with per-phase counters (e.g. number of scanned samples, copied bytes).
+The trace is written in the Chrome trace-event JSON format,
+which can be opened with `chrome://tracing` or https://ui.perfetto.dev.
+
+The active tracer is stored in a context variable,
+so that the phases of the called functions are recorded
+without passing the tracer around.
+Without active tracer, the spans and the counters are ignored.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+DEFAULT_CATEGORY = "pbfbench"
+
+_NANO_PER_MICRO = 1000
+
+
+class Span:
+    """Timing span."""
+
+    def __init__(self, name: str, category: str, start_ns: int) -> None:
+        """Initialize."""
+        self.__name = name
+        self.__category = category
+        self.__start_ns = start_ns
+        self.__counters: dict[str, int | float] = {}
+
+    def name(self) -> str:
+        """Get name."""
+        return self.__name
+
+    def category(self) -> str:
+        """Get category."""
+        return self.__category
+
+    def start_ns(self) -> int:
+        """Get start time (in ns, relative to the tracer start)."""
+        return self.__start_ns
+
+    def counters(self) -> dict[str, int | float]:
+        """Get counters."""
+        return self.__counters
+
+    def count(self, counter_name: str, value: float = 1) -> None:
+        """Add the value to the counter."""
+        self.__counters[counter_name] = self.__counters.get(counter_name, 0) + value
+
+
+class Tracer:
+    """Timing tracer."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.__epoch_us = time.time_ns() // _NANO_PER_MICRO
+        self.__start_perf_ns = time.perf_counter_ns()
+        self.__pid = os.getpid()
+        self.__events: list[dict[str, Any]] = []
+        self.__span_stack: list[Span] = []
+
+    def events(self) -> list[dict[str, Any]]:
+        """Get trace events."""
+        return self.__events
+
+    def current_span(self) -> Span | None:
+        """Get the innermost open span."""
+        return self.__span_stack[-1] if self.__span_stack else None
+
+    @contextmanager
+    def span(self, name: str, category: str = DEFAULT_CATEGORY) -> Iterator[Span]:
+        """Record a timing span, its counters are written as event arguments."""
+        span = Span(name, category, self.__now_ns())
+        self.__span_stack.append(span)
+        try:
+            yield span
+        finally:
+            self.__span_stack.pop()
+            self.__events.append(
+                {
+                    "name": span.name(),
+                    "cat": span.category(),
+                    "ph": "X",
+                    "ts": self.__timestamp_us(span.start_ns()),
+                    "dur": (self.__now_ns() - span.start_ns()) / _NANO_PER_MICRO,
+                    "pid": self.__pid,
+                    "tid": threading.get_native_id(),
+                    "args": span.counters(),
+                },
+            )
+
+    def counter(self, name: str, **values: float) -> None:
+        """Record counter values at the current time (timeline counter event)."""
+        self.__events.append(
+            {
+                "name": name,
+                "cat": DEFAULT_CATEGORY,
+                "ph": "C",
+                "ts": self.__timestamp_us(self.__now_ns()),
+                "pid": self.__pid,
+                "args": values,
+            },
+        )
+
+    def write(self, trace_json: Path) -> None:
+        """Write the trace events in Chrome trace-event JSON format."""
+        with trace_json.open("w") as f_out:
+            json.dump(
+                {
+                    "traceEvents": sorted(self.__events, key=lambda e: e["ts"]),
+                    "displayTimeUnit": "ms",
+                },
+                f_out,
+            )
+
+    def __now_ns(self) -> int:
+        """Get the time since the tracer start (in ns)."""
+        return time.perf_counter_ns() - self.__start_perf_ns
+
+    def __timestamp_us(self, relative_ns: int) -> float:
+        """Get the absolute timestamp (in µs) of a time relative to the start."""
+        return self.__epoch_us + relative_ns / _NANO_PER_MICRO
+
+
+_CURRENT_TRACER: ContextVar[Tracer | None] = ContextVar(
+    "pbfbench_tracer",
+    default=None,
+)
+
+
+def current_tracer() -> Tracer | None:
+    """Get the active tracer."""
+    return _CURRENT_TRACER.get()
+
+
+@contextmanager
+def tracing() -> Iterator[Tracer]:
+    """Activate a new tracer, or yield the already active one."""
+    tracer = _CURRENT_TRACER.get()
+    if tracer is not None:
+        yield tracer
+        return
+    tracer = Tracer()
+    token = _CURRENT_TRACER.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _CURRENT_TRACER.reset(token)
+
+
+@contextmanager
+def writing(trace_json: Path) -> Iterator[Tracer]:
+    """Activate a tracer and write its trace when the block exits.
+
+    The trace is also written if the block fails or is interrupted,
+    with the spans ended by the error.
+    """
+    with tracing() as tracer:
+        try:
+            yield tracer
+        finally:
+            trace_json.parent.mkdir(parents=True, exist_ok=True)
+            tracer.write(trace_json)
+
+
+@contextmanager
+def span(name: str, category: str = DEFAULT_CATEGORY) -> Iterator[None]:
+    """Record a timing span with the active tracer."""
+    tracer = _CURRENT_TRACER.get()
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name, category):
+        yield
+
+
+def count(counter_name: str, value: float = 1) -> None:
+    """Add the value to the counter of the innermost span of the active tracer."""
+    tracer = _CURRENT_TRACER.get()
+    if tracer is not None and (current_span := tracer.current_span()) is not None:
+        current_span.count(counter_name, value)
+
+
+def counter(name: str, **values: float) -> None:
+    """Record timeline counter values with the active tracer."""
+    tracer = _CURRENT_TRACER.get()
+    if tracer is not None:
+        tracer.counter(name, **values)
@@ -0,0 +1 @@
+"""Shared cache of decompressed inputs."""
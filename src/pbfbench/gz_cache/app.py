@@ -0,0 +1,70 @@
+"""Decompressed inputs cache application."""
+
+# Due to typer usage:
+# ruff: noqa: TC001, TC003, UP007, FBT001, FBT002, PLR0913
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+import pbfbench.experiment.options as exp_options
+import pbfbench.gz_cache.cache as gz_cache
+
+APP = typer.Typer(
+    name="gz-cache",
+    help="Shared cache of decompressed inputs (used by the tool scripts)",
+    rich_markup_mode="rich",
+)
+
+
+class Arguments:
+    """Cache arguments."""
+
+    CACHE_DIR = typer.Argument(help="Cache directory")
+    GZ_FILE = typer.Argument(help="Gzipped file")
+    HOLDER = typer.Argument(help="Holder ID (`HOSTNAME:PID` of the task script)")
+
+
+class Options:
+    """Cache options."""
+
+    MAX_SIZE = typer.Option(help="Maximum size of the cache (in GB)")
+
+
+@APP.command()
+def acquire(
+    cache_dir: Annotated[Path, Arguments.CACHE_DIR],
+    gz_file: Annotated[Path, Arguments.GZ_FILE],
+    holder: Annotated[str, Arguments.HOLDER],
+    max_size: Annotated[
+        float,
+        Options.MAX_SIZE,
+    ] = exp_options.DEFAULT_GZ_CACHE_MAX_SIZE,
+) -> None:
+    """Print the path of the decompressed copy of the gzipped file and hold it.
+
+    Only the path is printed on the standard output (no logging).
+    """
+    typer.echo(
+        gz_cache.Cache(cache_dir, int(max_size * gz_cache.GIGA)).acquire(
+            gz_file,
+            holder,
+        ),
+    )
+
+
+@APP.command()
+def release(
+    cache_dir: Annotated[Path, Arguments.CACHE_DIR],
+    gz_file: Annotated[Path, Arguments.GZ_FILE],
+    holder: Annotated[str, Arguments.HOLDER],
+    max_size: Annotated[
+        float,
+        Options.MAX_SIZE,
+    ] = exp_options.DEFAULT_GZ_CACHE_MAX_SIZE,
+) -> None:
+    """Release the decompressed copy of the gzipped file."""
+    gz_cache.Cache(cache_dir, int(max_size * gz_cache.GIGA)).release(gz_file, holder)
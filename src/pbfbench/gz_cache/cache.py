@@ -0,0 +1,320 @@
+"""Shared cache of decompressed inputs.
+
+The cache directory contains:
+
+* `lock`: the file locked (`flock`) while the cache state is read or written
+* `state.json`: the cache entries with their size, last use time and holders
+* `entries/KEY/NAME`: the decompressed copy of the gzipped file `NAME.gz`
+
+An entry key is derived from the identity of the gzipped file
+(resolved path, size, modification time and inode),
+so a modified source gets a new entry.
+
+The holders are the running tasks using the entry (`HOSTNAME:PID`),
+with the time they acquired it.
+The tasks release their entries when their script exits, even on error.
+The entries without holders are evicted in the least recently used order
+when the cache size exceeds its maximum size.
+The holders of the current host which are not running anymore are dropped,
+as well as the holders older than the holder maximum age (lease),
+so that the holders of killed tasks on other hosts expire.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import socket
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from pbfbench import gz_reader
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+GIGA = 1024**3
+
+# Default holder lease (in s), beyond the usual Slurm time limits
+DEFAULT_HOLDER_MAX_AGE = 7 * 24 * 3600
+
+
+class Entry:
+    """Cache entry."""
+
+    KEY_NAME = "name"
+    KEY_SIZE = "size"
+    KEY_LAST_USE = "last_use"
+    KEY_HOLDERS = "holders"
+
+    @classmethod
+    def from_dict(cls, entry_dict: dict[str, Any]) -> Entry:
+        """Convert dict to object.
+
+        The holders of the old states (list without acquire times)
+        get the last use time as acquire time.
+        """
+        holders = entry_dict[cls.KEY_HOLDERS]
+        if isinstance(holders, list):
+            holders = dict.fromkeys(holders, entry_dict[cls.KEY_LAST_USE])
+        return cls(
+            entry_dict[cls.KEY_NAME],
+            entry_dict[cls.KEY_SIZE],
+            entry_dict[cls.KEY_LAST_USE],
+            holders,
+        )
+
+    def __init__(
+        self,
+        name: str,
+        size: int,
+        last_use: float,
+        holders: dict[str, float],
+    ) -> None:
+        """Initialize."""
+        self.__name = name
+        self.__size = size
+        self.__last_use = last_use
+        self.__holders = holders
+
+    def name(self) -> str:
+        """Get decompressed file name."""
+        return self.__name
+
+    def size(self) -> int:
+        """Get decompressed file size (in bytes)."""
+        return self.__size
+
+    def last_use(self) -> float:
+        """Get last use time (Unix timestamp)."""
+        return self.__last_use
+
+    def holders(self) -> dict[str, float]:
+        """Get holders with their acquire time (Unix timestamp)."""
+        return self.__holders
+
+    def touch(self) -> None:
+        """Update the last use time."""
+        self.__last_use = time.time()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dict."""
+        return {
+            self.KEY_NAME: self.__name,
+            self.KEY_SIZE: self.__size,
+            self.KEY_LAST_USE: self.__last_use,
+            self.KEY_HOLDERS: self.__holders,
+        }
+
+
+class Cache:
+    """Shared cache of decompressed inputs."""
+
+    LOCK_NAME = "lock"
+    STATE_JSON_NAME = "state.json"
+    ENTRIES_DIRNAME = "entries"
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_size: int,
+        holder_max_age: float = DEFAULT_HOLDER_MAX_AGE,
+    ) -> None:
+        """Initialize.
+
+        Parameters
+        ----------
+        cache_dir : Path
+            Cache directory
+        max_size : int
+            Maximum size of the decompressed files (in bytes)
+        holder_max_age : float, optional
+            Maximum age of the holders (in s)
+        """
+        self.__cache_dir = cache_dir
+        self.__max_size = max_size
+        self.__holder_max_age = holder_max_age
+
+    def cache_dir(self) -> Path:
+        """Get cache directory."""
+        return self.__cache_dir
+
+    def max_size(self) -> int:
+        """Get maximum size (in bytes)."""
+        return self.__max_size
+
+    def holder_max_age(self) -> float:
+        """Get maximum age of the holders (in s)."""
+        return self.__holder_max_age
+
+    def lock_file(self) -> Path:
+        """Get lock file."""
+        return self.__cache_dir / self.LOCK_NAME
+
+    def state_json(self) -> Path:
+        """Get state JSON file."""
+        return self.__cache_dir / self.STATE_JSON_NAME
+
+    def entries_dir(self) -> Path:
+        """Get entries directory."""
+        return self.__cache_dir / self.ENTRIES_DIRNAME
+
+    def entry_file(self, key: str, name: str) -> Path:
+        """Get the decompressed file of an entry."""
+        return self.entries_dir() / key / name
+
+    def acquire(self, gz_file: Path, holder: str) -> Path:
+        """Get the decompressed copy of the gzipped file and hold it.
+
+        The file is decompressed outside the lock,
+        so that concurrent tasks decompressing other files are not blocked.
+        """
+        key = entry_key(gz_file)
+        with self.__locked_state() as state:
+            if self.__has_entry(state, key):
+                return self.__hold(state, key, holder)
+
+        name = gz_file.name.removesuffix(".gz")
+        tmp_file = self.entries_dir() / f".{key}.{socket.gethostname()}.{os.getpid()}"
+        tmp_file.parent.mkdir(parents=True, exist_ok=True)
+        _LOGGER.debug("Decompress %s in the cache", gz_file)
+        with gz_reader.open_gz(gz_file) as f_in, tmp_file.open("wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+
+        with self.__locked_state() as state:
+            if self.__has_entry(state, key):
+                tmp_file.unlink()
+                return self.__hold(state, key, holder)
+            entry_file = self.entry_file(key, name)
+            entry_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file.replace(entry_file)
+            now = time.time()
+            state[key] = Entry(name, entry_file.stat().st_size, now, {holder: now})
+            self.__evict(state, key)
+            return entry_file
+
+    def release(self, gz_file: Path, holder: str) -> None:
+        """Release the decompressed copy of the gzipped file."""
+        key = entry_key(gz_file)
+        with self.__locked_state() as state:
+            entry = state.get(key)
+            if entry is None:
+                _LOGGER.warning("%s is not in the cache", gz_file)
+                return
+            entry.holders().pop(holder, None)
+            entry.touch()
+            self.__evict(state, None)
+
+    def __has_entry(self, state: dict[str, Entry], key: str) -> bool:
+        """Check if the entry exists, drop it if its file was removed."""
+        entry = state.get(key)
+        if entry is None:
+            return False
+        if not self.entry_file(key, entry.name()).exists():
+            del state[key]
+            return False
+        return True
+
+    def __hold(self, state: dict[str, Entry], key: str, holder: str) -> Path:
+        """Add the holder to the entry, or renew its lease."""
+        entry = state[key]
+        entry.touch()
+        entry.holders()[holder] = entry.last_use()
+        return self.entry_file(key, entry.name())
+
+    def __evict(self, state: dict[str, Entry], kept_key: str | None) -> None:
+        """Evict the least recently used entries without holders.
+
+        The entry of the kept key (just acquired) is never evicted.
+        The holders which are not running or whose lease expired are dropped.
+        """
+        oldest_acquire_time = time.time() - self.__holder_max_age
+        for entry in state.values():
+            for holder, acquire_time in list(entry.holders().items()):
+                if acquire_time < oldest_acquire_time or not _is_running(holder):
+                    del entry.holders()[holder]
+        cache_size = sum(entry.size() for entry in state.values())
+        for key, entry in sorted(state.items(), key=lambda item: item[1].last_use()):
+            if cache_size <= self.__max_size:
+                break
+            if entry.holders() or key == kept_key:
+                continue
+            _LOGGER.debug("Evict %s from the cache", entry.name())
+            shutil.rmtree(self.entries_dir() / key, ignore_errors=True)
+            del state[key]
+            cache_size -= entry.size()
+
+    @contextmanager
+    def __locked_state(self) -> Iterator[dict[str, Entry]]:
+        """Lock the cache and yield its state, written back at exit."""
+        self.__cache_dir.mkdir(parents=True, exist_ok=True)
+        with self.lock_file().open("a") as lock_f:
+            fcntl.flock(lock_f, fcntl.LOCK_EX)
+            try:
+                state = self.__read_state()
+                yield state
+                self.__write_state(state)
+            finally:
+                fcntl.flock(lock_f, fcntl.LOCK_UN)
+
+    def __read_state(self) -> dict[str, Entry]:
+        """Read the cache state."""
+        try:
+            with self.state_json().open() as f_in:
+                state_dict = json.load(f_in)
+        except FileNotFoundError:
+            return {}
+        return {key: Entry.from_dict(value) for key, value in state_dict.items()}
+
+    def __write_state(self, state: dict[str, Entry]) -> None:
+        """Write the cache state atomically."""
+        tmp_state_json = self.state_json().with_suffix(".tmp")
+        with tmp_state_json.open("w") as f_out:
+            json.dump({key: entry.to_dict() for key, entry in state.items()}, f_out)
+        tmp_state_json.replace(self.state_json())
+
+
+def entry_key(gz_file: Path) -> str:
+    """Get the cache key of a gzipped file from its identity."""
+    resolved_gz_file = gz_file.resolve()
+    gz_stat = resolved_gz_file.stat()
+    return hashlib.sha256(
+        (
+            f"{resolved_gz_file}\t{gz_stat.st_size}"
+            f"\t{gz_stat.st_mtime_ns}\t{gz_stat.st_ino}"
+        ).encode(),
+    ).hexdigest()[:32]
+
+
+HOLDER_SEP = ":"
+
+
+def holder_id(hostname: str, pid: int) -> str:
+    """Format a holder ID."""
+    return f"{hostname}{HOLDER_SEP}{pid}"
+
+
+def _is_running(holder: str) -> bool:
+    """Check if the holder is running.
+
+    The holders of another host are considered running
+    (until their lease expires).
+    """
+    hostname, _, pid_str = holder.rpartition(HOLDER_SEP)
+    if hostname != socket.gethostname() or not pid_str.isdigit():
+        return True
+    try:
+        os.kill(int(pid_str), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
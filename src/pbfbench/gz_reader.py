@@ -0,0 +1,278 @@
+"""Gzipped file reader module.
+
+The converters read gzipped files (e.g. `assembly.gfa.gz`)
+with one of the following backends:
+
+* `isal`: multi-threaded ISA-L inflater (optional `isal` package)
+* `zlib-ng`: multi-threaded zlib-ng inflater (optional `zlib-ng` package)
+* `bgzf`: BGZF blocks decompressed in parallel (standard library only)
+* `pigz`: `pigz -dc` pipe (`pigz` command in the PATH)
+* `gzip`: standard library `gzip` module
+
+The backend is chosen with the environment variable `PBFBENCH_GZ_READER`
+(default `auto`), and the number of threads with `PBFBENCH_GZ_THREADS`.
+In `auto` mode, BGZF files use the `bgzf` backend,
+and the other ones the first available backend among
+`isal`, `zlib-ng`, `pigz` and `gzip`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import importlib
+import io
+import logging
+import os
+import shutil
+import struct
+import subprocess
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from enum import StrEnum
+from typing import IO, TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+    from types import ModuleType
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Backends(StrEnum):
+    """Gzipped file reader backends."""
+
+    AUTO = "auto"
+    ISAL = "isal"
+    ZLIB_NG = "zlib-ng"
+    BGZF = "bgzf"
+    PIGZ = "pigz"
+    GZIP = "gzip"
+
+
+BACKEND_ENV_VAR = "PBFBENCH_GZ_READER"
+THREADS_ENV_VAR = "PBFBENCH_GZ_THREADS"
+
+DEFAULT_MAX_THREADS = 4
+
+PIGZ_CMD = "pigz"
+
+_THREADED_MODULES = {
+    Backends.ISAL: "isal.igzip_threaded",
+    Backends.ZLIB_NG: "zlib_ng.gzip_ng_threaded",
+}
+
+# BGZF block header: gzip magic, CM=8, FLG=FEXTRA, ..., XLEN
+# then the `BC` extra subfield giving the block size minus one
+BGZF_MAGIC = b"\x1f\x8b\x08\x04"
+BGZF_HEADER = struct.Struct("<4sIBBHBBHH")
+BGZF_SUBFIELD_ID = b"BC"
+BGZF_XLEN = struct.Struct("<H")
+BGZF_XLEN_OFFSET = 10
+BGZF_TRAILER_SIZE = 8
+
+
+def backend() -> Backends:
+    """Get the backend from the environment.
+
+    Raises
+    ------
+    ValueError
+        Unknown backend.
+    """
+    return Backends(os.environ.get(BACKEND_ENV_VAR, Backends.AUTO))
+
+
+def threads() -> int:
+    """Get the number of decompression threads from the environment."""
+    env_threads = os.environ.get(THREADS_ENV_VAR)
+    if env_threads is not None:
+        return max(1, int(env_threads))
+    return min(DEFAULT_MAX_THREADS, os.cpu_count() or 1)
+
+
+def available_backends() -> list[Backends]:
+    """Get the backends available in the current environment."""
+    return [
+        gz_backend
+        for gz_backend in Backends
+        if gz_backend != Backends.AUTO and is_available(gz_backend)
+    ]
+
+
+def is_available(gz_backend: Backends) -> bool:
+    """Check if the backend is available."""
+    match gz_backend:
+        case Backends.ISAL | Backends.ZLIB_NG:
+            return _threaded_module(gz_backend) is not None
+        case Backends.PIGZ:
+            return shutil.which(PIGZ_CMD) is not None
+        case Backends.AUTO | Backends.BGZF | Backends.GZIP:
+            return True
+
+
+def is_bgzf(gz_file: Path) -> bool:
+    """Check if the gzipped file is BGZF compressed."""
+    with gz_file.open("rb") as f_in:
+        return _bgzf_block_size(f_in.read(BGZF_HEADER.size)) is not None
+
+
+@contextmanager
+def open_gz(
+    gz_file: Path,
+    gz_backend: Backends | None = None,
+) -> Iterator[IO[bytes]]:
+    """Open a gzipped file in binary read mode.
+
+    If the backend is not given, it is read from the environment.
+
+    Raises
+    ------
+    ValueError
+        The backend is not available.
+    subprocess.CalledProcessError
+        The `pigz` command failed.
+    """
+    if gz_backend is None:
+        gz_backend = backend()
+    if gz_backend == Backends.AUTO:
+        gz_backend = _auto_backend(gz_file)
+    elif not is_available(gz_backend):
+        _err_msg = f"The gzip reader backend `{gz_backend}` is not available"
+        raise ValueError(_err_msg)
+    _LOGGER.debug("Read %s with the `%s` backend", gz_file, gz_backend)
+
+    match gz_backend:
+        case Backends.ISAL | Backends.ZLIB_NG:
+            threaded_module = _threaded_module(gz_backend)
+            if threaded_module is None:
+                _err_msg = f"The gzip reader backend `{gz_backend}` is not available"
+                raise ValueError(_err_msg)
+            with threaded_module.open(
+                gz_file,
+                "rb",
+                threads=threads(),
+            ) as f_in:
+                yield f_in
+        case Backends.BGZF:
+            with io.BufferedReader(_BGZFReader(gz_file, threads())) as f_in:
+                yield f_in
+        case Backends.PIGZ:
+            with _pigz_pipe(gz_file) as f_in:
+                yield f_in
+        case Backends.GZIP | Backends.AUTO:
+            with gzip.open(gz_file, "rb") as f_in:
+                yield cast("IO[bytes]", f_in)
+
+
+def _auto_backend(gz_file: Path) -> Backends:
+    """Choose the fastest available backend for the gzipped file."""
+    if is_bgzf(gz_file):
+        return Backends.BGZF
+    for gz_backend in (Backends.ISAL, Backends.ZLIB_NG, Backends.PIGZ):
+        if is_available(gz_backend):
+            return gz_backend
+    return Backends.GZIP
+
+
+def _threaded_module(gz_backend: Backends) -> ModuleType | None:
+    """Import the optional threaded gzip module of the backend."""
+    try:
+        return importlib.import_module(_THREADED_MODULES[gz_backend])
+    except ImportError:
+        return None
+
+
+@contextmanager
+def _pigz_pipe(gz_file: Path) -> Iterator[IO[bytes]]:
+    """Read the decompressed stream of a `pigz -dc` process."""
+    with subprocess.Popen(  # noqa: S603
+        [str(shutil.which(PIGZ_CMD)), "-dc", "-p", str(threads()), str(gz_file)],
+        stdout=subprocess.PIPE,
+    ) as pigz_proc:
+        if pigz_proc.stdout is None:
+            _err_msg = "pigz stdout is not piped"
+            raise RuntimeError(_err_msg)
+        yield pigz_proc.stdout
+        # Drain the pipe if the reader stopped early
+        pigz_proc.stdout.read()
+    if pigz_proc.returncode != 0:
+        raise subprocess.CalledProcessError(pigz_proc.returncode, pigz_proc.args)
+
+
+def _bgzf_block_size(header: bytes) -> int | None:
+    """Get the BGZF block size from its header, None if it is not BGZF."""
+    if len(header) < BGZF_HEADER.size or not header.startswith(BGZF_MAGIC):
+        return None
+    (_, _, _, _, _, subfield_id_1, subfield_id_2, _, block_size_minus_one) = (
+        BGZF_HEADER.unpack_from(header)
+    )
+    if bytes((subfield_id_1, subfield_id_2)) != BGZF_SUBFIELD_ID:
+        return None
+    return block_size_minus_one + 1
+
+
+class _BGZFReader(io.RawIOBase):
+    """Raw reader decompressing BGZF blocks in parallel.
+
+    The blocks are read in batches, one batch per thread,
+    and zlib releases the GIL while inflating.
+    """
+
+    BLOCKS_PER_THREAD = 16
+
+    def __init__(self, bgzf_file: Path, number_of_threads: int) -> None:
+        """Initialize."""
+        super().__init__()
+        self.__f_in = bgzf_file.open("rb")
+        self.__executor = ThreadPoolExecutor(max_workers=number_of_threads)
+        self.__batch_size = number_of_threads * self.BLOCKS_PER_THREAD
+        self.__buffer = memoryview(b"")
+        self.__eof = False
+
+    def readable(self) -> bool:
+        """Return True."""
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore[override]
+        """Read decompressed bytes into the buffer."""
+        while not self.__buffer and not self.__eof:
+            self.__buffer = memoryview(b"".join(self.__read_batch()))
+        size = min(len(buffer), len(self.__buffer))
+        buffer[:size] = self.__buffer[:size]
+        self.__buffer = self.__buffer[size:]
+        return size
+
+    def close(self) -> None:
+        """Close the file and stop the threads."""
+        if not self.closed:
+            self.__executor.shutdown()
+            self.__f_in.close()
+        super().close()
+
+    def __read_batch(self) -> Iterator[bytes]:
+        """Read and decompress a batch of blocks."""
+        compressed_blocks: list[bytes] = []
+        while len(compressed_blocks) < self.__batch_size:
+            header = self.__f_in.read(BGZF_HEADER.size)
+            if not header:
+                self.__eof = True
+                break
+            block_size = _bgzf_block_size(header)
+            if block_size is None:
+                _err_msg = f"Invalid BGZF block in {self.__f_in.name}"
+                raise OSError(_err_msg)
+            compressed_blocks.append(
+                header + self.__f_in.read(block_size - BGZF_HEADER.size),
+            )
+        return self.__executor.map(_inflate_bgzf_block, compressed_blocks)
+
+
+def _inflate_bgzf_block(block: bytes) -> bytes:
+    """Decompress one BGZF block."""
+    (extra_length,) = BGZF_XLEN.unpack_from(block, BGZF_XLEN_OFFSET)
+    return zlib.decompress(
+        block[BGZF_XLEN_OFFSET + BGZF_XLEN.size + extra_length : -BGZF_TRAILER_SIZE],
+        wbits=-zlib.MAX_WBITS,
+    )
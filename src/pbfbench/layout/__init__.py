@@ -0,0 +1 @@
+"""Samples layout module."""
@@ -0,0 +1,12 @@
+"""Samples layout application."""
+
+import typer
+
+import pbfbench.layout.migrate as layout_migrate
+
+APP = typer.Typer(
+    name="layout",
+    help="Manage the sample directories layout",
+    rich_markup_mode="rich",
+)
+APP.command()(layout_migrate.migrate)
@@ -0,0 +1,111 @@
+"""Samples layout migration."""
+
+# Due to typer usage:
+# ruff: noqa: TC001, TC003, UP007, FBT001, FBT002, PLR0913
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
+
+import typer
+
+import pbfbench.experiment.file_system as exp_fs
+import pbfbench.samples.file_system as smp_fs
+from pbfbench import root_logging
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Arguments:
+    """Migration arguments."""
+
+    DATA_DIR = typer.Argument(help="Data directory")
+    SAMPLES_LAYOUT = typer.Argument(help="Target samples layout")
+
+
+def migrate(
+    data_dir: Annotated[Path, Arguments.DATA_DIR],
+    samples_layout: Annotated[exp_fs.SamplesLayout, Arguments.SAMPLES_LAYOUT],
+    debug: Annotated[bool, root_logging.OPT_DEBUG] = False,
+) -> None:
+    """Migrate the sample directories of a data directory to another layout.
+
+    On a new data directory (without experiment), only the layout is written:
+    this is the way to start a data directory in the sharded layout.
+    """
+    root_logging.init_logger(_LOGGER, "Migrating the samples layout", debug)
+    current_layout = exp_fs.read_samples_layout(data_dir)
+    if current_layout == samples_layout:
+        _LOGGER.info("The data directory is already in the %s layout", samples_layout)
+        return
+
+    exp_dirs = list(iter_experiment_dirs(data_dir))
+    sample_dirnames: list[str] = []
+    if exp_dirs:
+        samples_tsv = data_dir / exp_fs.DataManager.SAMPLES_TSV_NAME
+        with smp_fs.TSVReader.open(samples_tsv) as reader:
+            sample_dirnames = [item.exp_sample_id() for item in reader]
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for exp_dir in exp_dirs:
+        number_of_moved_samples = move_sample_dirs(
+            exp_dir,
+            sample_dirnames,
+            current_layout,
+            samples_layout,
+        )
+        _LOGGER.info("Moved %d samples in %s", number_of_moved_samples, exp_dir)
+
+    exp_fs.write_samples_layout(data_dir, samples_layout)
+    _LOGGER.info("The data directory is now in the %s layout", samples_layout)
+
+
+def iter_experiment_dirs(data_dir: Path) -> Iterator[Path]:
+    """Iterate over the experiment directories of a data directory.
+
+    The experiment directories are at `DATA_DIR/TOPIC/TOOL/EXP_NAME`
+    and contain the experiment configuration file.
+    """
+    for config_yaml in sorted(
+        data_dir.glob(f"*/*/*/{exp_fs.ManagerBase.CONFIG_YAML_NAME}"),
+    ):
+        yield config_yaml.parent
+
+
+def move_sample_dirs(
+    exp_dir: Path,
+    sample_dirnames: list[str],
+    src_layout: exp_fs.SamplesLayout,
+    dst_layout: exp_fs.SamplesLayout,
+) -> int:
+    """Move the sample directories from one layout to another.
+
+    Returns
+    -------
+    int
+        Number of moved sample directories.
+    """
+    number_of_moved_samples = 0
+    for sample_dirname in sample_dirnames:
+        src_sample_dir = exp_fs.sample_dir_in_exp_dir(
+            exp_dir,
+            sample_dirname,
+            src_layout,
+        )
+        if not src_sample_dir.exists():
+            continue
+        dst_sample_dir = exp_fs.sample_dir_in_exp_dir(
+            exp_dir,
+            sample_dirname,
+            dst_layout,
+        )
+        dst_sample_dir.parent.mkdir(parents=True, exist_ok=True)
+        src_sample_dir.rename(dst_sample_dir)
+        exp_fs.remove_empty_shard_dirs(exp_dir, src_sample_dir)
+        number_of_moved_samples += 1
+    return number_of_moved_samples
@@ -0,0 +1,173 @@
+"""Lazily loaded sub-applications.
+
+The sub-applications are registered from a static table
+(command name, help and module name),
+and their module is imported only when their command is resolved.
+The help listing uses the static table, so it does not import the modules.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+import typer
+import typer.core
+import typer.main
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import click
+
+    import pbfbench.abc.tool.description as abc_tool_desc
+    import pbfbench.abc.topic.description as abc_topic_desc
+
+
+class SubApp:
+    """Lazily loaded sub-application."""
+
+    APP_ATTRIBUTE = "APP"
+
+    @classmethod
+    def from_topic(
+        cls,
+        topic_description: abc_topic_desc.Description,
+        module_name: str,
+        rich_help_panel: str | None = None,
+    ) -> SubApp:
+        """Get the sub-application of a topic."""
+        return cls(
+            topic_description.cmd(),
+            f"Subcommand for topic `{topic_description.name()}`",
+            module_name,
+            rich_help_panel,
+        )
+
+    @classmethod
+    def from_tool(
+        cls,
+        tool_description: abc_tool_desc.Description,
+        module_name: str,
+    ) -> SubApp:
+        """Get the sub-application of a tool."""
+        return cls(
+            tool_description.cmd(),
+            f"Subcommand for tool `{tool_description.name()}`",
+            module_name,
+        )
+
+    def __init__(
+        self,
+        name: str,
+        help_str: str,
+        module_name: str,
+        rich_help_panel: str | None = None,
+    ) -> None:
+        """Initialize.
+
+        Parameters
+        ----------
+        name : str
+            Command name
+        help_str : str
+            Command help
+        module_name : str
+            Name of the module defining the `APP` Typer application
+        rich_help_panel : str | None, optional
+            Help panel of the command
+        """
+        self.__name = name
+        self.__help = help_str
+        self.__module_name = module_name
+        self.__rich_help_panel = rich_help_panel
+
+    def name(self) -> str:
+        """Get command name."""
+        return self.__name
+
+    def help(self) -> str:
+        """Get command help."""
+        return self.__help
+
+    def module_name(self) -> str:
+        """Get module name."""
+        return self.__module_name
+
+    def rich_help_panel(self) -> str | None:
+        """Get help panel."""
+        return self.__rich_help_panel
+
+    def placeholder(self) -> click.Command:
+        """Get the command shown in the help listing, without importing the module."""
+        return typer.core.TyperGroup(
+            name=self.__name,
+            help=self.__help,
+            rich_help_panel=self.__rich_help_panel,
+        )
+
+    def load(self) -> click.Command:
+        """Import the module and get the command of its application."""
+        app: typer.Typer = getattr(
+            importlib.import_module(self.__module_name),
+            self.APP_ATTRIBUTE,
+        )
+        command = typer.main.get_group(app)
+        command.name = self.__name
+        command.rich_help_panel = self.__rich_help_panel
+        return command
+
+
+class Group(typer.core.TyperGroup):
+    """Typer group with lazily loaded sub-applications."""
+
+    @classmethod
+    def sub_apps(cls) -> tuple[SubApp, ...]:
+        """Get the lazily loaded sub-applications."""
+        return ()
+
+    def __init__(self, **attrs: object) -> None:
+        """Initialize."""
+        super().__init__(**attrs)  # type: ignore[arg-type]
+        self.__sub_apps = {sub_app.name(): sub_app for sub_app in self.sub_apps()}
+        self.__loaded_commands: dict[str, click.Command] = {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        """List the commands, the lazy ones at the end."""
+        return [*super().list_commands(ctx), *self.__sub_apps]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        """Get the command, a placeholder if the lazy one is not loaded yet."""
+        command = super().get_command(ctx, cmd_name)
+        if command is not None or cmd_name not in self.__sub_apps:
+            return command
+        if cmd_name in self.__loaded_commands:
+            return self.__loaded_commands[cmd_name]
+        return self.__sub_apps[cmd_name].placeholder()
+
+    def resolve_command(
+        self,
+        ctx: click.Context,
+        args: list[str],
+    ) -> tuple[str | None, click.Command | None, list[str]]:
+        """Load the lazy command before resolving it."""
+        if (
+            args
+            and args[0] in self.__sub_apps
+            and args[0] not in self.__loaded_commands
+        ):
+            self.__loaded_commands[args[0]] = self.__sub_apps[args[0]].load()
+        return super().resolve_command(ctx, args)
+
+
+def group_type(sub_apps: Iterable[SubApp]) -> type[Group]:
+    """Get a Typer group type with the lazily loaded sub-applications."""
+    sub_apps_tuple = tuple(sub_apps)
+
+    class _Group(Group):
+        @classmethod
+        def sub_apps(cls) -> tuple[SubApp, ...]:
+            """Get the lazily loaded sub-applications."""
+            return sub_apps_tuple
+
+    return _Group
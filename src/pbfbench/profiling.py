@@ -0,0 +1,244 @@
+"""Command profiling module.
+
+The root `--profile` option runs the selected command under a profiler:
+
+* `cpu`: `cProfile`, the statistics are written in a `.pstats` file
+  (e.g. for `snakeviz` or `python -m pstats`)
+  with a summary of the top functions by cumulative time
+* `mem`: `tracemalloc`, the summary gives the peak traced memory
+  and the top allocation sites of the memory still allocated at the end
+
+The profiles are written in the current directory,
+or in the experiment directory once an experiment command has checked it
+(see `set_output_dir`).
+Only the main process is profiled (not the process pools nor the sbatch jobs).
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import tracemalloc
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import typer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+DEFAULT_TOP = 30
+
+_MIB = 1024 * 1024
+
+
+class Modes(StrEnum):
+    """Profiling modes."""
+
+    CPU = "cpu"
+    MEM = "mem"
+
+
+class Profiler(ABC):
+    """Profiler base class."""
+
+    def __init__(self, top: int) -> None:
+        """Initialize.
+
+        Parameters
+        ----------
+        top : int
+            Number of entries in the summary
+        """
+        self._top = top
+
+    def top(self) -> int:
+        """Get the number of entries in the summary."""
+        return self._top
+
+    @abstractmethod
+    def start(self) -> None:
+        """Start profiling."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop profiling."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def write(self, file_stem: Path) -> Iterator[Path]:
+        """Write the profile files, and iterate over them."""
+        raise NotImplementedError
+
+
+class CPUProfiler(Profiler):
+    """cProfile profiler."""
+
+    PSTATS_SUFFIX = ".pstats"
+    SUMMARY_SUFFIX = "_cpu.txt"
+
+    SORT_KEY = pstats.SortKey.CUMULATIVE
+
+    def __init__(self, top: int) -> None:
+        """Initialize."""
+        super().__init__(top)
+        self.__profile = cProfile.Profile()
+
+    def start(self) -> None:
+        """Start profiling."""
+        self.__profile.enable()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        self.__profile.disable()
+
+    def write(self, file_stem: Path) -> Iterator[Path]:
+        """Write the pstats file and the top functions summary."""
+        pstats_file = file_stem.with_name(file_stem.name + self.PSTATS_SUFFIX)
+        self.__profile.dump_stats(pstats_file)
+        yield pstats_file
+
+        summary_stream = io.StringIO()
+        pstats.Stats(self.__profile, stream=summary_stream).sort_stats(
+            self.SORT_KEY,
+        ).print_stats(self._top)
+        summary_file = file_stem.with_name(file_stem.name + self.SUMMARY_SUFFIX)
+        summary_file.write_text(summary_stream.getvalue())
+        yield summary_file
+
+
+class MemoryProfiler(Profiler):
+    """tracemalloc profiler."""
+
+    SUMMARY_SUFFIX = "_mem.txt"
+
+    # Allocations of the profiler itself and of the import machinery
+    IGNORED_FILENAME_PATTERNS = (
+        tracemalloc.__file__,
+        "<frozen importlib._bootstrap>",
+        "<frozen importlib._bootstrap_external>",
+        "<unknown>",
+    )
+
+    def __init__(self, top: int) -> None:
+        """Initialize."""
+        super().__init__(top)
+        self.__peak_size = 0
+        self.__snapshot: tracemalloc.Snapshot | None = None
+
+    def start(self) -> None:
+        """Start tracing the memory allocations."""
+        tracemalloc.start()
+
+    def stop(self) -> None:
+        """Take the snapshot and stop tracing."""
+        _, self.__peak_size = tracemalloc.get_traced_memory()
+        self.__snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(inclusive=False, filename_pattern=pattern)
+                for pattern in self.IGNORED_FILENAME_PATTERNS
+            ],
+        )
+        tracemalloc.stop()
+
+    def write(self, file_stem: Path) -> Iterator[Path]:
+        """Write the peak and top allocation sites summary."""
+        summary_file = file_stem.with_name(file_stem.name + self.SUMMARY_SUFFIX)
+        top_stats = (
+            self.__snapshot.statistics("lineno")[: self._top]
+            if self.__snapshot is not None
+            else []
+        )
+        with summary_file.open("w") as f_out:
+            f_out.write(f"Peak traced memory: {self.__peak_size / _MIB:.1f} MiB\n\n")
+            f_out.write(f"Top {self._top} allocation sites (still allocated):\n")
+            for stat in top_stats:
+                f_out.write(f"{stat}\n")
+        yield summary_file
+
+
+class Session:
+    """Profiling session of one command."""
+
+    FILE_PREFIX = "profile_"
+
+    @classmethod
+    def new(cls, mode: Modes, top: int, output_dir: Path | None) -> Session:
+        """Create a new session for the mode."""
+        match mode:
+            case Modes.CPU:
+                return cls(CPUProfiler(top), output_dir)
+            case Modes.MEM:
+                return cls(MemoryProfiler(top), output_dir)
+
+    def __init__(self, profiler: Profiler, output_dir: Path | None) -> None:
+        """Initialize.
+
+        Parameters
+        ----------
+        profiler : Profiler
+            Profiler
+        output_dir : Path | None
+            Output directory, if None the experiment directory or the current one
+        """
+        self.__profiler = profiler
+        self.__user_output_dir = output_dir
+        self.__exp_output_dir: Path | None = None
+        self.__date_str = datetime.now(tz=UTC).strftime("%Y-%m-%d_%H-%M-%S")
+
+    def profiler(self) -> Profiler:
+        """Get profiler."""
+        return self.__profiler
+
+    def output_dir(self) -> Path:
+        """Get output directory."""
+        if self.__user_output_dir is not None:
+            return self.__user_output_dir
+        if self.__exp_output_dir is not None:
+            return self.__exp_output_dir
+        return Path.cwd()
+
+    def set_exp_output_dir(self, exp_dir: Path) -> None:
+        """Set the experiment directory as output directory."""
+        self.__exp_output_dir = exp_dir
+
+    def start(self) -> None:
+        """Start the profiler."""
+        self.__profiler.start()
+
+    def stop(self) -> None:
+        """Stop the profiler and write its files."""
+        self.__profiler.stop()
+        output_dir = self.output_dir()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for profile_file in self.__profiler.write(
+            output_dir / f"{self.FILE_PREFIX}{self.__date_str}",
+        ):
+            typer.echo(f"Profile written: {profile_file}", err=True)
+
+
+_CURRENT_SESSION: ContextVar[Session | None] = ContextVar(
+    "pbfbench_profiling_session",
+    default=None,
+)
+
+
+def start(mode: Modes, top: int, output_dir: Path | None = None) -> Session:
+    """Start a profiling session, it is stopped with its `stop` method."""
+    session = Session.new(mode, top, output_dir)
+    _CURRENT_SESSION.set(session)
+    session.start()
+    return session
+
+
+def set_output_dir(exp_dir: Path) -> None:
+    """Write the profiles of the active session in the experiment directory."""
+    session = _CURRENT_SESSION.get()
+    if session is not None:
+        session.set_exp_output_dir(exp_dir)
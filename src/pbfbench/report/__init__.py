@@ -0,0 +1 @@
+"""Experiment reports."""
@@ -0,0 +1,14 @@
+"""Report application."""
+
+import typer
+
+import pbfbench.report.progress as report_progress
+import pbfbench.report.resources as report_resources
+
+APP = typer.Typer(
+    name="report",
+    help="Reports on the experiment runs",
+    rich_markup_mode="rich",
+)
+APP.command(name="resources")(report_resources.resources)
+APP.command(name="progress")(report_progress.progress)
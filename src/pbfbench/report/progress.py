@@ -0,0 +1,164 @@
+"""Live progress of running experiments.
+
+Several working experiment directories can be watched at once,
+while their `run` commands are waiting for the Slurm tasks.
+Each update reads the new lines of each status log
+and calls `squeue` once for all the array jobs.
+"""
+
+# Due to typer usage:
+# ruff: noqa: TC001, TC003, UP007, FBT001, FBT002, PLR0913
+
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+from typing import Annotated
+
+import rich.live
+import typer
+
+import pbfbench.experiment.file_system as exp_fs
+import pbfbench.experiment.run as exp_run
+import pbfbench.slurm.file_system as slurm_fs
+import pbfbench.slurm.progress as slurm_progress
+import pbfbench.slurm.shell as slurm_sh
+import pbfbench.slurm.status as slurm_status
+from pbfbench import root_logging
+
+_LOGGER = logging.getLogger(__name__)
+
+SBATCH_SCRIPT_GLOB = "*_sbatch.sh"
+
+
+class Arguments:
+    """Progress arguments."""
+
+    WORK_EXP_DIRS = typer.Argument(
+        help="Working experiment directories (`WORK_DIR/TOPIC/TOOL/EXP_NAME`)",
+    )
+
+
+class Options:
+    """Progress options."""
+
+    INTERVAL = typer.Option(min=1, help="Seconds between the status log reads")
+    SQUEUE_INTERVAL = typer.Option(min=1, help="Seconds between the `squeue` calls")
+    ONCE = typer.Option(help="Print the progress once and exit")
+
+
+class WatchedExperiment:
+    """Running experiment watched from its working directory."""
+
+    def __init__(self, work_exp_dir: Path) -> None:
+        """Initialize.
+
+        Raises
+        ------
+        FileNotFoundError
+            No sbatch script in the experiment directory.
+        """
+        self.__logs_dir = work_exp_dir / exp_fs.WorkManager.TMP_SLURM_LOG_DIR_NAME
+        sbatch_scripts = sorted(
+            (work_exp_dir / exp_fs.WorkManager.SCRIPT_DIR_NAME).glob(
+                SBATCH_SCRIPT_GLOB,
+            ),
+        )
+        if not sbatch_scripts:
+            _err_msg = f"No sbatch script in {work_exp_dir}"
+            raise FileNotFoundError(_err_msg)
+        self.__progress = slurm_progress.ExperimentProgress(
+            "/".join(work_exp_dir.parts[-3:]),
+            slurm_sh.SbatchCommentLinesBuilder.number_of_array_tasks(
+                sbatch_scripts[-1],
+            ),
+        )
+        self.__status_log_tailer = slurm_status.StatusLogTailer(
+            self.__logs_dir / slurm_fs.LogFiles.STATUS_LOG_FILENAME,
+        )
+        self.__ended = False
+
+    def progress(self) -> slurm_progress.ExperimentProgress:
+        """Get experiment progress."""
+        return self.__progress
+
+    def ended(self) -> bool:
+        """Check if the run stopped waiting for the tasks."""
+        return self.__ended
+
+    def update(self) -> None:
+        """Read the array job id and the new task statuses.
+
+        The run removes the array job id file once all the tasks ended.
+        """
+        array_job_id_file = self.__logs_dir / slurm_fs.LogFiles.ARRAY_JOB_ID_FILENAME
+        if self.__progress.array_job_id() is None:
+            if array_job_id_file.exists():
+                self.__progress.set_array_job_id(array_job_id_file.read_text().strip())
+        elif not array_job_id_file.exists():
+            self.__ended = True
+        for task_status in self.__status_log_tailer.read_new():
+            self.__progress.add_finished(
+                task_status.start_time(),
+                task_status.end_time(),
+                exp_run.slurm_status_equals_an_exp_sample_error(task_status.status()),
+            )
+        if not self.__progress.remaining():
+            self.__ended = True
+
+
+def progress(
+    work_exp_dirs: Annotated[list[Path], Arguments.WORK_EXP_DIRS],
+    interval: Annotated[int, Options.INTERVAL] = 10,
+    squeue_interval: Annotated[int, Options.SQUEUE_INTERVAL] = 60,
+    once: Annotated[bool, Options.ONCE] = False,
+    debug: Annotated[bool, root_logging.OPT_DEBUG] = False,
+) -> None:
+    """Watch the Slurm tasks of running experiments."""
+    root_logging.init_logger(_LOGGER, "Watching the experiments progress", debug)
+    try:
+        watched_experiments = [
+            WatchedExperiment(work_exp_dir) for work_exp_dir in work_exp_dirs
+        ]
+    except FileNotFoundError as error:
+        _LOGGER.critical(str(error))
+        raise typer.Exit(1) from error
+
+    experiments_progress = [
+        watched_exp.progress() for watched_exp in watched_experiments
+    ]
+    _update(watched_experiments)
+    if once:
+        root_logging.CONSOLE.print(slurm_progress.progress_table(experiments_progress))
+        return
+
+    with rich.live.Live(
+        slurm_progress.progress_table(experiments_progress),
+        console=root_logging.CONSOLE,
+        auto_refresh=False,
+    ) as live:
+        last_squeue_time = time.monotonic()
+        while not all(watched_exp.ended() for watched_exp in watched_experiments):
+            time.sleep(interval)
+            if time.monotonic() - last_squeue_time >= squeue_interval:
+                _update(watched_experiments)
+                last_squeue_time = time.monotonic()
+            else:
+                for watched_exp in watched_experiments:
+                    watched_exp.update()
+            live.update(
+                slurm_progress.progress_table(experiments_progress),
+                refresh=True,
+            )
+
+
+def _update(watched_experiments: list[WatchedExperiment]) -> None:
+    """Update the experiments and their queue counts."""
+    for watched_exp in watched_experiments:
+        watched_exp.update()
+    slurm_progress.update_queue_counts(
+        watched_exp.progress()
+        for watched_exp in watched_experiments
+        if not watched_exp.ended()
+    )
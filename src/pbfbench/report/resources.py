@@ -0,0 +1,445 @@
+"""Cluster resources report.
+
+The `sbatch_stats.psv` files of the sample jobs (in the sample directories
+or in their logs archive) are ingested in a columnar table,
+one row per sample job, with the CPU efficiency (TotalCPU / Elapsed x AllocCPUS),
+the memory efficiency (MaxRSS / ReqMem), the queue wait and the job state.
+The table is summarised per experiment,
+and the outlier jobs (failed, low CPU or memory efficiency,
+memory close to the limit) are listed.
+"""
+
+# Due to typer usage:
+# ruff: noqa: FBT002, PLR0913, PLR0917
+
+from __future__ import annotations
+
+import logging
+from enum import StrEnum
+from itertools import batched
+from pathlib import Path
+from typing import Annotated
+
+import pandas as pd
+import rich.table
+import typer
+
+import pbfbench.experiment.file_system as exp_fs
+import pbfbench.layout.migrate as layout_migrate
+import pbfbench.samples.file_system as smp_fs
+import pbfbench.samples.logs_archive as smp_logs_archive
+import pbfbench.slurm.stats as slurm_stats
+from pbfbench import root_logging
+
+_LOGGER = logging.getLogger(__name__)
+
+SAMPLES_CHUNK_SIZE = 1000
+
+TSV_SEP = "\t"
+
+RESOURCES_TSV_NAME = Path("resources.tsv")
+SUMMARY_TSV_NAME = Path("resources_summary.tsv")
+OUTLIERS_TSV_NAME = Path("resources_outliers.tsv")
+
+_GIBI = 1 << 30
+
+
+class Columns(StrEnum):
+    """Resources table columns."""
+
+    TOPIC = "topic"
+    TOOL = "tool"
+    EXPERIMENT = "experiment"
+    SAMPLE = "sample"
+    JOB_ID = "job_id"
+    STATE = "state"
+    FAILED = "failed"
+    ALLOC_CPUS = "alloc_cpus"
+    ELAPSED = "elapsed_s"
+    TOTAL_CPU = "total_cpu_s"
+    QUEUE_WAIT = "queue_wait_s"
+    MAX_RSS = "max_rss_bytes"
+    REQ_MEM = "req_mem_bytes"
+    CPU_EFFICIENCY = "cpu_efficiency"
+    MEM_EFFICIENCY = "mem_efficiency"
+
+
+EXPERIMENT_COLUMNS = [Columns.TOPIC, Columns.TOOL, Columns.EXPERIMENT]
+
+
+class OutlierReasons(StrEnum):
+    """Outlier reasons."""
+
+    FAILED = "failed"
+    LOW_CPU = "low_cpu"
+    LOW_MEM = "low_mem"
+    HIGH_MEM = "high_mem"
+
+
+OUTLIER_REASONS_COLUMN = "reasons"
+OUTLIER_REASONS_SEP = ","
+
+
+class Arguments:
+    """Report arguments."""
+
+    DATA_DIR = typer.Argument(help="Data directory")
+
+
+class Options:
+    """Report options."""
+
+    TOPIC = typer.Option(help="Only the experiments of the topic (e.g. `ASSEMBLY`)")
+    TOOL = typer.Option(help="Only the experiments of the tool (e.g. `UNICYCLER`)")
+    EXPERIMENT = typer.Option(help="Only the experiments with this name")
+    JOBS = typer.Option(
+        "--jobs",
+        "-j",
+        min=1,
+        help="Maximum number of processes reading the stats files",
+    )
+    OUTPUT_DIR = typer.Option(
+        help="Directory where the table, summary and outliers TSV files are written",
+    )
+    MIN_CPU_EFFICIENCY = typer.Option(help="Outlier below this CPU efficiency")
+    MIN_MEM_EFFICIENCY = typer.Option(help="Outlier below this memory efficiency")
+    MAX_MEM_EFFICIENCY = typer.Option(help="Outlier above this memory efficiency")
+    MAX_SHOWN_OUTLIERS = typer.Option(help="Maximum number of printed outliers")
+
+
+def resources(
+    data_dir: Annotated[Path, Arguments.DATA_DIR],
+    topic: Annotated[str | None, Options.TOPIC] = None,
+    tool: Annotated[str | None, Options.TOOL] = None,
+    experiment: Annotated[str | None, Options.EXPERIMENT] = None,
+    jobs: Annotated[int, Options.JOBS] = 1,
+    output_dir: Annotated[Path | None, Options.OUTPUT_DIR] = None,
+    min_cpu_efficiency: Annotated[float, Options.MIN_CPU_EFFICIENCY] = 0.5,
+    min_mem_efficiency: Annotated[float, Options.MIN_MEM_EFFICIENCY] = 0.25,
+    max_mem_efficiency: Annotated[float, Options.MAX_MEM_EFFICIENCY] = 0.9,
+    max_shown_outliers: Annotated[int, Options.MAX_SHOWN_OUTLIERS] = 20,
+    debug: Annotated[bool, root_logging.OPT_DEBUG] = False,
+) -> None:
+    """Report the cluster resources used by the sample jobs."""
+    root_logging.init_logger(_LOGGER, "Reporting the cluster resources", debug)
+    exp_dirs = experiment_dirs(data_dir, topic, tool, experiment)
+    if not exp_dirs:
+        _LOGGER.error("No experiment found in %s", data_dir)
+        raise typer.Exit(1)
+
+    table = read_resources_table(data_dir, exp_dirs, jobs)
+    _LOGGER.info(
+        "Read the stats of %d sample jobs in %d experiments",
+        len(table),
+        len(exp_dirs),
+    )
+    if table.empty:
+        return
+    summary_table = summary(table)
+    outliers_table = outliers(
+        table,
+        min_cpu_efficiency,
+        min_mem_efficiency,
+        max_mem_efficiency,
+    )
+
+    root_logging.CONSOLE.print(_rich_summary(summary_table))
+    _LOGGER.info("Outlier sample jobs: %d", len(outliers_table))
+    if not outliers_table.empty:
+        root_logging.CONSOLE.print(
+            _rich_outliers(outliers_table.head(max_shown_outliers)),
+        )
+
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for tsv_name, tsv_table in (
+            (RESOURCES_TSV_NAME, table),
+            (SUMMARY_TSV_NAME, summary_table),
+            (OUTLIERS_TSV_NAME, outliers_table),
+        ):
+            tsv_table.to_csv(output_dir / tsv_name, sep=TSV_SEP, index=False)
+        _LOGGER.info("Report TSV files written in %s", output_dir)
+
+
+def experiment_dirs(
+    data_dir: Path,
+    topic: str | None = None,
+    tool: str | None = None,
+    experiment: str | None = None,
+) -> list[Path]:
+    """Get the experiment directories of the scope."""
+    return [
+        exp_dir
+        for exp_dir in layout_migrate.iter_experiment_dirs(data_dir)
+        if (topic is None or exp_dir.parent.parent.name == topic)
+        and (tool is None or exp_dir.parent.name == tool)
+        and (experiment is None or exp_dir.name == experiment)
+    ]
+
+
+def read_resources_table(
+    data_dir: Path,
+    exp_dirs: list[Path],
+    jobs: int,
+) -> pd.DataFrame:
+    """Read the sample job stats of the experiments in a table.
+
+    The samples are read by chunks, in at most `jobs` processes.
+    """
+    samples_layout = exp_fs.read_samples_layout(data_dir)
+    with smp_fs.TSVReader.open(
+        data_dir / exp_fs.DataManager.SAMPLES_TSV_NAME,
+    ) as reader:
+        sample_dirnames = [sample_item.exp_sample_id() for sample_item in reader]
+
+    chunks = [
+        (exp_dir, list(chunk_sample_dirnames), samples_layout)
+        for exp_dir in exp_dirs
+        for chunk_sample_dirnames in batched(
+            sample_dirnames,
+            SAMPLES_CHUNK_SIZE,
+            strict=False,
+        )
+    ]
+    if jobs <= 1:
+        chunk_tables = [read_chunk_stats(*chunk) for chunk in chunks]
+    else:
+        with root_logging.process_pool(jobs) as executor:
+            chunk_tables = list(
+                executor.map(read_chunk_stats, *zip(*chunks, strict=True)),
+            )
+
+    table = pd.DataFrame(
+        {
+            column: [value for chunk in chunk_tables for value in chunk[column]]
+            for column in Columns
+        },
+    )
+    return table.astype(
+        {
+            Columns.FAILED: "boolean",
+            **{
+                column: float
+                for column in Columns
+                if column
+                not in {
+                    *EXPERIMENT_COLUMNS,
+                    Columns.SAMPLE,
+                    Columns.JOB_ID,
+                    Columns.STATE,
+                    Columns.FAILED,
+                }
+            },
+        },
+    )
+
+
+def read_chunk_stats(
+    exp_dir: Path,
+    sample_dirnames: list[str],
+    samples_layout: exp_fs.SamplesLayout,
+) -> dict[Columns, list]:
+    """Read the job stats of a chunk of samples of an experiment in columns.
+
+    The samples without stats (not run) are skipped.
+    """
+    columns: dict[Columns, list] = {column: [] for column in Columns}
+    for sample_dirname in sample_dirnames:
+        psv_text = read_sample_psv(
+            smp_fs.Manager(
+                exp_fs.sample_dir_in_exp_dir(exp_dir, sample_dirname, samples_layout),
+            ),
+        )
+        if psv_text is None:
+            continue
+        try:
+            job_stats = slurm_stats.JobStats.from_psv(psv_text)
+        except ValueError as error:
+            _LOGGER.warning(
+                "Ignore the stats of %s in %s: %s",
+                sample_dirname,
+                exp_dir,
+                error,
+            )
+            continue
+        # The resources of the jobs which did not end (e.g. running) are partial
+        terminated = job_stats.terminated()
+        for column, value in (
+            (Columns.TOPIC, exp_dir.parent.parent.name),
+            (Columns.TOOL, exp_dir.parent.name),
+            (Columns.EXPERIMENT, exp_dir.name),
+            (Columns.SAMPLE, sample_dirname),
+            (Columns.JOB_ID, job_stats.job_id()),
+            (Columns.STATE, job_stats.state()),
+            (Columns.FAILED, job_stats.failed()),
+            (Columns.ALLOC_CPUS, job_stats.alloc_cpus()),
+            (Columns.ELAPSED, job_stats.elapsed() if terminated else None),
+            (Columns.TOTAL_CPU, job_stats.total_cpu() if terminated else None),
+            (Columns.QUEUE_WAIT, job_stats.queue_wait()),
+            (Columns.MAX_RSS, job_stats.max_rss() if terminated else None),
+            (Columns.REQ_MEM, job_stats.req_mem()),
+            (
+                Columns.CPU_EFFICIENCY,
+                job_stats.cpu_efficiency() if terminated else None,
+            ),
+            (
+                Columns.MEM_EFFICIENCY,
+                job_stats.mem_efficiency() if terminated else None,
+            ),
+        ):
+            columns[column].append(value)
+    return columns
+
+
+def read_sample_psv(sample_fs_manager: smp_fs.Manager) -> str | None:
+    """Read the sbatch stats of a sample, in its directory or its logs archive."""
+    try:
+        return sample_fs_manager.sbatch_stats_psv().read_text()
+    except FileNotFoundError:
+        pass
+    with smp_logs_archive.Reader.open(sample_fs_manager) as logs_archive:
+        try:
+            return logs_archive.read_bytes(
+                str(sample_fs_manager.SBATCH_STATS_PSV_NAME),
+            ).decode()
+        except KeyError:
+            return None
+
+
+def summary(table: pd.DataFrame) -> pd.DataFrame:
+    """Summarise the resources per experiment."""
+    return (
+        table.groupby(EXPERIMENT_COLUMNS, sort=True)
+        .agg(
+            jobs=(Columns.JOB_ID, "count"),
+            failure_rate=(Columns.FAILED, "mean"),
+            cpu_efficiency_median=(Columns.CPU_EFFICIENCY, "median"),
+            cpu_efficiency_mean=(Columns.CPU_EFFICIENCY, "mean"),
+            mem_efficiency_median=(Columns.MEM_EFFICIENCY, "median"),
+            mem_efficiency_max=(Columns.MEM_EFFICIENCY, "max"),
+            elapsed_median_s=(Columns.ELAPSED, "median"),
+            elapsed_max_s=(Columns.ELAPSED, "max"),
+            queue_wait_median_s=(Columns.QUEUE_WAIT, "median"),
+            queue_wait_max_s=(Columns.QUEUE_WAIT, "max"),
+            max_rss_max_bytes=(Columns.MAX_RSS, "max"),
+            req_mem_median_bytes=(Columns.REQ_MEM, "median"),
+        )
+        .reset_index()
+    )
+
+
+def outliers(
+    table: pd.DataFrame,
+    min_cpu_efficiency: float,
+    min_mem_efficiency: float,
+    max_mem_efficiency: float,
+) -> pd.DataFrame:
+    """Get the outlier sample jobs with their reasons.
+
+    Only the jobs in a terminal state are considered,
+    and the efficiencies of the failed jobs are not considered.
+    """
+    failed = table[Columns.FAILED].fillna(value=False).astype(bool)
+    completed = table[Columns.FAILED].eq(other=False).fillna(value=False).astype(bool)
+    reason_masks = {
+        OutlierReasons.FAILED: failed,
+        OutlierReasons.LOW_CPU: completed
+        & (table[Columns.CPU_EFFICIENCY] < min_cpu_efficiency),
+        OutlierReasons.LOW_MEM: completed
+        & (table[Columns.MEM_EFFICIENCY] < min_mem_efficiency),
+        OutlierReasons.HIGH_MEM: (completed | failed)
+        & (table[Columns.MEM_EFFICIENCY] > max_mem_efficiency),
+    }
+    reasons = pd.Series("", index=table.index)
+    for reason, mask in reason_masks.items():
+        reasons[mask] = reasons[mask] + OUTLIER_REASONS_SEP + reason
+    outliers_table = table[reasons != ""].copy()
+    outliers_table.insert(
+        len(EXPERIMENT_COLUMNS) + 1,
+        OUTLIER_REASONS_COLUMN,
+        reasons[reasons != ""].str.lstrip(OUTLIER_REASONS_SEP),
+    )
+    return outliers_table
+
+
+def _fmt_percent(value: float) -> str:
+    return "-" if pd.isna(value) else f"{value:.0%}"
+
+
+def _fmt_duration(seconds: float) -> str:
+    if pd.isna(seconds):
+        return "-"
+    minutes, secs = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+def _fmt_gib(size: float) -> str:
+    return "-" if pd.isna(size) else f"{size / _GIBI:.1f}"
+
+
+def _rich_summary(summary_table: pd.DataFrame) -> rich.table.Table:
+    """Get the rich table of the summary."""
+    rich_table = rich.table.Table(title="Cluster resources per experiment")
+    for header in (
+        "Topic",
+        "Tool",
+        "Experiment",
+        "Jobs",
+        "Failed",
+        "CPU eff. (median)",
+        "Mem. eff. (median / max)",
+        "Elapsed (median / max)",
+        "Queue wait (median / max)",
+        "MaxRSS max / ReqMem (GiB)",
+    ):
+        rich_table.add_column(header)
+    for row in summary_table.to_dict("records"):
+        rich_table.add_row(
+            *(str(row[column]) for column in EXPERIMENT_COLUMNS),
+            str(row["jobs"]),
+            _fmt_percent(row["failure_rate"]),
+            _fmt_percent(row["cpu_efficiency_median"]),
+            f"{_fmt_percent(row['mem_efficiency_median'])}"
+            f" / {_fmt_percent(row['mem_efficiency_max'])}",
+            f"{_fmt_duration(row['elapsed_median_s'])}"
+            f" / {_fmt_duration(row['elapsed_max_s'])}",
+            f"{_fmt_duration(row['queue_wait_median_s'])}"
+            f" / {_fmt_duration(row['queue_wait_max_s'])}",
+            f"{_fmt_gib(row['max_rss_max_bytes'])}"
+            f" / {_fmt_gib(row['req_mem_median_bytes'])}",
+        )
+    return rich_table
+
+
+def _rich_outliers(outliers_table: pd.DataFrame) -> rich.table.Table:
+    """Get the rich table of the outliers."""
+    rich_table = rich.table.Table(title="Outlier sample jobs")
+    for header in (
+        "Topic",
+        "Tool",
+        "Experiment",
+        "Sample",
+        "Reasons",
+        "State",
+        "CPU eff.",
+        "Mem. eff.",
+        "Elapsed",
+    ):
+        rich_table.add_column(header)
+    for row in outliers_table.to_dict("records"):
+        rich_table.add_row(
+            *(
+                str(row[column])
+                for column in (
+                    *EXPERIMENT_COLUMNS,
+                    Columns.SAMPLE,
+                    OUTLIER_REASONS_COLUMN,
+                    Columns.STATE,
+                )
+            ),
+            _fmt_percent(row[Columns.CPU_EFFICIENCY]),
+            _fmt_percent(row[Columns.MEM_EFFICIENCY]),
+            _fmt_duration(row[Columns.ELAPSED]),
+        )
+    return rich_table
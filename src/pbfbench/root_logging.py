@@ -1,13 +1,39 @@
-"""Common logging module."""
+"""Common logging module.
+
+The log records are rendered in the terminal by a rich handler.
+An optional JSON-lines sink (see `JSONSink`) writes them in a file:
+the records are put in a queue by the logging thread
+and written by a listener thread, so the logging calls never wait for the file.
+Each JSON record has the context fields set with `set_log_context`
+and `log_context` (e.g. `topic`, `tool`, `experiment` and `sample`),
+so that the logs of many runs can be aggregated and queried.
+
+The worker processes of the pools created with `process_pool` forward their
+records to the main process, where they are handled by the same handlers.
+"""
 
 from __future__ import annotations
 
+import copy
+import json
 import logging
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import TYPE_CHECKING
 
 import typer
 from rich.console import Console
 from rich.logging import RichHandler
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
 __ROOT_APP_NAME = "pbfbench"
 
 _LOGFORMAT_RICH = "%(message)s"
@@ -28,6 +54,9 @@ def format_logger(
     """Format logger."""
     _LOGGER.handlers.clear()
     _LOGGER.filters.clear()
+    json_sink = _JSON_SINK.get()
+    if json_sink is not None:
+        _LOGGER.addHandler(json_sink.queue_handler())
     rich_handler = RichHandler(console=CONSOLE)
     if debug:
         rich_handler.setLevel(logging.DEBUG)
@@ -48,3 +77,187 @@ def init_logger(
     """Initialize logger."""
     format_logger(debug)
     logger.info(first_info_message)
+
+
+#
+# Log context
+#
+_LOG_CONTEXT: ContextVar[dict[str, str] | None] = ContextVar(
+    "log_context",
+    default=None,
+)
+
+
+def get_log_context() -> dict[str, str]:
+    """Get the log context fields."""
+    return _LOG_CONTEXT.get() or {}
+
+
+def set_log_context(**fields: str) -> None:
+    """Add fields to the log context of the current command."""
+    _LOG_CONTEXT.set({**get_log_context(), **fields})
+
+
+@contextmanager
+def log_context(**fields: str) -> Iterator[None]:
+    """Add fields to the log context inside the block (e.g. the sample)."""
+    token = _LOG_CONTEXT.set({**get_log_context(), **fields})
+    try:
+        yield
+    finally:
+        _LOG_CONTEXT.reset(token)
+
+
+#
+# JSON-lines sink
+#
+_CONTEXT_RECORD_ATTR = "pbfbench_context"
+
+
+class JSONFormatter(logging.Formatter):
+    """Format a log record in one JSON line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format the record."""
+        entry: dict[str, object] = {
+            "time": datetime.fromtimestamp(record.created, tz=UTC).isoformat(
+                timespec="milliseconds",
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+            **getattr(record, _CONTEXT_RECORD_ATTR, {}),
+        }
+        if record.exc_info:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _ContextQueueHandler(QueueHandler):
+    """Queue handler adding the log context of the logging thread to the records."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Prepare the record for the queue.
+
+        The message is merged with its arguments and the exception is formatted
+        in the logging thread, the JSON formatting is left to the listener.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        # The records forwarded by the worker processes already have their context
+        setattr(
+            record,
+            _CONTEXT_RECORD_ATTR,
+            {**get_log_context(), **getattr(record, _CONTEXT_RECORD_ATTR, {})},
+        )
+        return record
+
+
+class JSONSink:
+    """JSON-lines log file sink, written by a queue listener thread."""
+
+    @classmethod
+    def start(cls, json_log: Path) -> JSONSink:
+        """Start writing the logs in the JSON-lines file (appended)."""
+        json_log.parent.mkdir(parents=True, exist_ok=True)
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        file_handler = logging.FileHandler(json_log, mode="a", encoding="utf-8")
+        file_handler.setFormatter(JSONFormatter())
+        json_sink = cls(
+            _ContextQueueHandler(log_queue),
+            QueueListener(log_queue, file_handler),
+            file_handler,
+        )
+        json_sink.queue_listener().start()
+        _LOGGER.addHandler(json_sink.queue_handler())
+        _JSON_SINK.set(json_sink)
+        return json_sink
+
+    def __init__(
+        self,
+        queue_handler: QueueHandler,
+        queue_listener: QueueListener,
+        file_handler: logging.FileHandler,
+    ) -> None:
+        """Initialize."""
+        self.__queue_handler = queue_handler
+        self.__queue_listener = queue_listener
+        self.__file_handler = file_handler
+
+    def queue_handler(self) -> QueueHandler:
+        """Get the handler of the pbfbench logger."""
+        return self.__queue_handler
+
+    def queue_listener(self) -> QueueListener:
+        """Get the listener writing the records."""
+        return self.__queue_listener
+
+    def stop(self) -> None:
+        """Write the queued records and close the file."""
+        _LOGGER.removeHandler(self.__queue_handler)
+        _JSON_SINK.set(None)
+        self.__queue_listener.stop()
+        self.__file_handler.close()
+
+
+_JSON_SINK: ContextVar[JSONSink | None] = ContextVar("json_sink", default=None)
+
+
+#
+# Process pools
+#
+# The worker processes are not forked from the main process,
+# as the main process runs threads (e.g. the progress bar refresh
+# and the JSON sink listener)
+_MP_CONTEXT = multiprocessing.get_context("forkserver")
+
+
+class _ForwardHandler(logging.Handler):
+    """Handle the records of the worker processes with the main process loggers."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Handle the record."""
+        logging.getLogger(record.name).handle(record)
+
+
+@contextmanager
+def process_pool(max_workers: int) -> Iterator[ProcessPoolExecutor]:
+    """Get a process pool whose workers forward their log records to this process.
+
+    The log context of the calling thread is set in the workers.
+    """
+    log_queue: multiprocessing.Queue[logging.LogRecord] = _MP_CONTEXT.Queue()
+    queue_listener = QueueListener(log_queue, _ForwardHandler())
+    queue_listener.start()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=_MP_CONTEXT,
+            initializer=_init_worker_logger,
+            initargs=(log_queue, get_log_context()),
+        ) as executor:
+            yield executor
+    finally:
+        queue_listener.stop()
+        log_queue.close()
+        log_queue.join_thread()
+
+
+def _init_worker_logger(
+    log_queue: multiprocessing.Queue[logging.LogRecord],
+    log_context_fields: dict[str, str],
+) -> None:
+    """Forward the records of the worker process to the main process."""
+    _LOGGER.handlers.clear()
+    _LOGGER.filters.clear()
+    _LOGGER.addHandler(_ContextQueueHandler(log_queue))
+    set_log_context(**log_context_fields)
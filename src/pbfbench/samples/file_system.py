@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pbfbench.samples.items as smp_items
+import pbfbench.samples.logs_archive as smp_logs_archive
 
 if TYPE_CHECKING:
     import _csv
@@ -19,11 +20,16 @@ class Manager:
     """Sample file system manager."""
 
     SBATCH_STATS_PSV_NAME = Path("sbatch_stats.psv")
+    TIMING_TSV_NAME = Path("timing.tsv")
 
     MISSING_INPUTS_TSV_NAME = Path("missing_inputs.tsv")
     ERRORS_LOG_NAME = Path("errors.log")
     DONE_LOG_NAME = Path("done.log")
 
+    FINGERPRINT_TXT_NAME = Path("fingerprint.txt")
+
+    LOGS_ZIP_NAME = Path("logs.zip")
+
     def __init__(self, sample_dir: Path) -> None:
         """Inititialize."""
         self.__sample_dir = sample_dir
@@ -36,6 +42,10 @@ class Manager:
         """Get sbatch stats file path."""
         return self.__sample_dir / self.SBATCH_STATS_PSV_NAME
 
+    def timing_tsv(self) -> Path:
+        """Get the section timing file path."""
+        return self.__sample_dir / self.TIMING_TSV_NAME
+
     def missing_inputs_tsv(self) -> Path:
         """Get missing_inputs file path."""
         return self.__sample_dir / self.MISSING_INPUTS_TSV_NAME
@@ -48,11 +58,23 @@ class Manager:
         """Get done file."""
         return self.__sample_dir / self.DONE_LOG_NAME
 
+    def fingerprint_txt(self) -> Path:
+        """Get the file containing the fingerprint of the sample run."""
+        return self.__sample_dir / self.FINGERPRINT_TXT_NAME
+
+    def logs_zip(self) -> Path:
+        """Get the sample logs archive."""
+        return self.__sample_dir / self.LOGS_ZIP_NAME
+
 
 def clean_error_logs(sample_fs_manager: Manager) -> None:
-    """Clean experiment logs."""
+    """Clean experiment logs, also the errors log of the sample logs archive."""
     sample_fs_manager.missing_inputs_tsv().unlink(missing_ok=True)
     sample_fs_manager.errors_log().unlink(missing_ok=True)
+    smp_logs_archive.remove(
+        sample_fs_manager,
+        [str(sample_fs_manager.ERRORS_LOG_NAME)],
+    )
 
 
 class TSVHeader(StrEnum):
@@ -0,0 +1,123 @@
+"""Sample logs archive module.
+
+The sample log files (slurm logs, status logs and sbatch stats)
+can be packed in one compressed ZIP archive per sample directory.
+The ZIP central directory indexes the members,
+so each member can be read without unpacking the archive.
+"""
+
+from __future__ import annotations
+
+import zipfile
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+    from pathlib import Path
+
+    import pbfbench.samples.file_system as smp_fs
+
+
+def pack(sample_fs_manager: smp_fs.Manager, log_files: Iterable[Path]) -> None:
+    """Pack the existing log files in the sample logs archive and remove them.
+
+    Members with the same name are replaced.
+    """
+    existing_log_files = [log_file for log_file in log_files if log_file.exists()]
+    if not existing_log_files:
+        return
+    with Reader.open(sample_fs_manager) as reader:
+        kept_members = {
+            name: reader.read_bytes(name)
+            for name in reader.names()
+            if name not in {log_file.name for log_file in existing_log_files}
+        }
+    with zipfile.ZipFile(
+        sample_fs_manager.logs_zip(),
+        "w",
+        compression=zipfile.ZIP_DEFLATED,
+    ) as zip_out:
+        for name, content in kept_members.items():
+            zip_out.writestr(name, content)
+        for log_file in existing_log_files:
+            zip_out.write(log_file, arcname=log_file.name)
+    for log_file in existing_log_files:
+        log_file.unlink()
+
+
+def remove(sample_fs_manager: smp_fs.Manager, names: Iterable[str]) -> None:
+    """Remove members from the sample logs archive.
+
+    The archive is removed if it has no member left.
+    """
+    with Reader.open(sample_fs_manager) as reader:
+        archived_names = reader.names()
+        removed_names = set(names).intersection(archived_names)
+        if not removed_names:
+            return
+        kept_members = {
+            name: reader.read_bytes(name)
+            for name in archived_names
+            if name not in removed_names
+        }
+    if not kept_members:
+        sample_fs_manager.logs_zip().unlink()
+        return
+    with zipfile.ZipFile(
+        sample_fs_manager.logs_zip(),
+        "w",
+        compression=zipfile.ZIP_DEFLATED,
+    ) as zip_out:
+        for name, content in kept_members.items():
+            zip_out.writestr(name, content)
+
+
+class Reader:
+    """Sample logs archive reader.
+
+    A missing archive is read as an empty one.
+    """
+
+    @classmethod
+    @contextmanager
+    def open(cls, sample_fs_manager: smp_fs.Manager) -> Generator[Reader]:
+        """Open the sample logs archive for reading."""
+        if not sample_fs_manager.logs_zip().exists():
+            yield cls(None)
+            return
+        with zipfile.ZipFile(sample_fs_manager.logs_zip(), "r") as zip_in:
+            yield cls(zip_in)
+
+    def __init__(self, zip_file: zipfile.ZipFile | None) -> None:
+        """Initialize."""
+        self.__zip_file = zip_file
+
+    def names(self) -> list[str]:
+        """Get the member names."""
+        if self.__zip_file is None:
+            return []
+        return self.__zip_file.namelist()
+
+    def read_bytes(self, name: str) -> bytes:
+        """Read a member.
+
+        Raises
+        ------
+        KeyError
+            The archive does not contain the member.
+        """
+        if self.__zip_file is None:
+            _err_msg = f"There is no member named {name!r} in the archive"
+            raise KeyError(_err_msg)
+        return self.__zip_file.read(name)
+
+    def read_text(self, name: str) -> str:
+        """Read a text member.
+
+        Raises
+        ------
+        KeyError
+            The archive does not contain the member.
+        """
+        return self.read_bytes(name).decode()
@@ -5,6 +5,8 @@ from __future__ import annotations
 from enum import StrEnum
 from typing import TYPE_CHECKING
 
+import pbfbench.samples.logs_archive as smp_logs_archive
+
 if TYPE_CHECKING:
     import pbfbench.samples.file_system as smp_fs
 
@@ -30,7 +32,12 @@ type Status = OKStatus | ErrorStatus
 
 
 def get_status(sample_fs_manager: smp_fs.Manager) -> Status:
-    """Get sample experiment status."""
+    """Get sample experiment status.
+
+    The status logs are looked for in the sample directory,
+    then in the sample logs archive, which is only opened
+    if there is no loose status log.
+    """
     if not sample_fs_manager.sample_dir().exists():
         return ErrorStatus.NOT_RUN
     if sample_fs_manager.missing_inputs_tsv().exists():
@@ -39,4 +46,15 @@ def get_status(sample_fs_manager: smp_fs.Manager) -> Status:
         return ErrorStatus.ERROR
     if sample_fs_manager.done_log().exists():
         return OKStatus.OK
+    return _get_archived_status(sample_fs_manager)
+
+
+def _get_archived_status(sample_fs_manager: smp_fs.Manager) -> Status:
+    """Get sample experiment status from the sample logs archive."""
+    with smp_logs_archive.Reader.open(sample_fs_manager) as logs_archive:
+        archived_logs = logs_archive.names()
+    if str(sample_fs_manager.ERRORS_LOG_NAME) in archived_logs:
+        return ErrorStatus.ERROR
+    if str(sample_fs_manager.DONE_LOG_NAME) in archived_logs:
+        return OKStatus.OK
     return ErrorStatus.NOT_RUN
@@ -1,5 +1,8 @@
 """Shell logics."""
 
+import shlex
+import sys
+from collections.abc import Iterator
 from pathlib import Path
 
 BASH_SHEBANG = "#!/bin/bash"
@@ -30,6 +33,19 @@ def path_to_str(path: Path | str) -> str:
     return f'"{path}"'
 
 
+def pbfbench_command(*args: str) -> str:
+    """Get the command line calling pbfbench with the current Python interpreter.
+
+    The arguments are expected to be already quoted if needed.
+    """
+    return " ".join((path_to_str(sys.executable), "-m", "pbfbench", *args))
+
+
+def contains_expansion(bash_str: str) -> bool:
+    """Check if the bash string contains variable or command expansions."""
+    return "$" in bash_str
+
+
 def is_a_command(bash_line: str) -> bool:
     """Check if bash line is a command."""
     lstrip = bash_line.lstrip()
@@ -50,6 +66,32 @@ def exit_on_error(bash_line: str) -> str:
     return bash_line
 
 
+EXIT_COMMANDS_VAR = Variable("PBFBENCH_EXIT_COMMANDS")
+
+
+def exit_commands_init_lines() -> Iterator[str]:
+    """Declare the commands run when the script exits, even on error.
+
+    The commands are added with `at_exit` and run in the reverse order,
+    with their variables expanded at exit.
+    """
+    yield f"{EXIT_COMMANDS_VAR.name()}=()"
+    yield (
+        "trap"
+        " 'for ((i=${#"
+        + EXIT_COMMANDS_VAR.name()
+        + '[@]}-1; i>=0; i--)); do eval "${'
+        + EXIT_COMMANDS_VAR.name()
+        + "[i]}\"; done'"
+        " EXIT"
+    )
+
+
+def at_exit(bash_line: str) -> str:
+    """Add a command run when the script exits (see `exit_commands_init_lines`)."""
+    return f"{EXIT_COMMANDS_VAR.name()}+=({shlex.quote(bash_line)})"
+
+
 if __name__ == "__main__":
     from rich.markdown import Markdown as Md
 
@@ -0,0 +1,259 @@
+"""Slurm array jobs progress logics.
+
+The progress of an experiment array job is built from:
+
+* the append-only status log, read incrementally, for the finished tasks
+  (ok or failed) and their end times,
+* one batched `squeue` call for all the watched array jobs,
+  for the pending and running tasks.
+
+No file is read per task, so the cost of an update does not grow
+with the number of tasks already finished.
+"""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+import time
+from collections import Counter, deque
+from typing import TYPE_CHECKING
+
+import rich.table
+
+from pbfbench import subprocess_lib
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_LOGGER = logging.getLogger(__name__)
+
+SQUEUE_CMD = "squeue"
+
+SQUEUE_SEP = "|"
+ARRAY_TASK_SEP = "_"
+
+PENDING_STATES = frozenset(("PENDING", "CONFIGURING", "REQUEUED", "RESIZING"))
+RUNNING_STATES = frozenset(("RUNNING", "COMPLETING", "STAGE_OUT", "SUSPENDED"))
+
+# The throughput is the completion rate over the last window (in s)
+THROUGHPUT_WINDOW = 900
+
+
+class QueueCounts:
+    """Pending and running tasks of an array job."""
+
+    def __init__(self, pending: int = 0, running: int = 0) -> None:
+        """Initialize."""
+        self.__pending = pending
+        self.__running = running
+
+    def pending(self) -> int:
+        """Get number of pending tasks."""
+        return self.__pending
+
+    def running(self) -> int:
+        """Get number of running tasks."""
+        return self.__running
+
+
+def squeue_counts(array_job_ids: Iterable[str]) -> dict[str, QueueCounts] | None:
+    """Get the pending and running tasks of the array jobs with one `squeue` call.
+
+    The array jobs without tasks in the queue are not in the returned dictionary.
+    None is returned if `squeue` fails.
+    """
+    array_job_ids = list(array_job_ids)
+    if not array_job_ids:
+        return {}
+    try:
+        cmd_path = subprocess_lib.command_path(SQUEUE_CMD)
+    except subprocess_lib.CommandNotFoundError:
+        return None
+    result = subprocess.run(  # noqa: S603
+        [
+            str(cmd_path),
+            "--array",
+            "--noheader",
+            f"--jobs={','.join(array_job_ids)}",
+            f"--format=%i{SQUEUE_SEP}%T",
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        _LOGGER.debug("%s stderr: %s", SQUEUE_CMD, result.stderr)
+        return None
+
+    state_counters: dict[str, Counter[str]] = {}
+    for line in result.stdout.splitlines():
+        job_id, _, state = line.strip().partition(SQUEUE_SEP)
+        array_job_id = job_id.partition(ARRAY_TASK_SEP)[0]
+        state_counters.setdefault(array_job_id, Counter())[state] += 1
+    return {
+        array_job_id: QueueCounts(
+            sum(counter[state] for state in PENDING_STATES),
+            sum(counter[state] for state in RUNNING_STATES),
+        )
+        for array_job_id, counter in state_counters.items()
+    }
+
+
+class ExperimentProgress:
+    """Progress of the array job of one experiment."""
+
+    def __init__(self, name: str, number_of_tasks: int) -> None:
+        """Initialize."""
+        self.__name = name
+        self.__number_of_tasks = number_of_tasks
+        self.__array_job_id: str | None = None
+        self.__queue_counts = QueueCounts(number_of_tasks, 0)
+        self.__ok = 0
+        self.__failed = 0
+        self.__first_start_time: float | None = None
+        self.__recent_end_times: deque[float] = deque()
+
+    def name(self) -> str:
+        """Get experiment name."""
+        return self.__name
+
+    def number_of_tasks(self) -> int:
+        """Get number of tasks."""
+        return self.__number_of_tasks
+
+    def array_job_id(self) -> str | None:
+        """Get array job id, None while it is unknown."""
+        return self.__array_job_id
+
+    def set_array_job_id(self, array_job_id: str) -> None:
+        """Set array job id."""
+        self.__array_job_id = array_job_id
+
+    def set_queue_counts(self, queue_counts: QueueCounts) -> None:
+        """Set the pending and running tasks."""
+        self.__queue_counts = queue_counts
+
+    def add_finished(self, start_time: float, end_time: float, failed: bool) -> None:  # noqa: FBT001
+        """Add a finished task."""
+        if failed:
+            self.__failed += 1
+        else:
+            self.__ok += 1
+        if self.__first_start_time is None or start_time < self.__first_start_time:
+            self.__first_start_time = start_time
+        self.__recent_end_times.append(end_time)
+
+    def ok(self) -> int:
+        """Get number of tasks finished without error."""
+        return self.__ok
+
+    def failed(self) -> int:
+        """Get number of tasks finished with error."""
+        return self.__failed
+
+    def finished(self) -> int:
+        """Get number of finished tasks."""
+        return self.__ok + self.__failed
+
+    def remaining(self) -> int:
+        """Get number of unfinished tasks."""
+        return max(self.__number_of_tasks - self.finished(), 0)
+
+    def pending(self) -> int:
+        """Get number of pending tasks."""
+        return min(self.__queue_counts.pending(), self.remaining())
+
+    def running(self) -> int:
+        """Get number of running tasks.
+
+        A task which has written its status may still be in the queue.
+        """
+        return min(self.__queue_counts.running(), self.remaining() - self.pending())
+
+    def throughput(self, now: float | None = None) -> float | None:
+        """Get the completion rate (in tasks per s), None before the first end.
+
+        The rate is observed over the last `THROUGHPUT_WINDOW` seconds,
+        or since the first task start if it is more recent.
+        """
+        if self.__first_start_time is None:
+            return None
+        if now is None:
+            now = time.time()
+        while self.__recent_end_times and (
+            self.__recent_end_times[0] < now - THROUGHPUT_WINDOW
+        ):
+            self.__recent_end_times.popleft()
+        window = min(THROUGHPUT_WINDOW, now - self.__first_start_time)
+        if window <= 0:
+            return None
+        return len(self.__recent_end_times) / window
+
+    def eta(self, now: float | None = None) -> float | None:
+        """Get the estimated remaining time (in s), None if unknown."""
+        if not self.remaining():
+            return 0
+        throughput = self.throughput(now)
+        if not throughput:
+            return None
+        return self.remaining() / throughput
+
+
+def update_queue_counts(experiments_progress: Iterable[ExperimentProgress]) -> None:
+    """Update the pending and running tasks of the experiments with one `squeue` call.
+
+    The counts are kept if `squeue` fails.
+    """
+    progress_by_array_job_id = {
+        array_job_id: exp_progress
+        for exp_progress in experiments_progress
+        if (array_job_id := exp_progress.array_job_id()) is not None
+    }
+    queue_counts = squeue_counts(progress_by_array_job_id)
+    if queue_counts is None:
+        return
+    for array_job_id, exp_progress in progress_by_array_job_id.items():
+        exp_progress.set_queue_counts(queue_counts.get(array_job_id, QueueCounts()))
+
+
+def _fmt_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    minutes, secs = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+def progress_table(
+    experiments_progress: Iterable[ExperimentProgress],
+) -> rich.table.Table:
+    """Get the rich table of the experiments progress."""
+    now = time.time()
+    table = rich.table.Table(title="Slurm tasks")
+    for header in (
+        "Experiment",
+        "Array job",
+        "Pending",
+        "Running",
+        "OK",
+        "Failed",
+        "Done",
+        "Throughput (tasks/h)",
+        "ETA",
+    ):
+        table.add_column(header)
+    for exp_progress in experiments_progress:
+        throughput = exp_progress.throughput(now)
+        table.add_row(
+            exp_progress.name(),
+            exp_progress.array_job_id() or "-",
+            str(exp_progress.pending()),
+            str(exp_progress.running()),
+            f"[green]{exp_progress.ok()}[/green]",
+            f"[red]{exp_progress.failed()}[/red]",
+            f"{exp_progress.finished()}/{exp_progress.number_of_tasks()}",
+            "-" if throughput is None else f"{throughput * 3600:.1f}",
+            _fmt_duration(exp_progress.eta(now)),
+        )
+    return table
@@ -10,6 +10,8 @@ from typing import TYPE_CHECKING
 import pbfbench.experiment.file_system as exp_fs
 import pbfbench.shell as sh
 import pbfbench.slurm.config as slurm_cfg
+import pbfbench.slurm.stats as slurm_stats
+import pbfbench.slurm.status as slurm_status
 from pbfbench import subprocess_lib
 
 if TYPE_CHECKING:
@@ -43,6 +45,8 @@ class SbatchCommentLinesBuilder:
     TASK_JOB_ID = "%a"
     JOB_ID = array_task_job_id(ARRAY_JOB_ID, TASK_JOB_ID)
 
+    ARRAY_OPTION = "--array="
+
     @classmethod
     def lines(
         cls,
@@ -76,11 +80,21 @@ class SbatchCommentLinesBuilder:
     @classmethod
     def _job_array_lines(cls, samples_to_run_indices: Iterable[int]) -> Iterator[str]:
         """Iterate over the job array comment lines."""
-        array_job_str = "--array=" + ",".join(
+        array_job_str = cls.ARRAY_OPTION + ",".join(
             str(sample_index) for sample_index in samples_to_run_indices
         )
         yield array_job_str
 
+    @classmethod
+    def number_of_array_tasks(cls, sbatch_script: Path) -> int:
+        """Read the number of array tasks of a sbatch script."""
+        array_line_prefix = f"{cls.COMMENT} {cls.ARRAY_OPTION}"
+        with sbatch_script.open() as f_in:
+            for line in f_in:
+                if line.startswith(array_line_prefix):
+                    return len(line.removeprefix(array_line_prefix).strip().split(","))
+        return 0
+
     @classmethod
     def _sbatch_option_log_lines(
         cls,
@@ -92,32 +106,47 @@ class SbatchCommentLinesBuilder:
 
 
 class ExitFunctionLinesBuilder:
-    """Exit function lines builder."""
+    """Exit function lines builder.
+
+    Each exit function appends one line to the experiment status log
+    (see `slurm_status.TaskStatus` for the line format).
+    The line is written with one `>>` redirection (`O_APPEND`),
+    so concurrent array tasks do not interleave their lines.
+    """
 
     EXIT_INIT_ENV_ERROR_FN_NAME = "exit_init_env_error"
     EXIT_COMMAND_ERROR_FN_NAME = "exit_command_error"
     EXIT_CLOSE_ENV_ERROR_FN_NAME = "exit_close_env_error"
     EXIT_END_FN_NAME = "exit_end"
 
+    TASK_START_TIME_VAR = sh.Variable("PBFBENCH_TASK_START_TIME")
+    EXIT_CODE_VAR = sh.Variable("exit_code")
+
     @classmethod
     def lines(cls, work_exp_fs_manager: exp_fs.WorkManager) -> Iterator[str]:
-        """Iterate over bash lines defining the exit functions."""
+        """Iterate over bash lines defining the task start time and exit functions."""
+        status_log = work_exp_fs_manager.sbatch_status_log()
+        yield cls.TASK_START_TIME_VAR.set("$(date +%s)")
         yield from chain(
             cls._err_fn_lines(
                 cls.EXIT_INIT_ENV_ERROR_FN_NAME,
-                work_exp_fs_manager.sbatch_init_env_error_file(SLURM_JOB_ID_FROM_VARS),
+                slurm_status.Status.INIT_ENV_ERROR,
+                status_log,
             ),
             cls._err_fn_lines(
                 cls.EXIT_COMMAND_ERROR_FN_NAME,
-                work_exp_fs_manager.sbatch_command_error_file(SLURM_JOB_ID_FROM_VARS),
+                slurm_status.Status.COMMAND_ERROR,
+                status_log,
             ),
             cls._err_fn_lines(
                 cls.EXIT_CLOSE_ENV_ERROR_FN_NAME,
-                work_exp_fs_manager.sbatch_close_env_error_file(SLURM_JOB_ID_FROM_VARS),
+                slurm_status.Status.CLOSE_ENV_ERROR,
+                status_log,
             ),
             cls._ok_fn_lines(
                 cls.EXIT_END_FN_NAME,
-                work_exp_fs_manager.sbatch_end_file(SLURM_JOB_ID_FROM_VARS),
+                slurm_status.Status.END,
+                status_log,
             ),
         )
 
@@ -125,21 +154,46 @@ class ExitFunctionLinesBuilder:
     def _function_lines(
         cls,
         fn_name: str,
-        status_file: Path,
+        status: slurm_status.Status,
+        status_log: Path,
         code: int,
     ) -> Iterator[str]:
+        # printf escaped version of `slurm_status.STATUS_LOG_SEP`
+        status_fields = "\\t".join(
+            ["%s"] * slurm_status.TaskStatus.NUMBER_OF_FIELDS,
+        )
         yield f"function {fn_name}" + " {"
-        yield f"  touch {status_file}"
+        # Must be the first line to get the exit code of the failing command
+        yield f"  local {cls.EXIT_CODE_VAR.set('$?')}"
+        yield (
+            f"  printf '{status_fields}\\n'"
+            f' "{SLURM_JOB_ID_FROM_VARS}"'
+            f' "{status}"'
+            f' "{cls.TASK_START_TIME_VAR.eval()}"'
+            ' "$(date +%s)"'
+            f' "{cls.EXIT_CODE_VAR.eval()}"'
+            f" >> {sh.path_to_str(status_log)}"
+        )
         yield f"  exit {code}"
         yield "}"
 
     @classmethod
-    def _ok_fn_lines(cls, fn_name: str, status_file: Path) -> Iterator[str]:
-        yield from cls._function_lines(fn_name, status_file, 0)
+    def _ok_fn_lines(
+        cls,
+        fn_name: str,
+        status: slurm_status.Status,
+        status_log: Path,
+    ) -> Iterator[str]:
+        yield from cls._function_lines(fn_name, status, status_log, 0)
 
     @classmethod
-    def _err_fn_lines(cls, fn_name: str, status_file: Path) -> Iterator[str]:
-        yield from cls._function_lines(fn_name, status_file, 1)
+    def _err_fn_lines(
+        cls,
+        fn_name: str,
+        status: slurm_status.Status,
+        status_log: Path,
+    ) -> Iterator[str]:
+        yield from cls._function_lines(fn_name, status, status_log, 1)
 
 
 SACCT_CMD = "sacct"
@@ -147,12 +201,19 @@ BASH_CMD = "bash"
 
 
 def write_slurm_stats(job_id: str, psv_path: Path) -> None:
-    """Write sbatch stats."""
+    """Write sbatch stats.
+
+    The `sacct` fields are explicit (see `slurm_stats.SACCT_FORMAT_FIELDS`),
+    so that the resources report gets the CPU times and the queue wait.
+    """
     tmp_bash_script_path = psv_path.with_suffix(".sh")
 
     with tmp_bash_script_path.open("w") as f:
         f.write(sh.BASH_SHEBANG + "\n")
-        f.write(f"{SACCT_CMD} --long --jobs {job_id} --parsable2 > {psv_path}")
+        f.write(
+            f"{SACCT_CMD} --format={','.join(slurm_stats.SACCT_FORMAT_FIELDS)}"
+            f" --jobs {job_id} --parsable2 > {psv_path}",
+        )
 
     cmd_path = subprocess_lib.command_path(BASH_CMD)
     result = subprocess.run(  # noqa: S603
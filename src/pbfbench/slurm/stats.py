@@ -0,0 +1,282 @@
+"""Slurm job accounting stats logics.
+
+The stats of each sample job are written by `sacct` in the sample
+`sbatch_stats.psv` file (pipe-separated values with header),
+one line for the job allocation and one line per job step
+(e.g. `.batch`, `.extern`, `.0` for `srun`).
+
+The stats written with `sacct --long` (before the explicit format)
+have no `TotalCPU`, `Submit` and `Start` fields,
+so their CPU efficiency and queue wait are unknown.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+PSV_SEP = "|"
+
+JOB_STEP_SEP = "."
+
+
+class Fields:
+    """`sacct` fields."""
+
+    JOB_ID = "JobID"
+    JOB_NAME = "JobName"
+    PARTITION = "Partition"
+    STATE = "State"
+    EXIT_CODE = "ExitCode"
+    ALLOC_CPUS = "AllocCPUS"
+    REQ_MEM = "ReqMem"
+    MAX_RSS = "MaxRSS"
+    MAX_VM_SIZE = "MaxVMSize"
+    TOTAL_CPU = "TotalCPU"
+    CPU_TIME = "CPUTime"
+    ELAPSED = "Elapsed"
+    TIMELIMIT = "Timelimit"
+    SUBMIT = "Submit"
+    START = "Start"
+    END = "End"
+    NODE_LIST = "NodeList"
+    REQ_TRES = "ReqTRES"
+    ALLOC_TRES = "AllocTRES"
+
+
+SACCT_FORMAT_FIELDS = (
+    Fields.JOB_ID,
+    Fields.JOB_NAME,
+    Fields.PARTITION,
+    Fields.STATE,
+    Fields.EXIT_CODE,
+    Fields.ALLOC_CPUS,
+    Fields.REQ_MEM,
+    Fields.MAX_RSS,
+    Fields.MAX_VM_SIZE,
+    Fields.TOTAL_CPU,
+    Fields.CPU_TIME,
+    Fields.ELAPSED,
+    Fields.TIMELIMIT,
+    Fields.SUBMIT,
+    Fields.START,
+    Fields.END,
+    Fields.NODE_LIST,
+    Fields.REQ_TRES,
+    Fields.ALLOC_TRES,
+)
+
+COMPLETED_STATE = "COMPLETED"
+# Terminal states of the jobs which did not complete
+# (the other states, e.g. `PENDING`, `RUNNING` or `COMPLETING`, are not final)
+FAILED_STATES = (
+    "FAILED",
+    "CANCELLED",
+    "TIMEOUT",
+    "OUT_OF_MEMORY",
+    "NODE_FAIL",
+    "BOOT_FAIL",
+    "DEADLINE",
+    "PREEMPTED",
+)
+
+# Slurm durations: [DD-][HH:]MM:SS[.mmm]
+_DURATION_REGEX = re.compile(
+    r"^(?:(?P<days>\d+)-)?(?:(?P<hours>\d+):)?(?P<minutes>\d+):(?P<seconds>\d+(?:\.\d+)?)$",
+)
+# Slurm memory sizes: number with an optional unit,
+# the old `n` (per node) and `c` (per CPU) `ReqMem` suffixes are accepted
+_MEMORY_REGEX = re.compile(r"^(?P<size>\d+(?:\.\d+)?)(?P<unit>[KMGTP]?)(?P<per>[nc]?)$")
+_MEMORY_UNITS = {
+    "": 1,
+    "K": 1 << 10,
+    "M": 1 << 20,
+    "G": 1 << 30,
+    "T": 1 << 40,
+    "P": 1 << 50,
+}
+# Slurm `ReqMem` default unit is the megabyte
+_REQ_MEM_DEFAULT_UNIT = "M"
+
+
+def duration_seconds(duration: str) -> float | None:
+    """Convert a Slurm duration to seconds, None if it is not set."""
+    match = _DURATION_REGEX.match(duration.strip())
+    if match is None:
+        return None
+    return (
+        int(match["days"] or 0) * 86400
+        + int(match["hours"] or 0) * 3600
+        + int(match["minutes"]) * 60
+        + float(match["seconds"])
+    )
+
+
+def memory_bytes(memory: str, default_unit: str = "") -> tuple[float, str] | None:
+    """Convert a Slurm memory size to bytes, None if it is not set.
+
+    Returns
+    -------
+    float
+        Size in bytes
+    str
+        `c` if the size is per CPU, `n` if it is per node, empty otherwise
+    """
+    match = _MEMORY_REGEX.match(memory.strip())
+    if match is None:
+        return None
+    return (
+        float(match["size"]) * _MEMORY_UNITS[match["unit"] or default_unit],
+        match["per"],
+    )
+
+
+def timestamp(date_time: str) -> float | None:
+    """Convert a Slurm date time to a Unix timestamp, None if it is not set."""
+    try:
+        return datetime.fromisoformat(date_time.strip()).timestamp()
+    except ValueError:
+        return None
+
+
+class JobStats:
+    """Stats of one sample job, from its job allocation and steps lines."""
+
+    @classmethod
+    def from_psv(cls, psv_text: str) -> JobStats:
+        """Parse the `sacct` PSV output of one job.
+
+        Raises
+        ------
+        ValueError
+            No job allocation line.
+        """
+        lines = [line for line in psv_text.splitlines() if line]
+        if not lines:
+            _err_msg = "Empty sacct stats"
+            raise ValueError(_err_msg)
+        header = lines[0].split(PSV_SEP)
+        rows = [
+            dict(zip(header, line.split(PSV_SEP), strict=False)) for line in lines[1:]
+        ]
+        job_rows = [
+            row for row in rows if JOB_STEP_SEP not in row.get(Fields.JOB_ID, "")
+        ]
+        if not job_rows:
+            _err_msg = "No job allocation line in the sacct stats"
+            raise ValueError(_err_msg)
+        return cls(job_rows[0], [row for row in rows if row not in job_rows])
+
+    def __init__(
+        self,
+        job_row: dict[str, str],
+        step_rows: list[dict[str, str]],
+    ) -> None:
+        """Initialize."""
+        self.__job_row = job_row
+        self.__step_rows = step_rows
+
+    def job_id(self) -> str:
+        """Get job id."""
+        return self.__job_row[Fields.JOB_ID]
+
+    def state(self) -> str:
+        """Get the job state (e.g. `COMPLETED`, `FAILED`, `CANCELLED by ...`)."""
+        return self.__job_row.get(Fields.STATE, "")
+
+    def terminated(self) -> bool:
+        """Check if the job is in a terminal state (completed or failed).
+
+        The resources of the other jobs (e.g. still running) are partial.
+        """
+        return self.failed() is not None
+
+    def failed(self) -> bool | None:
+        """Check if the job ended in a failure state.
+
+        None if the state is unknown or not terminal (e.g. `RUNNING`).
+        """
+        state = self.state()
+        if state.startswith(COMPLETED_STATE):
+            return False
+        if state.startswith(FAILED_STATES):
+            return True
+        return None
+
+    def alloc_cpus(self) -> int | None:
+        """Get the number of allocated CPUs."""
+        try:
+            return int(self.__job_row.get(Fields.ALLOC_CPUS, ""))
+        except ValueError:
+            return None
+
+    def elapsed(self) -> float | None:
+        """Get the elapsed time (in s)."""
+        return duration_seconds(self.__job_row.get(Fields.ELAPSED, ""))
+
+    def total_cpu(self) -> float | None:
+        """Get the total CPU time of the job steps (in s).
+
+        The job line gives the sum over the steps,
+        otherwise the step times are summed.
+        """
+        total_cpu = duration_seconds(self.__job_row.get(Fields.TOTAL_CPU, ""))
+        if total_cpu:
+            return total_cpu
+        step_cpus = [
+            step_cpu
+            for row in self.__step_rows
+            if (step_cpu := duration_seconds(row.get(Fields.TOTAL_CPU, ""))) is not None
+        ]
+        return sum(step_cpus) if step_cpus else total_cpu
+
+    def max_rss(self) -> float | None:
+        """Get the maximum resident set size over the steps (in bytes)."""
+        max_rss_values = [
+            memory[0]
+            for row in (self.__job_row, *self.__step_rows)
+            if (memory := memory_bytes(row.get(Fields.MAX_RSS, ""))) is not None
+        ]
+        return max(max_rss_values) if max_rss_values else None
+
+    def req_mem(self) -> float | None:
+        """Get the requested memory of the job (in bytes)."""
+        memory = memory_bytes(
+            self.__job_row.get(Fields.REQ_MEM, ""),
+            _REQ_MEM_DEFAULT_UNIT,
+        )
+        if memory is None:
+            return None
+        size, per = memory
+        if per == "c":
+            alloc_cpus = self.alloc_cpus()
+            return size * alloc_cpus if alloc_cpus is not None else None
+        return size
+
+    def queue_wait(self) -> float | None:
+        """Get the time between the submission and the start (in s)."""
+        submit = timestamp(self.__job_row.get(Fields.SUBMIT, ""))
+        start = timestamp(self.__job_row.get(Fields.START, ""))
+        if submit is None or start is None:
+            return None
+        return start - submit
+
+    def cpu_efficiency(self) -> float | None:
+        """Get the CPU efficiency: TotalCPU / (Elapsed x AllocCPUS)."""
+        total_cpu = self.total_cpu()
+        elapsed = self.elapsed()
+        alloc_cpus = self.alloc_cpus()
+        if total_cpu is None or not elapsed or not alloc_cpus:
+            return None
+        return total_cpu / (elapsed * alloc_cpus)
+
+    def mem_efficiency(self) -> float | None:
+        """Get the memory efficiency: MaxRSS / ReqMem."""
+        max_rss = self.max_rss()
+        req_mem = self.req_mem()
+        if max_rss is None or not req_mem:
+            return None
+        return max_rss / req_mem
@@ -1,8 +1,15 @@
 """Slurm status logics."""
 
+from __future__ import annotations
+
+import logging
 from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
-import pbfbench.experiment.file_system as exp_fs
+_LOGGER = logging.getLogger(__name__)
 
 
 class Status(StrEnum):
@@ -14,14 +21,114 @@ class Status(StrEnum):
     END = "end"
 
 
-def get_status(work_exp_fs_manager: exp_fs.WorkManager, job_id: str) -> Status | None:
-    """Get sample experiment status."""
-    if work_exp_fs_manager.sbatch_init_env_error_file(job_id).exists():
-        return Status.INIT_ENV_ERROR
-    if work_exp_fs_manager.sbatch_command_error_file(job_id).exists():
-        return Status.COMMAND_ERROR
-    if work_exp_fs_manager.sbatch_close_env_error_file(job_id).exists():
-        return Status.CLOSE_ENV_ERROR
-    if work_exp_fs_manager.sbatch_end_file(job_id).exists():
-        return Status.END
-    return None
+STATUS_LOG_SEP = "\t"
+
+
+class TaskStatus:
+    """Array task status, as written in the status log.
+
+    One status log line contains the tab-separated fields:
+    `job_id`, `status`, `start_time`, `end_time` and `exit_code`.
+
+    The times are Unix timestamps in seconds.
+    """
+
+    NUMBER_OF_FIELDS = 5
+
+    @classmethod
+    def from_line(cls, line: str) -> TaskStatus:
+        """Parse a status log line.
+
+        Raises
+        ------
+        ValueError
+            The line is not a valid status log line.
+        """
+        fields = line.rstrip("\n").split(STATUS_LOG_SEP)
+        if len(fields) != cls.NUMBER_OF_FIELDS:
+            _err_msg = f"Wrong number of fields in status log line: {line!r}"
+            raise ValueError(_err_msg)
+        job_id, status, start_time, end_time, exit_code = fields
+        return cls(
+            job_id,
+            Status(status),
+            int(start_time),
+            int(end_time),
+            int(exit_code),
+        )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        job_id: str,
+        status: Status,
+        start_time: int,
+        end_time: int,
+        exit_code: int,
+    ) -> None:
+        """Initialize."""
+        self.__job_id = job_id
+        self.__status = status
+        self.__start_time = start_time
+        self.__end_time = end_time
+        self.__exit_code = exit_code
+
+    def job_id(self) -> str:
+        """Get array task job id."""
+        return self.__job_id
+
+    def status(self) -> Status:
+        """Get status."""
+        return self.__status
+
+    def start_time(self) -> int:
+        """Get start Unix timestamp."""
+        return self.__start_time
+
+    def end_time(self) -> int:
+        """Get end Unix timestamp."""
+        return self.__end_time
+
+    def exit_code(self) -> int:
+        """Get the exit code of the command that ends the task."""
+        return self.__exit_code
+
+
+class StatusLogTailer:
+    """Incremental reader of the append-only status log.
+
+    Only the current offset is kept, so each read costs O(new bytes).
+    A partially written last line is left for the next read.
+    """
+
+    def __init__(self, status_log: Path) -> None:
+        """Initialize."""
+        self.__status_log = status_log
+        self.__offset = 0
+
+    def status_log(self) -> Path:
+        """Get status log file."""
+        return self.__status_log
+
+    def offset(self) -> int:
+        """Get the number of bytes already read."""
+        return self.__offset
+
+    def read_new(self) -> list[TaskStatus]:
+        """Read the task statuses appended since the last read."""
+        try:
+            with self.__status_log.open("rb") as f_in:
+                f_in.seek(self.__offset)
+                new_bytes = f_in.read()
+        except FileNotFoundError:
+            return []
+
+        complete_lines_end = new_bytes.rfind(b"\n") + 1
+        self.__offset += complete_lines_end
+
+        task_statuses: list[TaskStatus] = []
+        for line in new_bytes[:complete_lines_end].decode().splitlines():
+            try:
+                task_statuses.append(TaskStatus.from_line(line))
+            except ValueError:
+                _LOGGER.exception("Ignore malformed status log line")
+        return task_statuses
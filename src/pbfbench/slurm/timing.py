@@ -0,0 +1,237 @@
+"""Slurm task section timing logics.
+
+The sbatch and command scripts record the start and end timestamps
+of their sections (e.g. environment activation, input staging, core command)
+in an append-only timing log shared by all the array tasks.
+
+One timing log line contains the tab-separated fields:
+`job_id`, `section`, `start_time` and `end_time`.
+The times are Unix timestamps in seconds with a microsecond resolution
+(`EPOCHREALTIME` bash variable, `date +%s.%N` with bash < 5).
+Only the sections which end are recorded.
+"""
+
+from __future__ import annotations
+
+import logging
+import statistics
+from collections import defaultdict
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+import pbfbench.shell as sh
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Sections(StrEnum):
+    """Task sections.
+
+    The input sections are suffixed by the input tool and result names.
+    """
+
+    INIT_ENV = "init_env"
+    COMMAND = "command"
+    INPUT_INIT = "input_init"
+    CORE_COMMAND = "core_command"
+    INPUT_CLOSE = "input_close"
+    CLOSE_ENV = "close_env"
+
+
+SECTION_SUFFIX_SEP = ":"
+
+
+def input_section(section: Sections, tool_name: str, result_name: str) -> str:
+    """Get the section name of an input."""
+    return SECTION_SUFFIX_SEP.join((section, tool_name, result_name))
+
+
+TIMING_LOG_SEP = "\t"
+
+TIMESTAMP_CMD = "${EPOCHREALTIME:-$(date +%s.%N)}"
+
+
+class SectionTiming:
+    """Task section timing, as written in the timing log."""
+
+    NUMBER_OF_FIELDS = 4
+
+    @classmethod
+    def from_line(cls, line: str) -> SectionTiming:
+        """Parse a timing log line.
+
+        The decimal commas (`EPOCHREALTIME` in some locales) are accepted.
+
+        Raises
+        ------
+        ValueError
+            The line is not a valid timing log line.
+        """
+        fields = line.rstrip("\n").split(TIMING_LOG_SEP)
+        if len(fields) != cls.NUMBER_OF_FIELDS:
+            _err_msg = f"Wrong number of fields in timing log line: {line!r}"
+            raise ValueError(_err_msg)
+        job_id, section, start_time, end_time = fields
+        return cls(
+            job_id,
+            section,
+            float(start_time.replace(",", ".")),
+            float(end_time.replace(",", ".")),
+        )
+
+    def __init__(
+        self,
+        job_id: str,
+        section: str,
+        start_time: float,
+        end_time: float,
+    ) -> None:
+        """Initialize."""
+        self.__job_id = job_id
+        self.__section = section
+        self.__start_time = start_time
+        self.__end_time = end_time
+
+    def job_id(self) -> str:
+        """Get array task job id."""
+        return self.__job_id
+
+    def section(self) -> str:
+        """Get section name."""
+        return self.__section
+
+    def start_time(self) -> float:
+        """Get start Unix timestamp (in s)."""
+        return self.__start_time
+
+    def end_time(self) -> float:
+        """Get end Unix timestamp (in s)."""
+        return self.__end_time
+
+    def duration(self) -> float:
+        """Get duration (in s)."""
+        return self.__end_time - self.__start_time
+
+
+class SectionLinesBuilder:
+    """Bash lines builder recording the timing of sections.
+
+    The sections of a script must not be nested,
+    as they share the start time variable.
+    The line is written with one `>>` redirection (`O_APPEND`),
+    so concurrent array tasks do not interleave their lines.
+    """
+
+    SECTION_START_VAR = sh.Variable("PBFBENCH_SECTION_START")
+
+    def __init__(self, timing_log: Path, job_id: str) -> None:
+        """Initialize.
+
+        Parameters
+        ----------
+        timing_log : Path
+            Timing log shared by the array tasks
+        job_id : str
+            Bash expression of the array task job id
+        """
+        self.__timing_log = timing_log
+        self.__job_id = job_id
+
+    def timing_log(self) -> Path:
+        """Get timing log file."""
+        return self.__timing_log
+
+    def section_lines(self, section: str, lines: Iterable[str]) -> Iterator[str]:
+        """Surround the section lines with the timing lines.
+
+        The empty sections are not timed.
+        """
+        section_lines = list(lines)
+        if not section_lines:
+            return
+        yield self.SECTION_START_VAR.set(TIMESTAMP_CMD)
+        yield from section_lines
+        # printf escaped version of `TIMING_LOG_SEP`
+        timing_fields = "\\t".join(["%s"] * SectionTiming.NUMBER_OF_FIELDS)
+        yield (
+            f"printf '{timing_fields}\\n'"
+            f' "{self.__job_id}"'
+            f' "{section}"'
+            f' "{self.SECTION_START_VAR.eval()}"'
+            f' "{TIMESTAMP_CMD}"'
+            f" >> {sh.path_to_str(self.__timing_log)}"
+        )
+
+
+def read_timing_log(timing_log: Path) -> dict[str, list[SectionTiming]]:
+    """Read the section timings of each array task job id."""
+    job_timings: dict[str, list[SectionTiming]] = defaultdict(list)
+    try:
+        with timing_log.open() as f_in:
+            for line in f_in:
+                try:
+                    section_timing = SectionTiming.from_line(line)
+                except ValueError:
+                    _LOGGER.exception("Ignore malformed timing log line")
+                    continue
+                job_timings[section_timing.job_id()].append(section_timing)
+    except FileNotFoundError:
+        return {}
+    return job_timings
+
+
+TIMING_TSV_HEADER = ("section", "start_time", "end_time", "duration")
+
+
+def write_timing_tsv(
+    section_timings: Iterable[SectionTiming],
+    timing_tsv: Path,
+) -> None:
+    """Write the section timings of one task."""
+    with timing_tsv.open("w") as f_out:
+        f_out.write(TIMING_LOG_SEP.join(TIMING_TSV_HEADER) + "\n")
+        for section_timing in section_timings:
+            f_out.write(
+                TIMING_LOG_SEP.join(
+                    (
+                        section_timing.section(),
+                        f"{section_timing.start_time():.6f}",
+                        f"{section_timing.end_time():.6f}",
+                        f"{section_timing.duration():.6f}",
+                    ),
+                )
+                + "\n",
+            )
+
+
+SUMMARY_TSV_HEADER = ("section", "tasks", "total", "mean", "median", "max")
+
+
+def write_summary_tsv(
+    section_timings: Iterable[SectionTiming],
+    summary_tsv: Path,
+) -> None:
+    """Write the duration statistics of each section over the tasks (in s)."""
+    section_durations: dict[str, list[float]] = defaultdict(list)
+    for section_timing in section_timings:
+        section_durations[section_timing.section()].append(section_timing.duration())
+    with summary_tsv.open("w") as f_out:
+        f_out.write(TIMING_LOG_SEP.join(SUMMARY_TSV_HEADER) + "\n")
+        for section, durations in section_durations.items():
+            f_out.write(
+                TIMING_LOG_SEP.join(
+                    (
+                        section,
+                        str(len(durations)),
+                        f"{sum(durations):.3f}",
+                        f"{statistics.mean(durations):.3f}",
+                        f"{statistics.median(durations):.3f}",
+                        f"{max(durations):.3f}",
+                    ),
+                )
+                + "\n",
+            )
@@ -7,6 +7,20 @@ from __future__ import annotations
 
 import pbfbench.abc.topic.app as abc_topic_app
 import pbfbench.topics.assembly.description as assembly_desc
-import pbfbench.topics.assembly.unicycler.app as unicycler_app
+import pbfbench.topics.assembly.gfa_connector.description as gfa_connector_desc
+import pbfbench.topics.assembly.unicycler.description as unicycler_desc
+from pbfbench import lazy_app
 
-APP = abc_topic_app.build_application(assembly_desc.DESCRIPTION, [unicycler_app.APP])
+APP = abc_topic_app.build_application(
+    assembly_desc.DESCRIPTION,
+    [
+        lazy_app.SubApp.from_tool(
+            unicycler_desc.DESCRIPTION,
+            "pbfbench.topics.assembly.unicycler.app",
+        ),
+        lazy_app.SubApp.from_tool(
+            gfa_connector_desc.DESCRIPTION,
+            "pbfbench.topics.assembly.gfa_connector.app",
+        ),
+    ],
+)
@@ -0,0 +1,46 @@
+"""GFA connector application module."""
+
+# Due to typer usage:
+# ruff: noqa: TC001, TC003, UP007, FBT001, FBT002, PLR0913
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+import pbfbench.abc.tool.app as abc_tool_app
+import pbfbench.topics.assembly.gfa_connector.description as gfa_connector_desc
+import pbfbench.topics.assembly.gfa_connector.ops as gfa_connector_ops
+import pbfbench.topics.assembly.gfa_connector.visitor as gfa_connector_visitor
+from pbfbench import root_logging
+
+_LOGGER = logging.getLogger(__name__)
+
+APP = abc_tool_app.build_application_with_arguments(gfa_connector_visitor.CONNECTOR)
+
+
+class NormalizeArguments:
+    """Normalize application arguments."""
+
+    RAW_GFA = typer.Argument(help="Raw GFA connector graph (can be gzipped)")
+    GFA_GZ = typer.Argument(help="Output normalised gzipped GFA file")
+    FASTA_GZ = typer.Argument(help="Output gzipped FASTA file")
+
+
+@APP.command(name=gfa_connector_desc.NORMALIZE_CMD)
+def normalize(
+    raw_gfa: Annotated[Path, NormalizeArguments.RAW_GFA],
+    gfa_gz: Annotated[Path, NormalizeArguments.GFA_GZ],
+    fasta_gz: Annotated[Path, NormalizeArguments.FASTA_GZ],
+    debug: Annotated[bool, root_logging.OPT_DEBUG] = False,
+) -> None:
+    """Rename the segments of a GFA connector graph and export its FASTA file.
+
+    The segments are renamed `1`, `2`, ... with the previous name in the `SC` tag.
+    """
+    root_logging.init_logger(_LOGGER, "Normalise the GFA connector graph", debug)
+    number_of_segments = gfa_connector_ops.normalize(raw_gfa, gfa_gz, fasta_gz)
+    _LOGGER.info("Number of segments: %d", number_of_segments)
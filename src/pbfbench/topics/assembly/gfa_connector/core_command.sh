@@ -0,0 +1,17 @@
+SHORT_READS_COLUMN_NUMBER=$(awk -v RS='\t' '/^short_reads/{print NR; exit}' ${SAMPLES_TSV})
+SRR_ID=$(sed -n ${SLURM_ARRAY_TASK_ID}p ${SAMPLES_TSV} | cut -f${SHORT_READS_COLUMN_NUMBER})
+
+READS_DIR=${WORK_EXP_SAMPLE_DIR}/reads
+mkdir $READS_DIR
+
+prefetch ${SRR_ID} --output-directory ${READS_DIR}
+fastq-dump --split-3 --outdir ${READS_DIR} ${READS_DIR}/${SRR_ID}
+
+FASTQ_1=${READS_DIR}/${SRR_ID}_1.fastq
+FASTQ_2=${READS_DIR}/${SRR_ID}_2.fastq
+
+gfa_connector --contigs ${FASTA} --reads ${FASTQ_1} ${FASTQ_2} --gfa ${RAW_GFA} ${USER_TOOL_OPTIONS[@]}
+
+"${NORMALIZE_CMD[@]}" ${RAW_GFA} ${OUT_GFA_GZ} ${OUT_FASTA_GZ}
+
+rm -rf ${READS_DIR}
@@ -1,4 +1,4 @@
-"""SKESA assembler items."""
+"""GFA connector description."""
 
 import pbfbench.abc.tool.description as abc_tool_desc
 import pbfbench.topics.assembly.description as asm_desc
@@ -8,3 +8,6 @@ DESCRIPTION = abc_tool_desc.Description(
     "gfa-connector",
     asm_desc.DESCRIPTION,
 )
+
+# Command of the tool application normalising the raw GFA connector graph
+NORMALIZE_CMD = "normalize"
@@ -0,0 +1,234 @@
+"""GFA connector operations logics.
+
+The GFA connector graph is normalised in one pass:
+
+* the segments are renamed `1`, `2`, ... in the order of their first occurrence,
+  the previous name being kept in the `SC:Z:` segment tag
+* the link, containment and path lines refer to the new segment names
+* the FASTA file is exported from the segment lines at the same time
+
+Each output is compressed in its own thread (zlib releases the GIL),
+and only the segment name map is kept in memory.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import IO, TYPE_CHECKING, Self
+
+from pbfbench import gz_reader
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+    from types import TracebackType
+
+_LOGGER = logging.getLogger(__name__)
+
+GFA_SEP = b"\t"
+GFA_EOL_BYTES = b"\r\n"
+GFA_NO_SEQUENCE = b"*"
+GFA_SEGMENT_TYPE = b"S"
+GFA_LINK_TYPE = b"L"
+GFA_CONTAINMENT_TYPE = b"C"
+GFA_PATH_TYPE = b"P"
+GFA_PATH_SEGMENT_SEP = b","
+GFA_PREVIOUS_NAME_TAG = b"SC:Z:"
+
+FASTA_HEADER_PREFIX = b">"
+
+COMPRESS_LEVEL = 6
+
+
+class SegmentNames:
+    """Map of the previous segment names to the normalised ones."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.__new_names: dict[bytes, bytes] = {}
+
+    def __len__(self) -> int:
+        """Get number of segments."""
+        return len(self.__new_names)
+
+    def new_name(self, previous_name: bytes) -> bytes:
+        """Get the normalised name, set it at the first occurrence."""
+        new_name = self.__new_names.get(previous_name)
+        if new_name is None:
+            new_name = str(len(self.__new_names) + 1).encode()
+            self.__new_names[previous_name] = new_name
+        return new_name
+
+
+def normalize(raw_gfa: Path, gfa_gz: Path, fasta_gz: Path) -> int:
+    """Write the normalised gzipped GFA and FASTA files in one pass.
+
+    The raw GFA file can be gzipped.
+    The segments without sequence are not written in the FASTA file.
+
+    Returns
+    -------
+    int
+        Number of segments
+    """
+    segment_names = SegmentNames()
+    number_of_segments = 0
+    with (
+        _open_gfa(raw_gfa) as f_in,
+        _ThreadedGzipWriter(gfa_gz) as gfa_out,
+        _ThreadedGzipWriter(fasta_gz) as fasta_out,
+    ):
+        for line in f_in:
+            line_type, _, _ = line.partition(GFA_SEP)
+            if line_type == GFA_SEGMENT_TYPE:
+                number_of_segments += 1
+                _write_segment(line, segment_names, gfa_out, fasta_out)
+            elif line_type in (GFA_LINK_TYPE, GFA_CONTAINMENT_TYPE):
+                gfa_out.write(_link_line(line, segment_names))
+            elif line_type == GFA_PATH_TYPE:
+                gfa_out.write(_path_line(line, segment_names))
+            else:
+                gfa_out.write(line)
+    _LOGGER.debug("Normalise %d segments of %s", number_of_segments, raw_gfa)
+    return number_of_segments
+
+
+def _write_segment(
+    segment_line: bytes,
+    segment_names: SegmentNames,
+    gfa_out: _ThreadedGzipWriter,
+    fasta_out: _ThreadedGzipWriter,
+) -> None:
+    """Write the renamed segment line and its FASTA record."""
+    previous_name, _, sequence_and_tags = (
+        segment_line[len(GFA_SEGMENT_TYPE + GFA_SEP) :]
+        .rstrip(GFA_EOL_BYTES)
+        .partition(GFA_SEP)
+    )
+    if not sequence_and_tags:
+        sequence_and_tags = GFA_NO_SEQUENCE
+    new_name = segment_names.new_name(previous_name)
+    gfa_out.write(
+        GFA_SEGMENT_TYPE
+        + GFA_SEP
+        + new_name
+        + GFA_SEP
+        + sequence_and_tags
+        + GFA_SEP
+        + GFA_PREVIOUS_NAME_TAG
+        + previous_name
+        + b"\n",
+    )
+    sequence, _, _ = sequence_and_tags.partition(GFA_SEP)
+    if sequence and sequence != GFA_NO_SEQUENCE:
+        fasta_out.write(FASTA_HEADER_PREFIX + new_name + b"\n" + sequence + b"\n")
+
+
+def _link_line(line: bytes, segment_names: SegmentNames) -> bytes:
+    """Rename the two segments of a link or containment line."""
+    fields = line.rstrip(GFA_EOL_BYTES).split(GFA_SEP)
+    fields[1] = segment_names.new_name(fields[1])
+    fields[3] = segment_names.new_name(fields[3])
+    return GFA_SEP.join(fields) + b"\n"
+
+
+def _path_line(line: bytes, segment_names: SegmentNames) -> bytes:
+    """Rename the oriented segments of a path line."""
+    fields = line.rstrip(GFA_EOL_BYTES).split(GFA_SEP)
+    fields[2] = GFA_PATH_SEGMENT_SEP.join(
+        segment_names.new_name(oriented_segment[:-1]) + oriented_segment[-1:]
+        for oriented_segment in fields[2].split(GFA_PATH_SEGMENT_SEP)
+    )
+    return GFA_SEP.join(fields) + b"\n"
+
+
+@contextmanager
+def _open_gfa(gfa_file: Path) -> Iterator[IO[bytes]]:
+    """Open a GFA file, gzipped or not, in binary read mode."""
+    if gfa_file.suffix == ".gz":
+        with gz_reader.open_gz(gfa_file) as f_in:
+            yield f_in
+    else:
+        with gfa_file.open("rb") as f_in:
+            yield f_in
+
+
+class _ThreadedGzipWriter:
+    """Gzipped file writer compressing in a background thread.
+
+    The written bytes are buffered in chunks,
+    and the queue of chunks is bounded to bound the memory.
+    """
+
+    CHUNK_SIZE = 1 << 20
+    MAX_QUEUED_CHUNKS = 8
+
+    def __init__(self, gz_file: Path) -> None:
+        """Initialize."""
+        self.__gz_file = gz_file
+        self.__chunk: list[bytes] = []
+        self.__chunk_size = 0
+        self.__chunks: queue.Queue[bytes | None] = queue.Queue(
+            self.MAX_QUEUED_CHUNKS,
+        )
+        self.__error: BaseException | None = None
+        self.__thread = threading.Thread(target=self.__compress, daemon=True)
+
+    def __enter__(self) -> Self:
+        """Start the compression thread."""
+        self.__thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Flush the last chunk and wait for the compression thread.
+
+        Raises
+        ------
+        OSError
+            The compression thread failed.
+        """
+        self.__flush()
+        self.__chunks.put(None)
+        self.__thread.join()
+        if self.__error is not None and exc_type is None:
+            _err_msg = f"Failed to write {self.__gz_file}"
+            raise OSError(_err_msg) from self.__error
+
+    def write(self, data: bytes) -> None:
+        """Write bytes."""
+        self.__chunk.append(data)
+        self.__chunk_size += len(data)
+        if self.__chunk_size >= self.CHUNK_SIZE:
+            self.__flush()
+
+    def __flush(self) -> None:
+        """Send the current chunk to the compression thread."""
+        if self.__chunk:
+            self.__chunks.put(b"".join(self.__chunk))
+            self.__chunk = []
+            self.__chunk_size = 0
+
+    def __compress(self) -> None:
+        """Compress the chunks until the end sentinel.
+
+        After an error, the chunks are still consumed so that the writer never blocks.
+        """
+        end_reached = False
+        try:
+            with gzip.open(self.__gz_file, "wb", compresslevel=COMPRESS_LEVEL) as f_out:
+                while (chunk := self.__chunks.get()) is not None:
+                    f_out.write(chunk)
+                end_reached = True
+        except BaseException as error:  # noqa: BLE001
+            self.__error = error
+            while not end_reached:
+                end_reached = self.__chunks.get() is None
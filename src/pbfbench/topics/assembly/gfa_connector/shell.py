@@ -0,0 +1,81 @@
+"""GFA connector Bash script logics."""
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import final
+
+import pbfbench.abc.tool.shell as abc_tool_shell
+import pbfbench.shell as sh
+import pbfbench.topics.assembly.gfa_connector.description as gfa_connector_desc
+import pbfbench.topics.assembly.results.items as asm_res_items
+
+
+@final
+class FastaInputLinesBuilder(
+    abc_tool_shell.ArgBashLinesBuilder[asm_res_items.FastaGZ],
+):
+    """Fasta input bash lines builder.
+
+    The raw GFA connector graph is normalised
+    into the assembly GFA and FASTA results with the `normalize` command,
+    in the tool output directory.
+    """
+
+    FASTA_GZ_VAR = sh.Variable("FASTA_GZ")
+
+    FASTA_VAR = sh.Variable("FASTA")
+    RAW_GFA_VAR = sh.Variable("RAW_GFA")
+    OUT_GFA_GZ_VAR = sh.Variable("OUT_GFA_GZ")
+    OUT_FASTA_GZ_VAR = sh.Variable("OUT_FASTA_GZ")
+    NORMALIZE_CMD_VAR = sh.Variable("NORMALIZE_CMD")
+
+    RAW_GFA_NAME = Path("raw_assembly.gfa")
+
+    def __fasta_gz_file(self) -> Path:
+        """Return a gzipped FASTA path with sample name is a sh variable."""
+        return self._input_result.fasta_gz(
+            self._input_data_smp_sh_fs_manager.sample_dir().name,
+        )
+
+    def __fasta_tmp_file(self) -> Path:
+        """Return a tmp FASTA path with sample name is a sh variable."""
+        return self.tmp_dir() / self._input_result.FASTA_GZ_NAME.with_suffix("")
+
+    def init_lines(self) -> Iterator[str]:
+        """Get shell input init lines."""
+        yield self.FASTA_GZ_VAR.set(sh.path_to_str(self.__fasta_gz_file()))
+        yield self.RAW_GFA_VAR.set(
+            sh.path_to_str(self.tmp_dir() / self.RAW_GFA_NAME),
+        )
+        yield self.OUT_GFA_GZ_VAR.set(
+            sh.path_to_str(
+                self.work_exp_sample_dir()
+                / asm_res_items.AsmGraphGZ.ASSEMBLY_GFA_GZ_NAME,
+            ),
+        )
+        yield self.OUT_FASTA_GZ_VAR.set(
+            sh.path_to_str(
+                self.work_exp_sample_dir() / asm_res_items.FastaGZ.FASTA_GZ_NAME,
+            ),
+        )
+        yield self.NORMALIZE_CMD_VAR.set(
+            "("
+            + sh.pbfbench_command(
+                gfa_connector_desc.DESCRIPTION.topic().cmd(),
+                gfa_connector_desc.DESCRIPTION.cmd(),
+                gfa_connector_desc.NORMALIZE_CMD,
+            )
+            + ")",
+        )
+        yield from self.decompress_lines(
+            self.FASTA_GZ_VAR.eval(),
+            self.FASTA_VAR,
+            self.__fasta_tmp_file(),
+        )
+
+    def close_lines(self) -> Iterator[str]:
+        """Get shell input close lines."""
+        yield from self.remove_decompressed_lines(
+            self.FASTA_VAR,
+        )
+        yield f"rm -f {sh.path_to_str(self.RAW_GFA_VAR.eval())}"
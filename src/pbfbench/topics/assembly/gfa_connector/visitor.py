@@ -0,0 +1,39 @@
+"""GFA connector connector module."""
+
+from typing import final
+
+import pbfbench.abc.tool.visitor as abc_tool_visitor
+import pbfbench.topics.assembly.gfa_connector.config as gfa_connector_cfg
+import pbfbench.topics.assembly.gfa_connector.description as gfa_connector_desc
+import pbfbench.topics.assembly.gfa_connector.shell as gfa_connector_sh
+import pbfbench.topics.assembly.results.items as asm_res_items
+import pbfbench.topics.assembly.results.visitor as asm_res_visitor
+import pbfbench.topics.assembly.visitor as asm_visitor
+
+
+@final
+class Connector(
+    abc_tool_visitor.ConnectorWithArguments[
+        gfa_connector_cfg.Names,
+        gfa_connector_cfg.ExpConfig,
+    ],
+):
+    """GFA connector connector."""
+
+    @classmethod
+    def config_type(cls) -> type[gfa_connector_cfg.ExpConfig]:
+        """Get experiment config type."""
+        return gfa_connector_cfg.ExpConfig
+
+
+CONNECTOR = Connector(
+    gfa_connector_desc.DESCRIPTION,
+    {
+        gfa_connector_cfg.Names.FASTA: abc_tool_visitor.ArgumentPath(
+            asm_visitor.Tools,
+            asm_res_visitor.FastaGZ,
+            gfa_connector_sh.FastaInputLinesBuilder,
+        ),
+    },
+    [asm_res_items.FastaGZ, asm_res_items.AsmGraphGZ],
+)
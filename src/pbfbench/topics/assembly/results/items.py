@@ -21,15 +21,28 @@ class FastaGZ(topic_res_items.Original):
         """Get assembly FASTA file."""
         return self._exp_fs_manager.sample_dir(sample_dirname) / self.FASTA_GZ_NAME
 
+    def files(self, sample_dirname: str | Path) -> list[Path]:
+        """Get the result files of a sample."""
+        return [self.fasta_gz(sample_dirname)]
+
 
 @final
 class AsmGraphGZ(topic_res_items.Original):
     """Assembly graph (GFA) gunzip result."""
 
     ASSEMBLY_GFA_GZ_NAME = Path("assembly.gfa.gz")
+    CONTIG_INDEX_NAME = Path("assembly.contig_index.bin")
 
     def gfa_gz(self, sample_dirname: str | Path) -> Path:
         """Get assembly GFA file."""
         return (
             self._exp_fs_manager.sample_dir(sample_dirname) / self.ASSEMBLY_GFA_GZ_NAME
         )
+
+    def files(self, sample_dirname: str | Path) -> list[Path]:
+        """Get the result files of a sample."""
+        return [self.gfa_gz(sample_dirname)]
+
+    def contig_index(self, sample_dirname: str | Path) -> Path:
+        """Get the contig index file of the assembly graph."""
+        return self._exp_fs_manager.sample_dir(sample_dirname) / self.CONTIG_INDEX_NAME
@@ -7,8 +7,12 @@ from __future__ import annotations
 
 import pbfbench.abc.tool.app as abc_tool_app
 import pbfbench.abc.tool.visitor as abc_tool_visitor
+import pbfbench.topics.assembly.results.items as asm_res_items
 import pbfbench.topics.assembly.unicycler.description as unicycler_desc
 
 APP = abc_tool_app.build_application_only_options(
-    abc_tool_visitor.ConnectorOnlyOptions(unicycler_desc.DESCRIPTION),
+    abc_tool_visitor.ConnectorOnlyOptions(
+        unicycler_desc.DESCRIPTION,
+        [asm_res_items.FastaGZ, asm_res_items.AsmGraphGZ],
+    ),
 )
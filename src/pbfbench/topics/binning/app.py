@@ -7,9 +7,15 @@ from __future__ import annotations
 
 import pbfbench.abc.topic.app as abc_topic_app
 import pbfbench.topics.binning.description as topic_desc
-import pbfbench.topics.binning.pangebin_once.app as pangebin_once_app
+import pbfbench.topics.binning.pangebin_once.description as pangebin_once_desc
+from pbfbench import lazy_app
 
 APP = abc_topic_app.build_application(
     topic_desc.DESCRIPTION,
-    [pangebin_once_app.APP],
+    [
+        lazy_app.SubApp.from_tool(
+            pangebin_once_desc.DESCRIPTION,
+            "pbfbench.topics.binning.pangebin_once.app",
+        ),
+    ],
 )
@@ -5,13 +5,22 @@
 
 from __future__ import annotations
 
-from typing import final
+import logging
+from pathlib import Path
+from typing import Annotated, final
 
+import typer
+
+import pbfbench.abc.app as abc_app
 import pbfbench.abc.tool.app as abc_tool_app
 import pbfbench.experiment.config as exp_cfg
 import pbfbench.experiment.file_system as exp_fs
-import pbfbench.topics.binning.pangebin_once.init as pangebin_once_init
+import pbfbench.experiment.options as exp_options
+import pbfbench.samples.items as smp_items
 import pbfbench.topics.binning.pangebin_once.visitor as pangebin_once_visitor
+from pbfbench import root_logging
+
+_LOGGER = logging.getLogger(__name__)
 
 APP = abc_tool_app.build_application_with_arguments(pangebin_once_visitor.CONNECTOR)
 
@@ -23,15 +32,89 @@ class InitApp(abc_tool_app.InitAPP):
     def _init(
         self,
         data_exp_fs_manager: exp_fs.DataManager,
-        _: exp_fs.WorkManager,
+        work_exp_fs_manager: exp_fs.WorkManager,
         config: exp_cfg.ConfigWithArguments,
+        init_options: exp_options.InitOptions,
     ) -> None:
         """Init tool."""
+        # The converters (and pandas) are imported only when the init command runs
+        import pbfbench.topics.binning.pangebin_once.init as pangebin_once_init  # noqa: PLC0415
+
         init_stats = pangebin_once_init.init(
             data_exp_fs_manager,
+            work_exp_fs_manager,
             config,
             self.connector(),
+            init_options,
+        )
+        _LOGGER.info(
+            "Total number of samples: %d\n"
+            "* Number of samples to format the inputs: %d\n"
+            "  * Number of samples which exit with errors: %d\n",
+            init_stats.number_of_samples(),
+            init_stats.number_of_samples_to_format_the_inputs(),
+            len(init_stats.samples_with_errors()),
+        )
+
+
+class InitSampleArguments:
+    """Init sample application arguments."""
+
+    SPECIES_ID = typer.Argument(help="Species ID")
+    SAMPLE_ID = typer.Argument(help="Sample ID")
+
+
+@final
+class InitSampleApp:
+    """Init sample application.
+
+    It is called by the Slurm array tasks of the init command.
+    """
+
+    NAME = abc_app.FinalCommands.INIT_SAMPLE
+
+    def __init__(
+        self,
+        connector: pangebin_once_visitor.Connector,
+    ) -> None:
+        """Initialize."""
+        self.__connector = connector
+
+    def help(self) -> str:
+        """Get help string."""
+        return (
+            "Convert the inputs of one sample"
+            f" for {self.__connector.description().name()} tool."
+        )
+
+    def main(
+        self,
+        data_dir: Annotated[Path, abc_tool_app.Arguments.DATA_DIR],
+        exp_config_yaml: Annotated[Path, abc_tool_app.Arguments.EXP_CONFIG_YAML],
+        species_id: Annotated[str, InitSampleArguments.SPECIES_ID],
+        sample_id: Annotated[str, InitSampleArguments.SAMPLE_ID],
+        debug: Annotated[bool, root_logging.OPT_DEBUG] = False,
+    ) -> None:
+        """Convert the inputs of one sample."""
+        root_logging.init_logger(_LOGGER, "Convert the inputs of one sample", debug)
+        import pbfbench.topics.binning.pangebin_once.init as pangebin_once_init  # noqa: PLC0415
+
+        exp_config = self.__connector.read_config(exp_config_yaml)
+        pangebin_once_init.init_sample(
+            exp_fs.DataManager(
+                data_dir.resolve(),
+                self.__connector.description(),
+                exp_config.name(),
+            ),
+            exp_config,
+            smp_items.Item(species_id, sample_id),
         )
 
 
 abc_tool_app.add_init(APP, InitApp(pangebin_once_visitor.CONNECTOR))
+_init_sample_app = InitSampleApp(pangebin_once_visitor.CONNECTOR)
+APP.command(
+    name=_init_sample_app.NAME,
+    help=_init_sample_app.help(),
+    hidden=True,
+)(_init_sample_app.main)
@@ -3,25 +3,41 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import as_completed
 from typing import TYPE_CHECKING
 
+import rich.progress as rich_prog
+
+import pbfbench.abc.app as abc_app
 import pbfbench.abc.tool.config as abc_tool_cfg
 import pbfbench.abc.tool.visitor as abc_tool_visitor
 import pbfbench.abc.topic.results.items as abc_topic_res_items
 import pbfbench.experiment.config as exp_cfg
 import pbfbench.experiment.file_system as exp_fs
 import pbfbench.experiment.iter as exp_iter
+import pbfbench.experiment.options as exp_options
+import pbfbench.experiment.run as exp_run
+import pbfbench.experiment.shell as exp_shell
+import pbfbench.experiment.trace as exp_trace
 import pbfbench.samples.file_system as smp_fs
+import pbfbench.samples.shell as smp_sh
+import pbfbench.shell as sh
 import pbfbench.topics.binning.pangebin_once.config as pangebin_once_cfg
 import pbfbench.topics.plasmidness.pbf_input.results as plm_pbf_in_res
+import pbfbench.topics.plasmidness.plasclass.plasbin_flow as plasclass_pbf
 import pbfbench.topics.plasmidness.plasgraph2.plasbin_flow as plasgraph2_pbf
 import pbfbench.topics.plasmidness.visitor as plm_visitor
 import pbfbench.topics.seeds.pbf_input.results as seeds_pbf_in_res
 import pbfbench.topics.seeds.platon.plasbin_flow as platon_pbf
 import pbfbench.topics.seeds.visitor as seeds_visitor
+from pbfbench import root_logging
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable
+
+    import pbfbench.samples.items as smp_items
+
+    type ConvertFunction = Callable[[exp_fs.DataManager, smp_items.Item], None]
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -79,15 +95,39 @@ class InitStats:
         self.__number_of_samples_to_format_the_inputs += addition
 
 
+class _InputConversion:
+    """Conversion of the input results into PlasBin-flow formatted results."""
+
+    def __init__(
+        self,
+        convert_function: ConvertFunction,
+        in_data_exp_fs_manager: exp_fs.DataManager,
+        formatted_result: abc_topic_res_items.Formatted,
+    ) -> None:
+        """Initialize."""
+        self.__convert_function = convert_function
+        self.__in_data_exp_fs_manager = in_data_exp_fs_manager
+        self.__formatted_result = formatted_result
+
+    def convert_function(self) -> ConvertFunction:
+        """Get convert function."""
+        return self.__convert_function
+
+    def in_data_exp_fs_manager(self) -> exp_fs.DataManager:
+        """Get input data experiment file system manager."""
+        return self.__in_data_exp_fs_manager
+
+    def formatted_result(self) -> abc_topic_res_items.Formatted:
+        """Get formatted result."""
+        return self.__formatted_result
+
+
 # REFACTOR try to generalize
-def init(
+def _input_conversions(
     data_exp_fs_manager: exp_fs.DataManager,
     exp_config: exp_cfg.ConfigWithArguments,
-    tool_connector: abc_tool_visitor.ConnectorWithArguments,
-) -> InitStats:
-    """Init pangebin-once."""
-    init_stats = InitStats.new(data_exp_fs_manager)
-
+) -> list[_InputConversion]:
+    """Get the seeds and the plasmidness input conversions."""
     #
     # Seeds
     #
@@ -105,29 +145,15 @@ def init(
         seeds_tool.to_description(),
         seeds_arg.exp_name(),
     )
-    samples_to_format_the_seeds = _get_samples_to_format_the_inputs(
-        data_exp_fs_manager,
-        seeds_pbf_in_res.Seeds(seeds_in_data_exp_fs_manager),
-        init_stats,
-    )
     match seeds_tool:
         case seeds_visitor.Tools.PLATON:
-            convert_function = platon_pbf.convert
+            seeds_convert_function = platon_pbf.convert
         # FIXME force match cover with return
 
-    for sample in samples_to_format_the_seeds:
-        # FIXME not good usage of init stats, think in another way
-        init_stats.add_samples_to_format_the_inputs(1)
-        convert_function(
-            seeds_in_data_exp_fs_manager,
-            sample.item(),
-        )
-
     #
     # Plasmidness
     #
     # REFACTOR same refactor comment as above
-
     plm_arg = _tool_cfg.arguments()[pangebin_once_cfg.Names.PLASMIDNESS]
     plm_tool = plm_visitor.Tools(plm_arg.tool_name())
     plm_in_data_exp_fs_manager = exp_fs.DataManager(
@@ -137,26 +163,315 @@ def init(
     )
     match plm_tool:
         case plm_visitor.Tools.PLASCLASS:
-            raise NotImplementedError  # TODO implement for plasclass
+            plm_convert_function = plasclass_pbf.convert
         case plm_visitor.Tools.PLASGRAPH2:
-            convert_function = plasgraph2_pbf.convert
+            plm_convert_function = plasgraph2_pbf.convert
         # REFACTOR force match cover with return
 
-    samples_to_format_the_plm = _get_samples_to_format_the_inputs(
-        data_exp_fs_manager,
-        plm_pbf_in_res.Plasmidness(plm_in_data_exp_fs_manager),
-        init_stats,
-    )
-    for sample in samples_to_format_the_plm:
-        # REFACTOR (1) here we simulate that Visitor
-        convert_function(
+    return [
+        _InputConversion(
+            seeds_convert_function,
+            seeds_in_data_exp_fs_manager,
+            seeds_pbf_in_res.Seeds(seeds_in_data_exp_fs_manager),
+        ),
+        _InputConversion(
+            plm_convert_function,
             plm_in_data_exp_fs_manager,
-            sample.item(),
+            plm_pbf_in_res.Plasmidness(plm_in_data_exp_fs_manager),
+        ),
+    ]
+
+
+def init(
+    data_exp_fs_manager: exp_fs.DataManager,
+    work_exp_fs_manager: exp_fs.WorkManager,
+    exp_config: exp_cfg.ConfigWithArguments,
+    tool_connector: abc_tool_visitor.ConnectorWithArguments,
+    init_options: exp_options.InitOptions | None = None,
+) -> InitStats:
+    """Init pangebin-once.
+
+    The phase timing trace is written in the data experiment directory,
+    even if the init fails.
+    """
+    if init_options is None:
+        init_options = exp_options.InitOptions()
+
+    with (
+        exp_trace.writing(data_exp_fs_manager.init_trace_json()) as tracer,
+        tracer.span("init experiment"),
+    ):
+        return _init(
+            data_exp_fs_manager,
+            work_exp_fs_manager,
+            exp_config,
+            tool_connector,
+            init_options,
         )
 
+
+def _init(
+    data_exp_fs_manager: exp_fs.DataManager,
+    work_exp_fs_manager: exp_fs.WorkManager,
+    exp_config: exp_cfg.ConfigWithArguments,
+    tool_connector: abc_tool_visitor.ConnectorWithArguments,
+    init_options: exp_options.InitOptions,
+) -> InitStats:
+    """Init pangebin-once with timing spans."""
+    with exp_trace.span("status scan"):
+        init_stats = InitStats.new(data_exp_fs_manager)
+
+        input_conversions = _input_conversions(data_exp_fs_manager, exp_config)
+        conversions_samples = [
+            (
+                input_conversion,
+                _get_samples_to_format_the_inputs(
+                    data_exp_fs_manager,
+                    input_conversion.formatted_result(),
+                    init_stats,
+                ),
+            )
+            for input_conversion in input_conversions
+        ]
+        exp_trace.count("samples scanned", init_stats.number_of_samples())
+
+    if init_options.use_sbatch():
+        _convert_samples_with_sbatch(
+            data_exp_fs_manager,
+            work_exp_fs_manager,
+            exp_config,
+            tool_connector,
+            _union_of_samples(samples for _, samples in conversions_samples),
+            init_stats=init_stats,
+        )
+        return init_stats
+
+    # REFACTOR (1) here we simulate that Visitor
+    for input_conversion, samples_to_format_the_inputs in conversions_samples:
+        with exp_trace.span(
+            "convert "
+            + input_conversion.in_data_exp_fs_manager().tool_description().name(),
+        ):
+            _convert_samples(
+                input_conversion.convert_function(),
+                input_conversion.in_data_exp_fs_manager(),
+                input_conversion.formatted_result(),
+                samples_to_format_the_inputs,
+                init_stats,
+                init_options.jobs(),
+            )
+            exp_trace.count("samples converted", len(samples_to_format_the_inputs))
+
     return init_stats
 
 
+def init_sample(
+    data_exp_fs_manager: exp_fs.DataManager,
+    exp_config: exp_cfg.ConfigWithArguments,
+    sample_item: smp_items.Item,
+) -> None:
+    """Convert the inputs of one sample which are done but not yet formatted.
+
+    The conversion errors are not caught.
+    """
+    for input_conversion in _input_conversions(data_exp_fs_manager, exp_config):
+        if exp_iter.sample_to_format_result(
+            input_conversion.formatted_result(),
+            sample_item,
+        ):
+            _convert_sample(
+                input_conversion.convert_function(),
+                input_conversion.in_data_exp_fs_manager(),
+                input_conversion.formatted_result(),
+                sample_item,
+            )
+
+
+def _union_of_samples(
+    samples_lists: Iterable[list[smp_fs.RowNumberedItem]],
+) -> list[smp_fs.RowNumberedItem]:
+    """Get the samples of all the lists, sorted by row number and without repeat."""
+    row_to_sample: dict[int, smp_fs.RowNumberedItem] = {}
+    for samples in samples_lists:
+        for sample in samples:
+            row_to_sample.setdefault(sample.row_number(), sample)
+    return [row_to_sample[row_number] for row_number in sorted(row_to_sample)]
+
+
+def _convert_samples_with_sbatch(  # noqa: PLR0913
+    data_exp_fs_manager: exp_fs.DataManager,
+    work_exp_fs_manager: exp_fs.WorkManager,
+    exp_config: exp_cfg.ConfigWithArguments,
+    tool_connector: abc_tool_visitor.ConnectorWithArguments,
+    samples_to_format_the_inputs: list[smp_fs.RowNumberedItem],
+    *,
+    init_stats: InitStats,
+) -> None:
+    """Convert the sample inputs in a Slurm job array, one task per sample.
+
+    The scripts and the Slurm logs stay in the `init` sub-directory
+    of the working experiment directory,
+    which is not the one of the experiment `run` command.
+    """
+    if not samples_to_format_the_inputs:
+        _LOGGER.info("No samples to format the inputs")
+        return
+    work_exp_fs_manager = work_exp_fs_manager.init_work_manager()
+
+    with exp_trace.span("script generation"):
+        _create_init_sample_script(
+            data_exp_fs_manager,
+            work_exp_fs_manager,
+            exp_config,
+            tool_connector,
+            samples_to_format_the_inputs,
+        )
+
+    _LOGGER.info(
+        "Number of samples sent to sbatch: %d",
+        len(samples_to_format_the_inputs),
+    )
+    exp_run.submit_sbatch_script(work_exp_fs_manager)
+
+    for sample, status, job_id in exp_run.wait_all_job_finish(
+        samples_to_format_the_inputs,
+        work_exp_fs_manager,
+    ):
+        if exp_run.slurm_status_equals_an_exp_sample_error(status):
+            _LOGGER.error(
+                "Error while converting the inputs of sample %s (see %s)",
+                sample.item().exp_sample_id(),
+                work_exp_fs_manager.sbatch_err_file(job_id),
+            )
+            init_stats.samples_with_errors().append(sample.item().exp_sample_id())
+
+    _LOGGER.info(
+        "The init scripts and Slurm logs are in: %s",
+        work_exp_fs_manager.exp_dir(),
+    )
+
+
+def _create_init_sample_script(
+    data_exp_fs_manager: exp_fs.DataManager,
+    work_exp_fs_manager: exp_fs.WorkManager,
+    exp_config: exp_cfg.ConfigWithArguments,
+    tool_connector: abc_tool_visitor.ConnectorWithArguments,
+    samples_to_format_the_inputs: list[smp_fs.RowNumberedItem],
+) -> None:
+    """Create the sbatch script calling the init-sample command for each sample."""
+    exp_run.init_experiment_file_systems(
+        data_exp_fs_manager,
+        work_exp_fs_manager,
+        exp_config,
+    )
+    work_exp_fs_manager.tmp_slurm_logs_dir().mkdir(parents=True, exist_ok=True)
+
+    tool_description = tool_connector.description()
+    exp_shell.create_run_script(
+        data_exp_fs_manager,
+        work_exp_fs_manager,
+        samples_to_format_the_inputs,
+        exp_config.slurm_config(),
+        [
+            sh.pbfbench_command(
+                tool_description.topic().cmd(),
+                tool_description.cmd(),
+                abc_app.FinalCommands.INIT_SAMPLE,
+                sh.path_to_str(data_exp_fs_manager.root_dir()),
+                sh.path_to_str(work_exp_fs_manager.config_yaml()),
+                sh.path_to_str(smp_sh.SpeSmpIDLinesBuilder.SPECIES_ID_VAR.eval()),
+                sh.path_to_str(smp_sh.SpeSmpIDLinesBuilder.SAMPLE_ID_VAR.eval()),
+            ),
+        ],
+        with_tool_env=False,
+    )
+
+
+def _convert_samples(  # noqa: PLR0913, PLR0917
+    convert_function: ConvertFunction,
+    in_data_exp_fs_manager: exp_fs.DataManager,
+    formatted_result: abc_topic_res_items.Formatted,
+    samples_to_format_the_inputs: list[smp_fs.RowNumberedItem],
+    init_stats: InitStats,
+    jobs: int,
+) -> None:
+    """Convert the sample inputs with at most `jobs` processes.
+
+    The samples for which the conversion fails are added to the init stats.
+    """
+    with rich_prog.Progress(console=root_logging.CONSOLE) as progress:
+        converting_task = progress.add_task(
+            f"Converting {in_data_exp_fs_manager.tool_description().name()} inputs",
+            total=len(samples_to_format_the_inputs),
+        )
+        if jobs <= 1:
+            for sample in samples_to_format_the_inputs:
+                try:
+                    _convert_sample(
+                        convert_function,
+                        in_data_exp_fs_manager,
+                        formatted_result,
+                        sample.item(),
+                    )
+                except Exception as error:  # noqa: BLE001
+                    _add_sample_with_error(init_stats, sample, error)
+                progress.advance(converting_task)
+            return
+
+        with root_logging.process_pool(jobs) as executor:
+            future_to_sample = {
+                executor.submit(
+                    _convert_sample,
+                    convert_function,
+                    in_data_exp_fs_manager,
+                    formatted_result,
+                    sample.item(),
+                ): sample
+                for sample in samples_to_format_the_inputs
+            }
+            for future in as_completed(future_to_sample):
+                try:
+                    future.result()
+                except Exception as error:  # noqa: BLE001
+                    _add_sample_with_error(init_stats, future_to_sample[future], error)
+                progress.advance(converting_task)
+
+
+def _convert_sample(
+    convert_function: ConvertFunction,
+    in_data_exp_fs_manager: exp_fs.DataManager,
+    formatted_result: abc_topic_res_items.Formatted,
+    sample_item: smp_items.Item,
+) -> None:
+    """Convert the inputs of one sample.
+
+    If the conversion fails, the partially written formatted files are removed,
+    so that the sample is converted again by the next init.
+    """
+    try:
+        with root_logging.log_context(sample=sample_item.exp_sample_id()):
+            convert_function(in_data_exp_fs_manager, sample_item)
+    except BaseException:
+        for formatted_file in formatted_result.files(sample_item.exp_sample_id()):
+            formatted_file.unlink(missing_ok=True)
+        raise
+
+
+def _add_sample_with_error(
+    init_stats: InitStats,
+    sample: smp_fs.RowNumberedItem,
+    error: Exception,
+) -> None:
+    """Log the conversion error of a sample and add it to the init stats."""
+    with root_logging.log_context(sample=sample.item().exp_sample_id()):
+        _LOGGER.error(
+            "Error while converting the inputs of sample %s: %r",
+            sample.item().exp_sample_id(),
+            error,
+        )
+    init_stats.samples_with_errors().append(sample.item().exp_sample_id())
+
+
 def _get_samples_to_format_the_inputs(
     data_exp_fs_manager: exp_fs.DataManager,
     formatted_result_builder: abc_topic_res_items.Formatted,
@@ -7,10 +7,20 @@ from __future__ import annotations
 
 import pbfbench.abc.topic.app as abc_topic_app
 import pbfbench.topics.plasmidness.description as plasmidness_desc
-import pbfbench.topics.plasmidness.plasclass.app as plasclass_app
-import pbfbench.topics.plasmidness.plasgraph2.app as plasgraphtwo_app
+import pbfbench.topics.plasmidness.plasclass.description as plasclass_desc
+import pbfbench.topics.plasmidness.plasgraph2.description as plasgraphtwo_desc
+from pbfbench import lazy_app
 
 APP = abc_topic_app.build_application(
     plasmidness_desc.DESCRIPTION,
-    [plasclass_app.APP, plasgraphtwo_app.APP],
+    [
+        lazy_app.SubApp.from_tool(
+            plasclass_desc.DESCRIPTION,
+            "pbfbench.topics.plasmidness.plasclass.app",
+        ),
+        lazy_app.SubApp.from_tool(
+            plasgraphtwo_desc.DESCRIPTION,
+            "pbfbench.topics.plasmidness.plasgraph2.app",
+        ),
+    ],
 )
@@ -0,0 +1,158 @@
+"""Persistent contig index of the assembly graphs.
+
+The contig table of an assembly graph is stored in a small binary columnar file
+next to the gzipped GFA, so that the converters do not parse the GFA again.
+
+Binary format (little-endian):
+
+* header: magic, version, GFA size, GFA modification time (ns),
+  assembler name size, number of contigs, IDs block size, names block size
+* assembler name (UTF-8)
+* lengths (unsigned 64-bit integers)
+* IDs block, then names block (UTF-8, newline separated)
+
+The index is invalidated when the size, the modification time of the GFA
+or the assembler differ.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING
+
+import pbfbench.topics.plasmidness.pbf_input.ops as plm_pbf_in_ops
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pbfbench.topics.assembly.visitor as asm_visitor
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"PBFCIDX\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIQQIQQQ")
+LENGTH_TYPECODE = "Q"
+STR_BLOCK_SEP = "\n"
+
+
+def load_or_build(
+    gfa_gz: Path,
+    index_file: Path,
+    assembler: asm_visitor.Tools,
+) -> plm_pbf_in_ops.ContigTable:
+    """Load the contig table from the index, or parse the GFA and write the index.
+
+    If the index cannot be written (e.g. read-only directory),
+    the parsed contig table is still returned.
+    """
+    contig_table = load(gfa_gz, index_file, assembler)
+    if contig_table is not None:
+        return contig_table
+    _LOGGER.debug("Build the contig index of %s", gfa_gz)
+    contig_table = plm_pbf_in_ops.parse_gfa(gfa_gz, assembler)
+    try:
+        write(contig_table, gfa_gz, index_file, assembler)
+    except OSError:
+        _LOGGER.warning("Cannot write the contig index %s", index_file)
+    return contig_table
+
+
+def load(
+    gfa_gz: Path,
+    index_file: Path,
+    assembler: asm_visitor.Tools,
+) -> plm_pbf_in_ops.ContigTable | None:
+    """Load the contig table from the index if it is up to date."""
+    try:
+        with index_file.open("rb") as f_in:
+            index_bytes = f_in.read()
+    except FileNotFoundError:
+        return None
+    if len(index_bytes) < HEADER.size:
+        return None
+    (
+        magic,
+        version,
+        gfa_size,
+        gfa_mtime_ns,
+        assembler_size,
+        number_of_contigs,
+        ids_size,
+        names_size,
+    ) = HEADER.unpack_from(index_bytes)
+    gfa_stat = gfa_gz.stat()
+    offset = HEADER.size
+    assembler_name = index_bytes[offset : offset + assembler_size].decode()
+    if (
+        magic != MAGIC
+        or version != VERSION
+        or gfa_size != gfa_stat.st_size
+        or gfa_mtime_ns != gfa_stat.st_mtime_ns
+        or assembler_name != str(assembler)
+    ):
+        return None
+    offset += assembler_size
+
+    lengths: array[int] = array(LENGTH_TYPECODE)
+    lengths_size = number_of_contigs * lengths.itemsize
+    lengths.frombytes(index_bytes[offset : offset + lengths_size])
+    if sys.byteorder != "little":
+        lengths.byteswap()
+    offset += lengths_size
+    ids = _split_str_block(index_bytes[offset : offset + ids_size], number_of_contigs)
+    offset += ids_size
+    names = _split_str_block(
+        index_bytes[offset : offset + names_size],
+        number_of_contigs,
+    )
+    return plm_pbf_in_ops.ContigTable(ids, names, lengths)
+
+
+def write(
+    contig_table: plm_pbf_in_ops.ContigTable,
+    gfa_gz: Path,
+    index_file: Path,
+    assembler: asm_visitor.Tools,
+) -> None:
+    """Write the contig index atomically."""
+    gfa_stat = gfa_gz.stat()
+    assembler_bytes = str(assembler).encode()
+    ids_bytes = STR_BLOCK_SEP.join(contig_table.ids()).encode()
+    names_bytes = STR_BLOCK_SEP.join(contig_table.names()).encode()
+    lengths = contig_table.lengths()
+    if lengths.typecode != LENGTH_TYPECODE or sys.byteorder != "little":
+        lengths = array(LENGTH_TYPECODE, lengths)
+    if sys.byteorder != "little":
+        lengths.byteswap()
+
+    tmp_index_file = index_file.with_name(f".{index_file.name}.{os.getpid()}.tmp")
+    with tmp_index_file.open("wb") as f_out:
+        f_out.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                gfa_stat.st_size,
+                gfa_stat.st_mtime_ns,
+                len(assembler_bytes),
+                len(contig_table),
+                len(ids_bytes),
+                len(names_bytes),
+            ),
+        )
+        f_out.write(assembler_bytes)
+        f_out.write(lengths.tobytes())
+        f_out.write(ids_bytes)
+        f_out.write(names_bytes)
+    tmp_index_file.replace(index_file)
+
+
+def _split_str_block(block: bytes, number_of_strings: int) -> list[str]:
+    """Split a newline separated string block."""
+    if number_of_strings == 0:
+        return []
+    return block.decode().split(STR_BLOCK_SEP)
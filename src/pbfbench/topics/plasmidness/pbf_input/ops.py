@@ -1,43 +1,143 @@
 """PlasBin-flow plasmidness input operations logics."""
 
-import gzip
-from pathlib import Path
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
 
 import pbfbench.topics.assembly.visitor as asm_visitor
+from pbfbench import gz_reader
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+GFA_SEGMENT_PREFIX = b"S\t"
+GFA_SEP = b"\t"
+GFA_LENGTH_TAG = b"\tLN:i:"
+GFA_NO_SEQUENCE = b"*"
+GFA_EOL_BYTES = b"\r\n"
+
+# Plasmidness of the contigs without plasmidness score
+DEFAULT_PLASMIDNESS = 0.5
+
+# GFA connector segment IDs are `FASTA_NAME:START-END`
+GFA_CONNECTOR_SUBSEQ_SEP = ":"
+
+
+class ContigTable:
+    """Columnar table of the assembly graph contigs (GFA segments).
+
+    * `ids`: GFA segment IDs
+    * `names`: names of the contigs in the assembly FASTA
+    * `lengths`: segment lengths
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        names: list[str],
+        lengths: array[int],
+    ) -> None:
+        """Initialize."""
+        self.__ids = ids
+        self.__names = names
+        self.__lengths = lengths
+
+    def ids(self) -> list[str]:
+        """Get segment IDs."""
+        return self.__ids
+
+    def names(self) -> list[str]:
+        """Get FASTA contig names."""
+        return self.__names
+
+    def lengths(self) -> array[int]:
+        """Get segment lengths."""
+        return self.__lengths
+
+    def __len__(self) -> int:
+        """Get number of contigs."""
+        return len(self.__ids)
+
+    def __iter__(self) -> Iterator[tuple[str, str, int]]:
+        """Iterate over the contig rows."""
+        return zip(self.__ids, self.__names, self.__lengths, strict=True)
+
+
+def parse_gfa(gfa_gz: Path, assembler: asm_visitor.Tools) -> ContigTable:
+    """Parse the segments of a gzipped GFA file.
+
+    Only the first fields of the segment lines are read,
+    the length is given by the `LN:i:` tag if present,
+    otherwise by the sequence size.
+    The file is decompressed with the configured `gz_reader` backend.
+
+    Raises
+    ------
+    ValueError
+        Unknown assembler.
+    """
+    match assembler:
+        case asm_visitor.Tools.GFA_CONNECTOR:
+            to_fasta_name = _gfa_connector_fasta_name
+        case asm_visitor.Tools.UNICYCLER:
+            to_fasta_name = _same_fasta_name
+        case _:
+            _err_msg = f"Unknown assembler {assembler}"
+            raise ValueError(_err_msg)
+
+    ids: list[str] = []
+    names: list[str] = []
+    lengths: array[int] = array("Q")
+    with gz_reader.open_gz(gfa_gz) as f_in:
+        for line in f_in:
+            if not line.startswith(GFA_SEGMENT_PREFIX):
+                continue
+            segment_id, length = _segment_id_and_length(line)
+            ids.append(segment_id)
+            names.append(to_fasta_name(segment_id))
+            lengths.append(length)
+    return ContigTable(ids, names, lengths)
+
+
+def _segment_id_and_length(segment_line: bytes) -> tuple[str, int]:
+    """Get the ID and the length of a GFA segment line without copying the sequence."""
+    line_end = len(segment_line)
+    while line_end > 0 and segment_line[line_end - 1] in GFA_EOL_BYTES:
+        line_end -= 1
+    id_start = len(GFA_SEGMENT_PREFIX)
+    id_end = segment_line.find(GFA_SEP, id_start, line_end)
+    if id_end == -1:
+        return segment_line[id_start:line_end].decode(), 0
+    segment_id = segment_line[id_start:id_end].decode()
+
+    sequence_end = segment_line.find(GFA_SEP, id_end + 1, line_end)
+    if sequence_end == -1:
+        sequence_end = line_end
+    else:
+        length_tag_start = segment_line.find(GFA_LENGTH_TAG, sequence_end, line_end)
+        if length_tag_start != -1:
+            length_start = length_tag_start + len(GFA_LENGTH_TAG)
+            length_end = segment_line.find(GFA_SEP, length_start, line_end)
+            if length_end == -1:
+                length_end = line_end
+            return segment_id, int(segment_line[length_start:length_end])
+
+    sequence_length = sequence_end - id_end - 1
+    if sequence_length == len(GFA_NO_SEQUENCE) and segment_line.startswith(
+        GFA_NO_SEQUENCE,
+        id_end + 1,
+    ):
+        return segment_id, 0
+    return segment_id, sequence_length
+
+
+def _gfa_connector_fasta_name(segment_id: str) -> str:
+    """Get the FASTA contig name of a GFA connector segment."""
+    return segment_id.split(GFA_CONNECTOR_SUBSEQ_SEP, maxsplit=1)[0]
 
 
-def parse_gfa(gfa_gz: Path, assembler: asm_visitor.Tools) -> dict:
-    """Parse GFA file and return contigs dictionary."""
-    contigs_dict = {}
-    with gzip.open(gfa_gz, "r") as f:
-        for line in f:
-            gfa_line_array = line.decode()
-            if gfa_line_array[0] == "S":
-                match assembler:
-                    case asm_visitor.Tools.GFA_CONNECTOR:
-                        details = gfa_line_array[:-1].split("\t")
-                        contig_id = details[1]
-                        contig_name = (
-                            details[0] + details[1] + "_" + "_".join(details[3:])
-                        )
-                        # FIXME [ANIKET] why?
-                        # Because contig name in FASTA and GFA differ
-                        # GFA contig names have ':' in them to figure out a GFA segment
-                        # is a subsequence of a FASTA contig
-                        # FIXME [ANIKET] why renamed contig name for SKESA (_ instead of :)
-                    case asm_visitor.Tools.UNICYCLER:
-                        details = gfa_line_array.split("\t")
-                        contig_id = details[1]
-                        contig_name = str(contig_id)
-                    case _:
-                        _err_msg = f"Unknown assembler {assembler}"
-                        raise ValueError(_err_msg)
-
-                contigs_dict[contig_id] = {
-                    "Prob_Chromosome": 0.5,
-                    "Prob_Plasmid": 0.5,
-                    "Prediction": "Chromosome",
-                    "Contig_name": contig_name,
-                    "Contig_length": len(details[2]),
-                }
-    return contigs_dict
+def _same_fasta_name(segment_id: str) -> str:
+    """Get the FASTA contig name of a segment having the same name."""
+    return segment_id
@@ -19,6 +19,10 @@ class Plasmidness(abc_topic_res_items.Formatted):
         """Get plasmidness TSV file."""
         return self._exp_fs_manager.sample_dir(sample_dirname) / self.TSV_NAME
 
+    def files(self, sample_dirname: str | Path) -> list[Path]:
+        """Get the result files of a sample."""
+        return [self.tsv(sample_dirname)]
+
     def check(self, sample_item: smp_items.Item) -> smp_status.Status:
         """Check input(s)."""
         if self.tsv(sample_item.exp_sample_id()).exists():
@@ -0,0 +1,106 @@
+"""PlasBin-flow result formatting module."""
+
+from pathlib import Path
+
+import pandas as pd
+
+import pbfbench.experiment.file_system as exp_fs
+import pbfbench.samples.items as smp_items
+import pbfbench.topics.assembly.results.items as asm_res_items
+import pbfbench.topics.assembly.visitor as asm_visitor
+import pbfbench.topics.plasmidness.pbf_input.contig_index as plm_pbf_in_ctg_idx
+import pbfbench.topics.plasmidness.pbf_input.ops as plm_pbf_in_ops
+import pbfbench.topics.plasmidness.pbf_input.results as plm_pbf_in_res
+import pbfbench.topics.plasmidness.plasclass.config as plasclass_cfg
+import pbfbench.topics.plasmidness.plasclass.results as plasclass_res
+
+# PlasClass TSV has no header: FASTA contig name, plasmid probability
+PLASCLASS_NAME_COL = "name"
+PLASCLASS_PROBABILITY_COL = "probability"
+
+
+def convert(
+    input_data_exp_fs_manager: exp_fs.DataManager,
+    sample_item: smp_items.Item,
+) -> None:
+    """Convert plasmid probabilities to PBF format."""
+    plm_res = plasclass_res.PlasmidProbabilities(input_data_exp_fs_manager)
+    pbf_plm_res = plm_pbf_in_res.Plasmidness(
+        input_data_exp_fs_manager,
+    )
+    plasclass_exp_cfg = plasclass_cfg.ExpConfig.from_yaml(
+        input_data_exp_fs_manager.config_yaml(),
+    )
+    # REFACTOR (1) same as plASgraph2: the assembly graph is the one
+    # of the assembly experiment which provides the FASTA
+    # ---
+    fasta_arg = plasclass_exp_cfg.tool_configs().arguments()[plasclass_cfg.Names.FASTA]
+    asm_tool = asm_visitor.Tools.from_description(
+        plasclass_cfg.Names.FASTA.topic_tools()(
+            fasta_arg.tool_name(),
+        ).to_description(),
+    )
+
+    gfa_gz = asm_res_items.AsmGraphGZ(
+        exp_fs.DataManager(
+            input_data_exp_fs_manager.root_dir(),
+            asm_tool.to_description(),
+            fasta_arg.exp_name(),
+        ),
+    )
+    # ---
+
+    contig_table = plm_pbf_in_ctg_idx.load_or_build(
+        gfa_gz.gfa_gz(sample_item.exp_sample_id()),
+        gfa_gz.contig_index(sample_item.exp_sample_id()),
+        asm_tool,
+    )
+    to_pbf_plasmidness(
+        plm_res.tsv(sample_item.exp_sample_id()),
+        contig_table,
+    ).to_csv(
+        pbf_plm_res.tsv(sample_item.exp_sample_id()),
+        sep="\t",
+        header=False,
+        index=True,
+    )
+
+
+def to_pbf_plasmidness(
+    plasclass_tsv: Path,
+    contig_table: plm_pbf_in_ops.ContigTable,
+) -> pd.Series:
+    """Join the PlasClass probabilities with the assembly graph contigs.
+
+    The PlasClass contig names are the FASTA ones,
+    they are mapped to the GFA segment IDs with the contig table names
+    (several GFA connector segments can share the same FASTA contig).
+    The contigs without probability have the default plasmidness.
+    If a contig is scored several times, the last score is kept.
+
+    Returns
+    -------
+    pd.Series
+        Plasmid probabilities indexed by the contig IDs, in the GFA order.
+    """
+    plcl_df = pd.read_csv(
+        plasclass_tsv,
+        sep="\t",
+        header=None,
+        names=[PLASCLASS_NAME_COL, PLASCLASS_PROBABILITY_COL],
+        usecols=[0, 1],
+        dtype={PLASCLASS_NAME_COL: str, PLASCLASS_PROBABILITY_COL: float},
+    )
+    plasmid_scores = pd.Series(
+        plcl_df[PLASCLASS_PROBABILITY_COL].to_numpy(),
+        index=plcl_df[PLASCLASS_NAME_COL].str.split(" ", n=1).str[0],
+    )
+    plasmid_scores = plasmid_scores[~plasmid_scores.index.duplicated(keep="last")]
+    segment_scores = pd.Series(
+        plasmid_scores.reindex(
+            contig_table.names(),
+            fill_value=plm_pbf_in_ops.DEFAULT_PLASMIDNESS,
+        ).to_numpy(),
+        index=pd.Index(contig_table.ids()),
+    )
+    return segment_scores[~segment_scores.index.duplicated(keep="first")]
@@ -7,6 +7,7 @@ import pbfbench.topics.assembly.results.visitor as asm_res_visitor
 import pbfbench.topics.assembly.visitor as asm_visitor
 import pbfbench.topics.plasmidness.plasclass.config as plasclass_cfg
 import pbfbench.topics.plasmidness.plasclass.description as plasclass_desc
+import pbfbench.topics.plasmidness.plasclass.results as plasclass_res
 import pbfbench.topics.plasmidness.plasclass.shell as plasclass_sh
 
 
@@ -34,4 +35,5 @@ CONNECTOR = Connector(
             plasclass_sh.FastaInputLinesBuilder,
         ),
     },
+    [plasclass_res.PlasmidProbabilities],
 )
@@ -1,16 +1,22 @@
 """PlasBin-flow result formatting module."""
 
+from pathlib import Path
+
 import pandas as pd
 
 import pbfbench.experiment.file_system as exp_fs
 import pbfbench.samples.items as smp_items
 import pbfbench.topics.assembly.results.items as asm_res_items
 import pbfbench.topics.assembly.visitor as asm_visitor
+import pbfbench.topics.plasmidness.pbf_input.contig_index as plm_pbf_in_ctg_idx
 import pbfbench.topics.plasmidness.pbf_input.ops as plm_pbf_in_ops
 import pbfbench.topics.plasmidness.pbf_input.results as plm_pbf_in_res
 import pbfbench.topics.plasmidness.plasgraph2.config as plasgraph2_cfg
 import pbfbench.topics.plasmidness.plasgraph2.results as plasgraph2_res
 
+PLASGRAPH2_CONTIG_COL = "contig"
+PLASGRAPH2_PLASMID_SCORE_COL = "plasmid_score"
+
 
 def convert(
     input_data_exp_fs_manager: exp_fs.DataManager,
@@ -43,28 +49,46 @@ def convert(
     )
     # ---
 
-    plgr_df = pd.read_csv(plm_res.csv(sample_item.exp_sample_id()))
-    contigs_dict = plm_pbf_in_ops.parse_gfa(
+    contig_table = plm_pbf_in_ctg_idx.load_or_build(
         gfa_gz.gfa_gz(sample_item.exp_sample_id()),
+        gfa_gz.contig_index(sample_item.exp_sample_id()),
         gfa_tool,
     )
-    for _, row in plgr_df.iterrows():
-        contig_id = str(row["contig"]).split(" ")[0]
-        prcr, prpl = row["chrom_score"], row["plasmid_score"]
-        pred = row["label"]
-        if contig_id in contigs_dict:
-            contigs_dict[contig_id]["Prob_Chromosome"] = float(prcr)
-            contigs_dict[contig_id]["Prob_Plasmid"] = float(prpl)
-            if pred == "plasmid":
-                contigs_dict[contig_id]["Prediction"] = "Plasmid"
-            else:
-                contigs_dict[contig_id]["Prediction"] = "Chromosome"
-    contigs_df = pd.DataFrame.from_dict(contigs_dict).T
-
-    contigs_df.to_csv(
+    to_pbf_plasmidness(
+        plm_res.csv(sample_item.exp_sample_id()),
+        contig_table,
+    ).to_csv(
         pbf_plm_res.tsv(sample_item.exp_sample_id()),
-        columns=["Prob_Plasmid"],
         sep="\t",
         header=False,
         index=True,
     )
+
+
+def to_pbf_plasmidness(
+    plasgraph2_csv: Path,
+    contig_table: plm_pbf_in_ops.ContigTable,
+) -> pd.Series:
+    """Join the plASgraph2 plasmid scores with the assembly graph contigs.
+
+    The contigs without plasmid score have the default plasmidness.
+    If a contig is scored several times, the last score is kept.
+
+    Returns
+    -------
+    pd.Series
+        Plasmid probabilities indexed by the contig IDs, in the GFA order.
+    """
+    plgr_df = pd.read_csv(
+        plasgraph2_csv,
+        usecols=[PLASGRAPH2_CONTIG_COL, PLASGRAPH2_PLASMID_SCORE_COL],
+    )
+    plasmid_scores = pd.Series(
+        plgr_df[PLASGRAPH2_PLASMID_SCORE_COL].astype(float).to_numpy(),
+        index=plgr_df[PLASGRAPH2_CONTIG_COL].astype(str).str.split(" ", n=1).str[0],
+    )
+    plasmid_scores = plasmid_scores[~plasmid_scores.index.duplicated(keep="last")]
+    return plasmid_scores.reindex(
+        pd.Index(contig_table.ids()).drop_duplicates(),
+        fill_value=plm_pbf_in_ops.DEFAULT_PLASMIDNESS,
+    )
@@ -17,3 +17,7 @@ class PlasmidProbabilities(topic_res_items.Original):
     def csv(self, sample_dirname: str | Path) -> Path:
         """Get plasmid probabilities CSV file."""
         return self._exp_fs_manager.sample_dir(sample_dirname) / self.CSV_NAME
+
+    def files(self, sample_dirname: str | Path) -> list[Path]:
+        """Get the result files of a sample."""
+        return [self.csv(sample_dirname)]
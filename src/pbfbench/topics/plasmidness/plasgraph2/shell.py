@@ -31,9 +31,8 @@ class GFAInputLinesBuilder(
         yield self.GFA_GZ_VAR.set(sh.path_to_str(self.__gfa_gz_file()))
         yield self.OUTFILE_VAR.set(
             sh.path_to_str(
-                plasgraphtwo_res.PlasmidProbabilities(self._work_exp_fs_manager).csv(
-                    self._work_smp_sh_fs_manager.sample_dir().name,
-                ),
+                self.work_exp_sample_dir()
+                / plasgraphtwo_res.PlasmidProbabilities.CSV_NAME,
             ),
         )
 
@@ -7,6 +7,7 @@ import pbfbench.topics.assembly.results.visitor as asm_res_visitor
 import pbfbench.topics.assembly.visitor as asm_visitor
 import pbfbench.topics.plasmidness.plasgraph2.config as plasgraph2_cfg
 import pbfbench.topics.plasmidness.plasgraph2.description as plasgraph2_desc
+import pbfbench.topics.plasmidness.plasgraph2.results as plasgraph2_res
 import pbfbench.topics.plasmidness.plasgraph2.shell as plasgraph2_sh
 
 
@@ -34,4 +35,5 @@ CONNECTOR = Connector(
             plasgraph2_sh.GFAInputLinesBuilder,
         ),
     },
+    [plasgraph2_res.PlasmidProbabilities],
 )
@@ -7,6 +7,15 @@ from __future__ import annotations
 
 import pbfbench.abc.topic.app as abc_topic_app
 import pbfbench.topics.seeds.description as seeds_desc
-import pbfbench.topics.seeds.platon.app as platon_app
+import pbfbench.topics.seeds.platon.description as platon_desc
+from pbfbench import lazy_app
 
-APP = abc_topic_app.build_application(seeds_desc.DESCRIPTION, [platon_app.APP])
+APP = abc_topic_app.build_application(
+    seeds_desc.DESCRIPTION,
+    [
+        lazy_app.SubApp.from_tool(
+            platon_desc.DESCRIPTION,
+            "pbfbench.topics.seeds.platon.app",
+        ),
+    ],
+)
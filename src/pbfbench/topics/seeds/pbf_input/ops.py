@@ -0,0 +1,47 @@
+"""PlasBin-flow seeds input operations logics."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+TSV_SEP = "\t"
+
+
+def write_column(in_tsv: Path, out_tsv: Path, column_name: str) -> None:
+    """Stream one column of a TSV file with header into a TSV file without header.
+
+    Only one line is in memory at a time.
+    The output file is written in a temporary file of the same directory
+    then renamed, so it exists only if the whole column was written.
+
+    Raises
+    ------
+    ValueError
+        The column is not in the header.
+    """
+    with in_tsv.open() as f_in:
+        header = f_in.readline().rstrip("\r\n").split(TSV_SEP)
+        try:
+            column_index = header.index(column_name)
+        except ValueError:
+            _err_msg = f"Column `{column_name}` not found in the header of {in_tsv}"
+            raise ValueError(_err_msg) from None
+
+        tmp_out_tsv = out_tsv.with_name(f".{out_tsv.name}.tmp")
+        try:
+            with tmp_out_tsv.open("w") as f_out:
+                for line in f_in:
+                    line_fields = line.rstrip("\r\n").split(
+                        TSV_SEP,
+                        column_index + 1,
+                    )
+                    if column_index < len(line_fields):
+                        f_out.write(line_fields[column_index])
+                    f_out.write("\n")
+            tmp_out_tsv.replace(out_tsv)
+        except BaseException:
+            tmp_out_tsv.unlink(missing_ok=True)
+            raise
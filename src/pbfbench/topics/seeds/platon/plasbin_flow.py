@@ -1,12 +1,14 @@
 """PlasBin-flow result formatting module."""
 
-import pandas as pd
-
 import pbfbench.experiment.file_system as exp_fs
 import pbfbench.samples.items as smp_items
+import pbfbench.topics.seeds.pbf_input.ops as seeds_pbf_in_ops
 import pbfbench.topics.seeds.pbf_input.results as plm_pbf_in_res
 import pbfbench.topics.seeds.platon.results as platon_res
 
+# Platon plasmid stats column of the contig names
+ID_COLUMN = "ID"
+
 
 def convert(
     input_data_exp_fs_manager: exp_fs.DataManager,
@@ -18,15 +20,8 @@ def convert(
         input_data_exp_fs_manager,
     )
 
-    platon_seeds_stats_df = pd.read_csv(
+    seeds_pbf_in_ops.write_column(
         seeds_res.tsv(sample_item.exp_sample_id()),
-        sep="\t",
-    )
-
-    platon_seeds_stats_df.to_csv(
         pbf_seeds_res.tsv(sample_item.exp_sample_id()),
-        columns=["ID"],
-        header=False,
-        sep="\t",
-        index=False,
+        ID_COLUMN,
     )
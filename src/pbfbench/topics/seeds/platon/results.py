@@ -20,3 +20,7 @@ class PlasmidStats(topic_res_items.Original):
     def tsv(self, sample_dirname: str | Path) -> Path:
         """Get TSV file."""
         return self._exp_fs_manager.sample_dir(sample_dirname) / self.TSV_NAME
+
+    def files(self, sample_dirname: str | Path) -> list[Path]:
+        """Get the result files of a sample."""
+        return [self.tsv(sample_dirname)]
@@ -26,21 +26,19 @@ class GenomeInputLinesBuilder(
 
     def __fasta_tmp_file(self) -> Path:
         """Return a tmp FASTA path with sample name is a sh variable."""
-        return (
-            self._work_smp_sh_fs_manager.sample_dir()
-            / self._input_result.FASTA_GZ_NAME.with_suffix("")
-        )
+        return self.tmp_dir() / self._input_result.FASTA_GZ_NAME.with_suffix("")
 
     def init_lines(self) -> Iterator[str]:
         """Get shell input init lines."""
         yield self.FASTA_GZ_VAR.set(sh.path_to_str(self.__fasta_gz_file()))
-        yield self.GENOME_VAR.set(sh.path_to_str(self.__fasta_tmp_file()))
-        yield (
-            "gunzip -k -c"
-            f" {sh.path_to_str(self.FASTA_GZ_VAR.eval())}"
-            f"> {sh.path_to_str(self.GENOME_VAR.eval())}"
+        yield from self.decompress_lines(
+            self.FASTA_GZ_VAR.eval(),
+            self.GENOME_VAR,
+            self.__fasta_tmp_file(),
         )
 
     def close_lines(self) -> Iterator[str]:
         """Get shell input close lines."""
-        yield f"rm -f {sh.path_to_str(self.GENOME_VAR.eval())}"
+        yield from self.remove_decompressed_lines(
+            self.GENOME_VAR,
+        )
@@ -7,6 +7,7 @@ import pbfbench.topics.assembly.results.visitor as asm_res_visitor
 import pbfbench.topics.assembly.visitor as asm_visitor
 import pbfbench.topics.seeds.platon.config as platon_cfg
 import pbfbench.topics.seeds.platon.description as platon_desc
+import pbfbench.topics.seeds.platon.results as platon_res
 import pbfbench.topics.seeds.platon.shell as platon_sh
 
 
@@ -31,4 +32,5 @@ CONNECTOR = Connector(
             platon_sh.GenomeInputLinesBuilder,
         ),
     },
+    [platon_res.PlasmidStats],
 )